@@ -6,10 +6,19 @@ echo "=== INICIO DEL BUILD ==="
 
 pip install -r requirements.txt
 
+# Dependencias del front, paquetes CSS/JS y fuente de iconos reducida
+python manage.py empaquetar_estaticos
 python manage.py collectstatic --no-input
 python manage.py migrate
+# Solo hace algo si CACHE_BACKEND es el de base de datos
+python manage.py createcachetable
 python manage.py createsu
 
+# Sitio estático opcional: las páginas públicas se sirven desde disco
+if [ "$CV_PRERENDER" = "True" ]; then
+    python manage.py prerender --pdf
+fi
+
 # Verificar Cloudinary
 echo ""
 echo "=== VERIFICANDO CLOUDINARY ==="
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from .imagenes_web import url_imagen
 from .models import (
     DatosPersonales, ExperienciaLaboral, Reconocimientos,
     CursosRealizados, ProductosAcademicos, ProductosLaborales, VentaGarage,
@@ -14,7 +15,10 @@ class DatosPersonalesAdmin(admin.ModelAdmin):
     
     def preview_foto(self, obj):
         if obj.foto_perfil:
-            return format_html('<img src="{}" width="50" height="50" style="border-radius: 50%;" />', obj.foto_perfil.url)
+            return format_html(
+                '<img src="{}" srcset="{} 2x" width="50" height="50" loading="lazy" style="border-radius: 50%;" />',
+                url_imagen(obj.foto_perfil, 50, 50), url_imagen(obj.foto_perfil, 100, 100),
+            )
         return "Sin foto"
     preview_foto.short_description = 'Foto'
     
@@ -92,7 +96,10 @@ class VentaGarageAdmin(admin.ModelAdmin):
     
     def preview_imagen(self, obj):
         if obj.imagen_producto:
-            return format_html('<img src="{}" width="50" height="50" />', obj.imagen_producto.url)
+            return format_html(
+                '<img src="{}" srcset="{} 2x" width="50" height="50" loading="lazy" />',
+                url_imagen(obj.imagen_producto, 50, 50), url_imagen(obj.imagen_producto, 100, 100),
+            )
         return "Sin imagen"
     preview_imagen.short_description = 'Imagen'
 
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class CurriculumConfig(AppConfig):
     name = 'curriculum'
+
+    def ready(self):
+        from . import signals  # noqa: F401
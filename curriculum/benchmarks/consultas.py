@@ -0,0 +1,114 @@
+"""Planes de ejecución (EXPLAIN) y tiempos de las consultas por sección."""
+import re
+import statistics
+import time
+
+from django.db import connection, transaction
+
+from ..paginacion import TAMANO_PAGINA, filtro_keyset
+from ..resumenes import consulta_resumen
+from ..snapshot import SECCIONES, consulta_seccion
+from .datos import sembrar_perfil
+
+# Marcas de un ordenamiento explícito en el plan de cada motor
+ORDENAMIENTO = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR (RIGHT PART OF )?ORDER BY'),
+    'postgresql': re.compile(r'\bSort\b'),
+}
+
+
+def agregar_argumentos(parser):
+    parser.add_argument('--filas', type=int, default=2000, help='Filas por sección de cada perfil')
+    parser.add_argument('--perfiles', type=int, default=4, help='Perfiles de relleno además del medido')
+    parser.add_argument('--repeticiones', type=int, default=15)
+    parser.add_argument('--comparar', action='store_true', help='Repite la medición sin los índices compuestos')
+
+
+def consultas(nombre, perfil_id):
+    """Las consultas de las vistas para una sección: listado, resumen y página profunda."""
+    atributo, modelo, orden = SECCIONES[nombre]
+    listado = consulta_seccion(nombre, perfil_id)
+    resultado = {
+        'listado': listado,
+        'resumen': consulta_resumen(nombre, perfil_id),
+    }
+    total = listado.count()
+    if total:
+        medio = listado[total // 2]
+        valores = [getattr(medio, campo.lstrip('-')) for campo in orden]
+        resultado['pagina'] = listado.filter(filtro_keyset(orden, valores))[:TAMANO_PAGINA + 1]
+    return resultado
+
+
+def _medir(queryset, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        list(queryset.all())
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def _explicar(queryset, pasada):
+    # El comentario evita que SQLite reutilice un EXPLAIN compilado antes de
+    # eliminar los índices (la caché de sentencias no detecta el cambio).
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql} /* {pasada} */', params)
+        return '\n'.join(' '.join(str(columna) for columna in fila) for fila in cursor.fetchall())
+
+
+def _indices(modelo):
+    return [indice.name for indice in modelo._meta.indexes]
+
+
+def _informe(comando, perfil_id, repeticiones, titulo):
+    comando.stdout.write(comando.style.MIGRATE_HEADING(f'\n##### {titulo} ({connection.vendor}) #####'))
+    patron_orden = ORDENAMIENTO.get(connection.vendor)
+    for nombre, (atributo, modelo, orden) in SECCIONES.items():
+        comando.stdout.write(comando.style.MIGRATE_LABEL(f'\n== {nombre} ({modelo._meta.db_table}) =='))
+        for etiqueta, queryset in consultas(nombre, perfil_id).items():
+            plan = _explicar(queryset, titulo)
+            filas = len(queryset.all())
+            mediana = _medir(queryset, repeticiones)
+            usados = [indice for indice in _indices(modelo) if indice in plan]
+            con_orden = bool(patron_orden and patron_orden.search(plan))
+
+            comando.stdout.write(f'[{etiqueta}] {filas} filas, mediana {mediana:.2f} ms')
+            for linea in plan.splitlines():
+                comando.stdout.write(f'    {linea}')
+            resumen = f"índice: {', '.join(usados) or 'ninguno compuesto'} | "
+            resumen += 'con ordenamiento' if con_orden else 'sin ordenamiento'
+            estilo = comando.style.SUCCESS if usados and not con_orden else comando.style.WARNING
+            comando.stdout.write(estilo(f'    -> {resumen}'))
+
+
+def _eliminar_indices():
+    with connection.cursor() as cursor:
+        for atributo, modelo, orden in SECCIONES.values():
+            for indice in _indices(modelo):
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(indice)}')
+
+
+def ejecutar(comando, filas, perfiles, repeticiones, comparar, **opciones):
+    cantidades = {nombre: filas for nombre in SECCIONES}
+
+    # Todo ocurre dentro de una transacción que se revierte al final
+    with transaction.atomic():
+        inicio = time.perf_counter()
+        for semilla in range(1, perfiles + 1):
+            sembrar_perfil(cantidades, semilla=semilla)
+        perfil = sembrar_perfil(cantidades, semilla=0)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        comando.stdout.write(
+            f'Sembradas {filas * len(SECCIONES) * (perfiles + 1)} filas '
+            f'en {time.perf_counter() - inicio:.1f} s'
+        )
+
+        _informe(comando, perfil.pk, repeticiones, 'Con índices compuestos')
+        if comparar:
+            _eliminar_indices()
+            _informe(comando, perfil.pk, repeticiones, 'Sin índices compuestos')
+
+        transaction.set_rollback(True)
@@ -0,0 +1,88 @@
+import datetime
+import random
+from decimal import Decimal
+
+from ..models import (
+    DatosPersonales, ExperienciaLaboral, Reconocimientos,
+    CursosRealizados, ProductosAcademicos, ProductosLaborales, VentaGarage,
+)
+
+PALABRAS = (
+    'gestión proyectos desarrollo sistemas análisis datos equipo cliente '
+    'implementación mejora procesos calidad software servicio apoyo técnico '
+    'coordinación planificación evaluación formación universidad empresa '
+    'informe resultados seguimiento documentación capacitación red soporte'
+).split()
+
+LOTE = 500
+
+
+def texto(rng, minimo, maximo):
+    return ' '.join(rng.choice(PALABRAS) for _ in range(rng.randint(minimo, maximo))).capitalize() + '.'
+
+
+def fecha(rng, desde=2000, hasta=2024):
+    return datetime.date(rng.randint(desde, hasta), rng.randint(1, 12), rng.randint(1, 28))
+
+
+def _fila(nombre, perfil, rng, visible, imagen):
+    inicio = fecha(rng)
+    comun = {'idperfilconqueestaactivo': perfil, 'activarparaqueseveaenfront': visible}
+    if nombre == 'experiencia':
+        return ExperienciaLaboral(
+            cargodesempenado=texto(rng, 2, 6)[:100], nombreempresa=texto(rng, 1, 4)[:50],
+            lugarempresa='Manta', fechainiciogestion=inicio,
+            fechafingestion=inicio + datetime.timedelta(days=rng.randint(30, 900)),
+            descripcionfunciones=texto(rng, 40, 120), **comun
+        )
+    if nombre == 'reconocimientos':
+        return Reconocimientos(
+            tiporeconocimiento=rng.choice(('Académico', 'Público', 'Privado')), fechareconocimiento=inicio,
+            descripcionreconocimiento=texto(rng, 15, 50), entidadpatrocinadora=texto(rng, 1, 4)[:100], **comun
+        )
+    if nombre == 'cursos':
+        return CursosRealizados(
+            nombrecurso=texto(rng, 2, 8)[:100], fechainicio=inicio,
+            fechafin=inicio + datetime.timedelta(days=rng.randint(1, 120)), totalhoras=rng.randint(8, 200),
+            descripcioncurso=texto(rng, 20, 60), entidadpatrocinadora=texto(rng, 1, 4)[:100], **comun
+        )
+    if nombre == 'productosacademicos':
+        return ProductosAcademicos(
+            nombrerecurso=texto(rng, 2, 8)[:100], clasificador=rng.choice(('Artículo', 'Libro', 'Ponencia')),
+            descripcion=texto(rng, 20, 60), **comun
+        )
+    if nombre == 'productoslaborales':
+        return ProductosLaborales(
+            nombreproducto=texto(rng, 2, 8)[:100], fechaproducto=inicio, descripcion=texto(rng, 20, 60), **comun
+        )
+    return VentaGarage(
+        nombreproducto=texto(rng, 1, 4)[:100], estadoproducto=rng.choice(('Bueno', 'Regular')),
+        descripcion=texto(rng, 10, 40), valordelbien=Decimal(rng.randint(100, 99999)) / 100,
+        imagen_producto=imagen, **comun
+    )
+
+
+def sembrar_perfil(cantidades, semilla=0, visibles=0.9, foto=None, imagen_producto=None):
+    """Crea un perfil sintético con `cantidades[seccion]` filas por sección."""
+    rng = random.Random(semilla)
+    perfil = DatosPersonales.objects.create(
+        descripcionperfil=texto(rng, 3, 6)[:50], perfilactivo=0,
+        apellidos='Benchmark', nombres=f'Perfil {semilla}', nacionalidad='Ecuatoriana',
+        lugarnacimiento='Manta', fechanacimiento=datetime.date(1990, 5, 17),
+        numerocedula=f'9{rng.randint(0, 999999999):09d}', sexo='M', estadocivil='Soltera',
+        telefonoconvencional='0991234567', sitioweb='https://ejemplo.com',
+        direcciondomiciliaria='Av. Principal 123', foto_perfil=foto,
+    )
+    for nombre, cantidad in cantidades.items():
+        modelo = None
+        filas = []
+        for _ in range(cantidad):
+            fila = _fila(nombre, perfil, rng, rng.random() < visibles, imagen_producto)
+            modelo = type(fila)
+            filas.append(fila)
+            if len(filas) >= LOTE:
+                modelo.objects.bulk_create(filas)
+                filas = []
+        if filas:
+            modelo.objects.bulk_create(filas)
+    return perfil
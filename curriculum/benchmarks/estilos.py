@@ -0,0 +1,72 @@
+"""Costo de preparar los estilos del PDF en cada petición frente al tema compartido."""
+import statistics
+import time
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import TableStyle
+
+from ..tema_pdf import crear_tema, get_tema
+
+
+def agregar_argumentos(parser):
+    parser.add_argument('--repeticiones', type=int, default=2000)
+
+
+def estilos_por_peticion():
+    """Lo que hacía generar_pdf antes de cada documento."""
+    primario = colors.HexColor('#A7C7E7')
+    oscuro = colors.HexColor('#555555')
+    gris = colors.HexColor('#999999')
+    fondo_claro = colors.HexColor('#F4F7F9')
+    secundario = colors.HexColor('#B2B2B2')
+
+    styles = getSampleStyleSheet()
+    normal = styles['Normal']
+    for nombre, parent, opciones in (
+        ('MainTitle', styles['Heading1'], dict(fontSize=24, textColor=primario, alignment=TA_CENTER,
+                                                fontName='Helvetica-Bold', spaceAfter=6)),
+        ('SectionTitle', styles['Heading2'], dict(fontSize=14, textColor=colors.white, backColor=primario,
+                                                   fontName='Helvetica-Bold', leftIndent=10, rightIndent=10,
+                                                   leading=20, spaceBefore=12, spaceAfter=12)),
+        ('Justified', normal, dict(fontSize=10, alignment=TA_JUSTIFY, leading=16, spaceAfter=10)),
+        ('SmallText', normal, dict(fontSize=9, textColor=secundario, leading=14)),
+        ('EntryTitle', normal, dict(fontSize=12, textColor=primario, fontName='Helvetica-Bold', spaceAfter=4)),
+        ('CVTitle', normal, dict(fontSize=24, leading=28, textColor=primario, fontName='Helvetica-Bold',
+                                 spaceAfter=2, alignment=TA_LEFT)),
+        ('CVSubtitle', normal, dict(fontSize=11, leading=14, textColor=gris, fontName='Helvetica', spaceAfter=10)),
+        ('SectionHeader', normal, dict(fontSize=16, textColor=primario, fontName='Helvetica-Bold', spaceAfter=10,
+                                       spaceBefore=15, borderPadding=(5, 5, 5, 5), borderColor=primario,
+                                       borderWidth=0, leftIndent=0)),
+        ('JobTitle', normal, dict(fontSize=13, textColor=oscuro, fontName='Helvetica-Bold', spaceAfter=3)),
+        ('CompanyInfo', normal, dict(fontSize=10, textColor=gris, fontName='Helvetica', leading=14, spaceAfter=6)),
+        ('CustomBodyText', normal, dict(fontSize=10, alignment=TA_JUSTIFY, leading=16, spaceAfter=10)),
+        ('SmallGray', normal, dict(fontSize=9, textColor=gris, leading=12)),
+    ):
+        styles.add(ParagraphStyle(name=nombre, parent=parent, **opciones))
+    TableStyle([('BACKGROUND', (0, 0), (-1, -1), fondo_claro)])
+    return styles
+
+
+def _medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter_ns()
+        funcion()
+        tiempos.append((time.perf_counter_ns() - inicio) / 1000)
+    return statistics.median(tiempos), max(tiempos)
+
+
+def ejecutar(comando, repeticiones, **opciones):
+    get_tema()
+    casos = {
+        'por petición (antes)': estilos_por_peticion,
+        'crear_tema()': lambda: crear_tema('medicion'),
+        'get_tema() compartido': get_tema,
+    }
+    comando.stdout.write(comando.style.MIGRATE_HEADING(f'{repeticiones} repeticiones'))
+    comando.stdout.write(f"{'caso':<24} {'mediana':>10} {'máximo':>10}")
+    for nombre, funcion in casos.items():
+        mediana, maximo = _medir(funcion, repeticiones)
+        comando.stdout.write(f'{nombre:<24} {mediana:>8.1f}µs {maximo:>8.1f}µs')
@@ -0,0 +1,130 @@
+"""Descarga de imágenes del PDF contra un servidor HTTP local con latencia simulada."""
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import requests
+from django.conf import settings
+from PIL import Image as PILImage
+
+from .. import descargas
+from ..cache_disco import CacheDisco
+from ..descargas import HILOS, descargar_imagenes
+
+
+def agregar_argumentos(parser):
+    parser.add_argument('--cantidades', type=int, nargs='+', default=[1, 10, 100], help='Imágenes por documento')
+    parser.add_argument('--latencia', type=int, default=50, help='Milisegundos que tarda el servidor en responder')
+    parser.add_argument('--repeticiones', type=int, default=3)
+
+
+def _imagen_jpeg(lado=600):
+    buffer = BytesIO()
+    PILImage.new('RGB', (lado, lado), (167, 199, 231)).save(buffer, format='JPEG', quality=85)
+    return buffer.getvalue()
+
+
+class ServidorImagenes(ThreadingHTTPServer):
+    """
+    Sirve la misma imagen en cualquier ruta tras `latencia` segundos. Como
+    Cloudinary, envía un ETag y contesta 304 a If-None-Match; con no-cache,
+    para que cada uso la revalide.
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, latencia):
+        self.latencia = latencia
+        self.imagen = _imagen_jpeg()
+        self.etag = '"imagen-1"'
+        super().__init__(('127.0.0.1', 0), ManejadorImagen)
+
+    def url(self, ruta):
+        return f'http://127.0.0.1:{self.server_address[1]}/{ruta}'
+
+
+class ManejadorImagen(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantiene la conexión abierta entre peticiones
+    protocol_version = 'HTTP/1.1'
+    # Cabeceras y cuerpo van en escrituras separadas: sin esto Nagle y el ACK
+    # retardado añaden ~40 ms a cada respuesta sobre una conexión reutilizada
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(self.server.latencia)
+        if self.headers.get('If-None-Match') == self.server.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.server.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(self.server.imagen)))
+        self.send_header('ETag', self.server.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(self.server.imagen)
+
+    def log_message(self, *args):
+        pass
+
+
+def secuencial(urls):
+    """Lo que hacía generar_pdf: un requests.get suelto por imagen."""
+    resultado = {}
+    for url in urls:
+        response = requests.get(url, timeout=10)
+        resultado[url] = response.content if response.status_code == 200 else None
+    return resultado
+
+
+def sin_cache(urls):
+    """descargar_imagenes con la caché HTTP vacía: todo se descarga completo."""
+    descargas.cache_http.limpiar()
+    return descargar_imagenes(urls)
+
+
+def _medir(funcion, urls, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(urls)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        assert all(resultado.values()), 'Faltan imágenes'
+    return statistics.median(tiempos)
+
+
+def ejecutar(comando, cantidades, latencia, repeticiones, **opciones):
+    servidor = ServidorImagenes(latencia / 1000)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    # La caché HTTP del benchmark va a un directorio temporal: no toca la real
+    cache_original = descargas.cache_http
+    directorio = tempfile.TemporaryDirectory(prefix='cv-benchmark-')
+    descargas.cache_http = CacheDisco(directorio.name, settings.CV_DESCARGAS_CACHE_MAX_BYTES, '.http')
+    try:
+        comando.stdout.write(comando.style.MIGRATE_HEADING(
+            f'Latencia del servidor {latencia} ms, {HILOS} hilos de descarga, '
+            f'{descargas.POR_HOST} por host'
+        ))
+        comando.stdout.write(f"{'imágenes':>9} {'secuencial':>12} {'paralelo':>12} {'revalidando':>12} {'mejora':>8}")
+        for cantidad in cantidades:
+            # Rutas distintas: descargar_imagenes no descarga dos veces la misma URL
+            urls = [servidor.url(f'imagen/{numero}.jpg') for numero in range(cantidad)]
+            antes = _medir(secuencial, urls, repeticiones)
+            despues = _medir(sin_cache, urls, repeticiones)
+            # La pasada anterior dejó las respuestas en disco: ahora solo viajan 304 sin cuerpo
+            revalidando = _medir(descargar_imagenes, urls, repeticiones)
+            comando.stdout.write(
+                f'{cantidad:>9} {antes:>10.1f}ms {despues:>10.1f}ms {revalidando:>10.1f}ms {antes / despues:>7.1f}x'
+            )
+        contadores = descargas.estadisticas()
+        comando.stdout.write(', '.join(f'{nombre}={valor}' for nombre, valor in contadores.items()))
+    finally:
+        descargas.cache_http = cache_original
+        directorio.cleanup()
+        servidor.shutdown()
+        servidor.server_close()
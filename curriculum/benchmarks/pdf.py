@@ -0,0 +1,166 @@
+"""Generación del PDF de punta a punta con datos sintéticos: latencia por sección, páginas, bytes y memoria."""
+import json
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .. import descargas, imagenes_pdf
+from ..cache_disco import CacheDisco
+from ..pdf import SECCIONES_PDF, construir_pdf
+from ..secciones_pdf import BLOQUES, _clave_bloque, huella_bloque
+from ..snapshot import SECCIONES, construir_snapshot
+from .datos import sembrar_perfil
+from .imagenes import ServidorImagenes
+
+
+def _cantidad(valor):
+    nombre, separador, cantidad = valor.partition('=')
+    if not separador or nombre not in SECCIONES or not cantidad.isdigit():
+        raise ValueError(valor)
+    return nombre, int(cantidad)
+
+
+def agregar_argumentos(parser):
+    parser.add_argument('--filas', type=int, default=20, help='Filas por sección')
+    parser.add_argument(
+        '--seccion', action='append', type=_cantidad, default=[], dest='por_seccion', metavar='SECCION=FILAS',
+        help=f'Filas de una sección concreta (repetible): {", ".join(SECCIONES)}',
+    )
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--latencia', type=int, default=20, help='Milisegundos que tarda el servidor de imágenes')
+    parser.add_argument('--salida', help='Archivo JSON con los resultados ("-" para escribirlo en la salida estándar)')
+
+
+class ImagenLocal:
+    """Sustituye al CloudinaryField: solo se usa su `url`."""
+
+    def __init__(self, url):
+        self.url = url
+
+    def __bool__(self):
+        return True
+
+
+def _percentil(valores, percentil):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, round(percentil / 100 * (len(ordenados) - 1)))]
+
+
+def _vaciar_caches(snapshot, urls):
+    """Deja frías las cachés de bloques y de imágenes del PDF para este snapshot."""
+    cache.delete_many([_clave_bloque(nombre, huella_bloque(snapshot, nombre)) for nombre in BLOQUES])
+    cache.delete_many([imagenes_pdf._clave_indice(url) for url in urls])
+    imagenes_pdf.cache_derivadas.limpiar()
+    descargas.cache_http.limpiar()
+
+
+def _generar(snapshot, secciones):
+    salida = BytesIO()
+    paginas = construir_pdf(snapshot, secciones, destino=salida)
+    return paginas, len(salida.getvalue())
+
+
+def _medir_caso(snapshot, secciones, urls, repeticiones):
+    resultado = {}
+    for estado in ('frio', 'caliente'):
+        tiempos = []
+        for _ in range(repeticiones):
+            if estado == 'frio':
+                _vaciar_caches(snapshot, urls)
+            inicio = time.perf_counter()
+            paginas, tamano = _generar(snapshot, secciones)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        resultado[estado] = {
+            'mediana_ms': round(statistics.median(tiempos), 2),
+            'p95_ms': round(_percentil(tiempos, 95), 2),
+        }
+    resultado['paginas'] = paginas
+    resultado['bytes'] = tamano
+
+    # La memoria se mide en una pasada aparte: tracemalloc hace el render más lento
+    _vaciar_caches(snapshot, urls)
+    tracemalloc.start()
+    _generar(snapshot, secciones)
+    resultado['memoria_pico_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+    tracemalloc.stop()
+    return resultado
+
+
+def _escribir_tabla(comando, resultados):
+    comando.stdout.write(
+        f"{'caso':<22} {'frío med':>9} {'frío p95':>9} {'cal. med':>9} {'cal. p95':>9} "
+        f"{'págs':>5} {'bytes':>9} {'memoria':>9}"
+    )
+    for caso, r in resultados.items():
+        comando.stdout.write(
+            f"{caso:<22} {r['frio']['mediana_ms']:>7.1f}ms {r['frio']['p95_ms']:>7.1f}ms "
+            f"{r['caliente']['mediana_ms']:>7.1f}ms {r['caliente']['p95_ms']:>7.1f}ms "
+            f"{r['paginas']:>5} {r['bytes']:>9} {r['memoria_pico_mb']:>7.1f}MB"
+        )
+
+
+def ejecutar(comando, filas, por_seccion, repeticiones, latencia, salida, **opciones):
+    cantidades = {nombre: filas for nombre in SECCIONES}
+    cantidades.update(por_seccion)
+    # Solo la sección pedida (y el encabezado, que siempre va) y el documento completo
+    casos = {nombre: (nombre,) for nombre in SECCIONES_PDF}
+    casos['total'] = SECCIONES_PDF
+
+    servidor = ServidorImagenes(latencia / 1000)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    derivadas_originales = imagenes_pdf.cache_derivadas
+    http_original = descargas.cache_http
+    directorio = tempfile.TemporaryDirectory(prefix='cv-benchmark-')
+    imagenes_pdf.cache_derivadas = CacheDisco(directorio.name, settings.CV_IMAGENES_CACHE_MAX_BYTES, '.jpg')
+    descargas.cache_http = CacheDisco(directorio.name, settings.CV_DESCARGAS_CACHE_MAX_BYTES, '.http')
+    try:
+        # Todo ocurre dentro de una transacción que se revierte al final
+        with transaction.atomic():
+            perfil = sembrar_perfil(cantidades, semilla=0)
+            # Sin get_snapshot: el snapshot de un perfil que se revierte no debe quedar en la caché
+            snapshot = construir_snapshot(perfil, None)
+            snapshot.perfil.foto_perfil = ImagenLocal(servidor.url('perfil/foto.jpg'))
+            for producto in snapshot.productos_garage:
+                producto.imagen_producto = ImagenLocal(servidor.url(f'garage/{producto.pk}.jpg'))
+            urls = [snapshot.perfil.foto_perfil.url] + [p.imagen_producto.url for p in snapshot.productos_garage]
+
+            if salida != '-':
+                comando.stdout.write(comando.style.MIGRATE_HEADING(
+                    f"Filas visibles: {', '.join(f'{n}={len(snapshot.seccion(n))}' for n in SECCIONES)}; "
+                    f'{len(urls)} imágenes con {latencia} ms de latencia; {repeticiones} repeticiones'
+                ))
+            resultados = {
+                caso: _medir_caso(snapshot, secciones, urls, repeticiones) for caso, secciones in casos.items()
+            }
+            _vaciar_caches(snapshot, urls)
+            transaction.set_rollback(True)
+    finally:
+        imagenes_pdf.cache_derivadas = derivadas_originales
+        descargas.cache_http = http_original
+        directorio.cleanup()
+        servidor.shutdown()
+        servidor.server_close()
+
+    informe = {
+        'fecha': timezone.now().isoformat(),
+        'version': settings.CV_VERSION_DESPLIEGUE,
+        'parametros': {'filas': cantidades, 'repeticiones': repeticiones, 'latencia_ms': latencia},
+        'resultados': resultados,
+        'descargas': descargas.estadisticas(),
+    }
+    if salida == '-':
+        comando.stdout.write(json.dumps(informe, indent=2))
+        return
+    _escribir_tabla(comando, resultados)
+    if salida:
+        with open(salida, 'w') as archivo:
+            json.dump(informe, archivo, indent=2)
+        comando.stdout.write(comando.style.SUCCESS(f'Resultados en {salida}'))
@@ -0,0 +1,142 @@
+"""Memoria y tiempo del pie "Página X de Y" en un CV largo, con el canvas anterior y el actual."""
+import gc
+import multiprocessing
+import resource
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from io import BytesIO
+
+import django
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+from .datos import PALABRAS
+
+
+def agregar_argumentos(parser):
+    parser.add_argument('--paginas', type=int, default=200, help='Páginas aproximadas del documento')
+    parser.add_argument('--tracemalloc', action='store_true', dest='con_tracemalloc',
+                        help='Mide también el pico de memoria Python (hace el render varias veces más lento)')
+
+
+class FooterCanvasAnterior(canvas.Canvas):
+    """El canvas que usaba generar_pdf: guarda el estado de cada página hasta save()."""
+
+    def __init__(self, *args, **kwargs):
+        canvas.Canvas.__init__(self, *args, **kwargs)
+        self.pages = []
+
+    def showPage(self):
+        self.pages.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self):
+        page_count = len(self.pages)
+        for page in self.pages:
+            self.__dict__.update(page)
+            self.draw_footer(page_count)
+            canvas.Canvas.showPage(self)
+        canvas.Canvas.save(self)
+
+    def draw_footer(self, page_count):
+        self.setStrokeColor(colors.HexColor('#A7C7E7'))
+        self.setLineWidth(1)
+        self.line(2*cm, 2*cm, A4[0] - 2*cm, 2*cm)
+        self.setFont("Helvetica", 9)
+        self.setFillColor(colors.grey)
+        self.drawRightString(A4[0] - 2*cm, 1.5*cm, f"Página {self._pageNumber} de {page_count}")
+        self.drawString(2*cm, 1.5*cm, f"Generado: {datetime.now().strftime('%d/%m/%Y')}")
+
+
+def _historia(paginas, tema):
+    # Unas 5 entradas llenan una página A4 con estos estilos
+    historia = []
+    for numero in range(paginas * 5):
+        texto = ' '.join(PALABRAS[(numero + desplazamiento) % len(PALABRAS)] for desplazamiento in range(60))
+        historia.append(Paragraph(f'Entrada {numero}', tema.estilos['JobTitle']))
+        historia.append(Paragraph(texto, tema.estilos['CustomBodyText']))
+        historia.append(Spacer(1, 0.3*cm))
+    return historia
+
+
+def _rss_actual():
+    """RSS del proceso en este momento, en bytes (Linux). ru_maxrss solo da el máximo histórico."""
+    with open('/proc/self/statm') as archivo:
+        return int(archivo.read().split()[1]) * resource.getpagesize()
+
+
+class MuestreoRSS(threading.Thread):
+    """Muestrea el RSS en segundo plano y se queda con el máximo visto desde start()."""
+
+    def __init__(self, intervalo=0.005):
+        super().__init__(daemon=True)
+        self.intervalo = intervalo
+        self.pico = _rss_actual()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            self.pico = max(self.pico, _rss_actual())
+
+    def detener(self):
+        self._parar.set()
+        self.join()
+        self.pico = max(self.pico, _rss_actual())
+        return self.pico
+
+
+def _medir(variante, paginas, con_tracemalloc):
+    """Se ejecuta en un proceso nuevo para que el pico de RSS sea solo de esta variante."""
+    from ..pdf import FooterCanvas
+    from ..tema_pdf import get_tema
+
+    canvases = {'anterior': FooterCanvasAnterior, 'actual': FooterCanvas}
+    historia = _historia(paginas, get_tema())
+    # Base: el RSS actual con la historia ya construida, no el máximo histórico
+    gc.collect()
+    muestreo = MuestreoRSS()
+    rss_base = muestreo.pico
+
+    if con_tracemalloc:
+        tracemalloc.start()
+    muestreo.start()
+    inicio = time.perf_counter()
+    buffer = BytesIO()
+    documento = SimpleDocTemplate(buffer, pagesize=A4, bottomMargin=2.5*cm)
+    documento.build(historia, canvasmaker=canvases[variante])
+    segundos = time.perf_counter() - inicio
+    rss_pico = muestreo.detener()
+    pico_python = tracemalloc.get_traced_memory()[1] if con_tracemalloc else 0
+    tracemalloc.stop()
+
+    return {
+        'paginas': documento.page,
+        'segundos': segundos,
+        'bytes': len(buffer.getvalue()),
+        'rss_mb': rss_pico / 1024 / 1024,
+        'rss_extra_mb': (rss_pico - rss_base) / 1024 / 1024,
+        'python_mb': pico_python / 1024 / 1024,
+    }
+
+
+def ejecutar(comando, paginas, con_tracemalloc, **opciones):
+    comando.stdout.write(comando.style.MIGRATE_HEADING(f'CV de ~{paginas} páginas, un proceso por variante'))
+    comando.stdout.write(
+        f"{'canvas':<10} {'páginas':>8} {'tiempo':>9} {'pico RSS':>10} {'+RSS render':>12} {'pico Python':>12}"
+    )
+    contexto = multiprocessing.get_context('spawn')
+    for variante in ('anterior', 'actual'):
+        # django.setup() antes de deserializar la tarea, que importa los modelos
+        with ProcessPoolExecutor(max_workers=1, mp_context=contexto, initializer=django.setup) as ejecutor:
+            r = ejecutor.submit(_medir, variante, paginas, con_tracemalloc).result()
+        python = f"{r['python_mb']:>10.1f}MB" if con_tracemalloc else f"{'-':>12}"
+        comando.stdout.write(
+            f"{variante:<10} {r['paginas']:>8} {r['segundos']:>8.2f}s {r['rss_mb']:>8.1f}MB "
+            f"{r['rss_extra_mb']:>10.1f}MB {python}"
+        )
@@ -0,0 +1,79 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+class CacheDisco:
+    """
+    Caché de archivos en disco con tamaño máximo y desalojo LRU.
+
+    Cada entrada es un archivo cuyo nombre es el hash de la clave; la fecha de
+    modificación marca el último uso. Las escrituras son atómicas, así que
+    varios workers pueden compartir el mismo directorio.
+    """
+
+    def __init__(self, directorio, tamano_maximo, extension=''):
+        self.directorio = Path(directorio)
+        self.tamano_maximo = tamano_maximo
+        self.extension = extension
+
+    def ruta(self, clave):
+        return self.directorio / f'{hashlib.sha256(clave.encode()).hexdigest()}{self.extension}'
+
+    def get(self, clave):
+        """Ruta del archivo guardado para `clave`, o None si no existe."""
+        ruta = self.ruta(clave)
+        try:
+            os.utime(ruta)
+        except FileNotFoundError:
+            return None
+        return ruta
+
+    def set(self, clave, contenido):
+        return self._escribir(clave, lambda archivo: archivo.write(contenido))
+
+    def set_archivo(self, clave, origen):
+        """Como set(), pero copia por bloques desde un archivo abierto sin leerlo entero."""
+        return self._escribir(clave, lambda archivo: shutil.copyfileobj(origen, archivo))
+
+    def _escribir(self, clave, escribir):
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        ruta = self.ruta(clave)
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                escribir(archivo)
+            os.replace(temporal, ruta)
+        except BaseException:
+            Path(temporal).unlink(missing_ok=True)
+            raise
+        self.desalojar()
+        return ruta
+
+    def _entradas(self):
+        # Los temporales de otros workers aún se están escribiendo
+        return (ruta for ruta in self.directorio.glob(f'*{self.extension}') if not ruta.name.startswith('.tmp-'))
+
+    def desalojar(self):
+        """Borra las entradas menos usadas hasta quedar bajo el tamaño máximo."""
+        entradas = []
+        for ruta in self._entradas():
+            try:
+                datos = ruta.stat()
+            except FileNotFoundError:
+                continue
+            entradas.append((datos.st_mtime, datos.st_size, ruta))
+
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in sorted(entradas):
+            if total <= self.tamano_maximo:
+                break
+            # Otro worker pudo borrarla antes
+            ruta.unlink(missing_ok=True)
+            total -= tamano
+
+    def limpiar(self):
+        for ruta in self._entradas():
+            ruta.unlink(missing_ok=True)
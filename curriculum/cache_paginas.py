@@ -0,0 +1,119 @@
+import hashlib
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .perfil_activo import resolver_perfil_activo
+from .snapshot import SECCIONES
+
+CACHE_ACTIVA = getattr(settings, 'CV_PAGE_CACHE', False)
+CACHE_TIMEOUT = getattr(settings, 'CV_PAGE_CACHE_TIMEOUT', 60 * 60)
+OMITIR_STAFF = getattr(settings, 'CV_PAGE_CACHE_BYPASS_STAFF', True)
+
+CABECERA = 'X-CV-Cache'
+CLAVE_ACIERTOS = 'cv:html:aciertos'
+CLAVE_FALLOS = 'cv:html:fallos'
+
+# Parte común a todas las páginas: datos personales y configuración de secciones
+PARTE_PERFIL = 'perfil'
+
+
+def _clave_parte(perfil_id, parte):
+    return f'cv:version:{perfil_id}:{parte}'
+
+
+def get_versiones(perfil_id, partes):
+    """Token de cada parte del perfil, en una sola lectura a la caché."""
+    claves = {_clave_parte(perfil_id, parte): parte for parte in partes}
+    versiones = cache.get_many(claves)
+    for clave in claves.keys() - versiones.keys():
+        cache.add(clave, uuid.uuid4().hex, None)
+        versiones[clave] = cache.get(clave)
+    return [versiones[clave] for clave in claves]
+
+
+def invalidar_paginas(perfil_id, seccion=None):
+    """Invalida las páginas que muestran `seccion`, o todas si cambia el perfil."""
+    if perfil_id is not None:
+        cache.set(_clave_parte(perfil_id, seccion or PARTE_PERFIL), uuid.uuid4().hex, None)
+
+
+def _contar(clave):
+    cache.add(clave, 0, None)
+    try:
+        cache.incr(clave)
+    except ValueError:
+        # La entrada fue desalojada entre add() e incr()
+        pass
+
+
+def estadisticas():
+    valores = cache.get_many([CLAVE_ACIERTOS, CLAVE_FALLOS])
+    return valores.get(CLAVE_ACIERTOS, 0), valores.get(CLAVE_FALLOS, 0)
+
+
+def reiniciar_estadisticas():
+    cache.delete_many([CLAVE_ACIERTOS, CLAVE_FALLOS])
+
+
+def _es_staff(request):
+    # Sin cookie de sesión no hay usuario: se evita consultar la sesión
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return False
+    return request.user.is_authenticated and request.user.is_staff
+
+
+def _clave_pagina(request, perfil_id, secciones, parametros):
+    versiones = get_versiones(perfil_id, (PARTE_PERFIL, *secciones))
+    # Ruta y parámetros que lee la vista, nunca la query string completa.
+    # Resumen de longitud fija: la portada depende de todas las secciones.
+    consulta = urlencode(sorted((nombre, request.GET[nombre]) for nombre in parametros if nombre in request.GET))
+    partes = [settings.CV_VERSION_DESPLIEGUE, *versiones, request.path, consulta]
+    return f"cv:html:{perfil_id}:{hashlib.md5(':'.join(partes).encode()).hexdigest()}"
+
+
+def cache_pagina(seccion=None, parametros=()):
+    """
+    Guarda la respuesta completa de una vista pública. La clave depende de la
+    ruta, de los `parametros` de la query string que lee la vista y de las
+    versiones de las partes que muestra la página: `seccion`, el argumento
+    `seccion` de la URL o, si no hay ninguno, todas las secciones. Con
+    cualquier otro parámetro (un cursor de `cargar_mas`, basura para llenar
+    la caché...) la petición no pasa por la caché.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            if not CACHE_ACTIVA or request.method not in ('GET', 'HEAD'):
+                return vista(request, *args, **kwargs)
+            if (OMITIR_STAFF and _es_staff(request)) or not set(request.GET) <= set(parametros):
+                response = vista(request, *args, **kwargs)
+                response[CABECERA] = 'BYPASS'
+                return response
+
+            perfil, config = resolver_perfil_activo(request)
+            nombre = seccion or kwargs.get('seccion')
+            if perfil is None or (nombre and nombre not in SECCIONES):
+                return vista(request, *args, **kwargs)
+
+            clave = _clave_pagina(request, perfil.pk, (nombre,) if nombre else tuple(SECCIONES), parametros)
+            guardada = cache.get(clave)
+            if guardada is not None:
+                _contar(CLAVE_ACIERTOS)
+                contenido, tipo = guardada
+                response = HttpResponse(contenido, content_type=tipo)
+                response[CABECERA] = 'HIT'
+                return response
+
+            _contar(CLAVE_FALLOS)
+            response = vista(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(clave, (response.content, response['Content-Type']), CACHE_TIMEOUT)
+            response[CABECERA] = 'MISS'
+            return response
+        return envoltura
+    return decorador
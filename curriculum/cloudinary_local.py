@@ -0,0 +1,328 @@
+"""
+Sustituto local de Cloudinary para trabajar y medir sin red.
+
+ServidorCloudinary sirve un directorio con el mismo esquema de URLs de
+entrega que res.cloudinary.com:
+
+    /<cloud>/<image|raw>/upload/[<transformaciones>/][v<versión>/]<public_id>[.<formato>]
+
+Entiende w_, h_, c_ (scale, fit, limit, fill, thumb), g_, f_ (incluido
+f_auto) y q_, y acepta subidas en /v1_1/<cloud>/<resource_type>/upload, así
+que el SDK de Cloudinary (CloudinaryField, uploader, cloudinary_url)
+funciona sin cambios. settings.py lo activa con CV_CLOUDINARY_LOCAL=host:puerto
+y `python manage.py servidor_cloudinary` lo arranca.
+"""
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import secrets
+import tempfile
+import time
+from email import policy
+from email.parser import BytesParser
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from cloudinary.utils import cloudinary_url
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from PIL import Image as PILImage, ImageOps
+
+from .cache_disco import CacheDisco
+
+TIPOS_RECURSO = ('image', 'raw', 'video')
+EXTENSIONES_IMAGEN = {'jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'tiff'}
+FORMATOS_PILLOW = {'jpg': 'JPEG', 'jpeg': 'JPEG', 'png': 'PNG', 'webp': 'WEBP', 'gif': 'GIF'}
+# Lo que envía Cloudinary para los recursos de la URL pública
+CACHE_CONTROL = 'public, max-age=2592000'
+CALIDAD_AUTO = 80
+TRANSFORMACION = re.compile(r'^[a-z]{1,3}_[^,/]+(?:,[a-z]{1,3}_[^,/]+)*$')
+VERSION = re.compile(r'^v\d+$')
+
+
+def tipo_recurso(nombre):
+    """'image' o 'raw' según la extensión, como el resource_type='auto' de Cloudinary."""
+    return 'image' if Path(nombre).suffix.lower().lstrip('.') in EXTENSIONES_IMAGEN else 'raw'
+
+
+class AlmacenamientoCloudinaryLocal(FileSystemStorage):
+    """
+    DEFAULT_FILE_STORAGE con el servidor local: guarda cada archivo donde
+    él lo busca (<resource_type>/<nombre>) y devuelve URLs de entrega.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('location', settings.CV_CLOUDINARY_LOCAL_DIR)
+        super().__init__(**kwargs)
+
+    def path(self, name):
+        return super().path(f'{tipo_recurso(name)}/{name}')
+
+    def _save(self, name, content):
+        # FileSystemStorage devuelve la ruta relativa a location, con el tipo delante
+        return super()._save(name, content).partition('/')[2]
+
+    def url(self, name):
+        public_id = name.replace('\\', '/')
+        if tipo_recurso(name) == 'image':
+            public_id, _, formato = public_id.rpartition('.')
+            return cloudinary_url(public_id, resource_type='image', format=formato)[0]
+        return cloudinary_url(public_id, resource_type='raw')[0]
+
+
+def _escribir_atomico(destino, contenido):
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=destino.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            archivo.write(contenido)
+        os.chmod(temporal, 0o644)
+        os.replace(temporal, destino)
+    except BaseException:
+        Path(temporal).unlink(missing_ok=True)
+        raise
+
+
+def _parametros(transformaciones):
+    """['c_fill,w_200', 'f_auto'] -> [{'c': 'fill', 'w': '200'}, {'f': 'auto'}]"""
+    return [dict(parte.split('_', 1) for parte in segmento.split(',')) for segmento in transformaciones]
+
+
+def _entero(valor):
+    try:
+        return max(0, round(float(valor)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _redimensionar(imagen, paso):
+    ancho, alto = _entero(paso.get('w')), _entero(paso.get('h'))
+    if not ancho and not alto:
+        return imagen
+    recorte = paso.get('c', 'scale')
+    if recorte in ('fill', 'lfill', 'thumb') and ancho and alto:
+        # g_auto no se emula: se recorta al centro
+        return ImageOps.fit(imagen, (ancho, alto), PILImage.LANCZOS)
+    escalas = [lado / actual for lado, actual in ((ancho, imagen.width), (alto, imagen.height)) if lado]
+    if recorte in ('fit', 'limit', 'fill', 'lfill', 'thumb'):
+        escala = min(escalas)
+    elif ancho and alto:
+        # c_scale con los dos lados deforma la imagen, igual que en Cloudinary
+        return imagen.resize((ancho, alto), PILImage.LANCZOS)
+    else:
+        escala = escalas[0]
+    if recorte == 'limit' and escala >= 1:
+        return imagen
+    tamano = (max(1, round(imagen.width * escala)), max(1, round(imagen.height * escala)))
+    return imagen.resize(tamano, PILImage.LANCZOS)
+
+
+def transformar(contenido, transformaciones, formato):
+    """Aplica los pasos de transformación y codifica en `formato`."""
+    imagen = ImageOps.exif_transpose(PILImage.open(BytesIO(contenido)))
+    calidad = CALIDAD_AUTO
+    for paso in _parametros(transformaciones):
+        imagen = _redimensionar(imagen, paso)
+        if paso.get('q', 'auto').isdigit():
+            calidad = int(paso['q'])
+
+    formato_pillow = FORMATOS_PILLOW[formato]
+    if formato_pillow == 'JPEG' and imagen.mode not in ('RGB', 'L'):
+        imagen = imagen.convert('RGBA')
+        fondo = PILImage.new('RGB', imagen.size, 'white')
+        fondo.paste(imagen, mask=imagen.getchannel('A'))
+        imagen = fondo
+    buffer = BytesIO()
+    imagen.save(buffer, format=formato_pillow, quality=calidad)
+    return buffer.getvalue()
+
+
+class ServidorCloudinary(ThreadingHTTPServer):
+    """Sirve y recibe archivos de `directorio`, esperando `latencia` segundos en cada GET."""
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, directorio, direccion=('127.0.0.1', 0), latencia=0):
+        self.directorio = Path(directorio)
+        self.latencia = latencia
+        # Las transformaciones ya hechas no se repiten
+        self.derivadas = CacheDisco(self.directorio / '.derivadas', 200 * 1024 * 1024)
+        super().__init__(direccion, ManejadorCloudinary)
+
+    @property
+    def url(self):
+        return f'http://{self.server_address[0]}:{self.server_address[1]}'
+
+    def ruta_contenida(self, tipo, nombre):
+        """Ruta de <tipo>/<nombre> en `directorio`, o None si el tipo no existe o el nombre se sale con '..'."""
+        if tipo not in TIPOS_RECURSO:
+            return None
+        base = (self.directorio / tipo).resolve()
+        ruta = (base / nombre).resolve()
+        return ruta if base in ruta.parents else None
+
+    def buscar(self, tipo, public_id):
+        """Archivo guardado para el public_id y el formato pedido (None si es el original)."""
+        ruta = self.ruta_contenida(tipo, public_id)
+        if ruta is None:
+            return None, None
+        if ruta.is_file():
+            return ruta, None
+        if tipo != 'image':
+            return None, None
+        # Las imágenes se piden con cualquier extensión: se guardan con la original
+        sin_formato, formato = ruta.with_suffix(''), ruta.suffix.lstrip('.').lower() or None
+        candidatos = sorted(sin_formato.parent.glob(f'{sin_formato.name}.*')) if sin_formato.parent.is_dir() else []
+        return (candidatos[0], formato) if candidatos else (None, None)
+
+
+class ManejadorCloudinary(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self._entregar(cuerpo=False)
+
+    def do_GET(self):
+        self._entregar(cuerpo=True)
+
+    def _responder(self, estado, contenido=b'', tipo='text/plain', cabeceras=None, cuerpo=True):
+        self.send_response(estado)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(contenido)))
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        if cuerpo:
+            self.wfile.write(contenido)
+
+    def _entregar(self, cuerpo):
+        time.sleep(self.server.latencia)
+        partes = [unquote(parte) for parte in urlsplit(self.path).path.strip('/').split('/')]
+        if len(partes) < 4 or partes[1] not in ('image', 'raw', 'video') or partes[2] != 'upload':
+            return self._responder(404, b'Recurso no encontrado', cuerpo=cuerpo)
+        tipo, resto = partes[1], partes[3:]
+
+        versiones = [i for i, parte in enumerate(resto) if VERSION.match(parte)]
+        if versiones:
+            transformaciones, public_id = resto[:versiones[0]], resto[versiones[0] + 1:]
+        else:
+            cantidad = 0
+            while cantidad < len(resto) - 1 and TRANSFORMACION.match(resto[cantidad]):
+                cantidad += 1
+            transformaciones, public_id = resto[:cantidad], resto[cantidad:]
+        if tipo != 'image':
+            transformaciones = []
+
+        ruta, formato = self.server.buscar(tipo, '/'.join(public_id))
+        if ruta is None:
+            return self._responder(404, b'Recurso no encontrado', cuerpo=cuerpo)
+        try:
+            contenido, formato = self._contenido(ruta, transformaciones, formato)
+        except (OSError, ValueError, KeyError, PILImage.DecompressionBombError) as e:
+            return self._responder(400, f'Transformación no válida: {e}'.encode(), cuerpo=cuerpo)
+
+        etag = f'"{hashlib.md5(contenido).hexdigest()}"'
+        cabeceras = {
+            'ETag': etag,
+            'Cache-Control': CACHE_CONTROL,
+            'Last-Modified': formatdate(ruta.stat().st_mtime, usegmt=True),
+            'Access-Control-Allow-Origin': '*',
+        }
+        if any('auto' == paso.get('f') for paso in _parametros(transformaciones)):
+            cabeceras['Vary'] = 'Accept'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            for nombre, valor in cabeceras.items():
+                self.send_header(nombre, valor)
+            self.end_headers()
+            return
+        tipo_contenido = mimetypes.guess_type(f'x.{formato}')[0] or 'application/octet-stream'
+        self._responder(200, contenido, tipo_contenido, cabeceras, cuerpo=cuerpo)
+
+    def _contenido(self, ruta, transformaciones, formato):
+        """(bytes, formato) del recurso tras aplicar las transformaciones pedidas."""
+        original = ruta.suffix.lstrip('.').lower()
+        for paso in _parametros(transformaciones):
+            if 'f' in paso:
+                formato = paso['f']
+        if formato == 'auto':
+            formato = 'webp' if 'image/webp' in self.headers.get('Accept', '') else original
+        formato = formato or original
+        if not transformaciones and formato == original:
+            return ruta.read_bytes(), formato
+        if formato not in FORMATOS_PILLOW:
+            raise ValueError(f'formato {formato}')
+
+        datos = ruta.stat()
+        clave = f'{ruta}:{datos.st_mtime_ns}:{"/".join(transformaciones)}:{formato}'
+        guardada = self.server.derivadas.get(clave)
+        if guardada is not None:
+            return guardada.read_bytes(), formato
+        contenido = transformar(ruta.read_bytes(), transformaciones, formato)
+        self.server.derivadas.set(clave, contenido)
+        return contenido, formato
+
+    def do_POST(self):
+        # /v1_1/<cloud>/<resource_type>/upload, lo que llama cloudinary.uploader.upload
+        partes = urlsplit(self.path).path.strip('/').split('/')
+        if len(partes) != 4 or partes[0] != 'v1_1' or partes[3] != 'upload':
+            return self._error(404, 'Acción no soportada')
+        tipo = partes[2]
+        longitud = int(self.headers.get('Content-Length', 0))
+        mensaje = BytesParser(policy=policy.HTTP).parsebytes(
+            f'Content-Type: {self.headers.get("Content-Type", "")}\r\n\r\n'.encode() + self.rfile.read(longitud)
+        )
+        campos, nombre_archivo, contenido = {}, None, None
+        for parte in mensaje.iter_parts():
+            nombre = parte.get_param('name', header='content-disposition')
+            if nombre == 'file':
+                nombre_archivo, contenido = parte.get_filename() or 'archivo', parte.get_payload(decode=True)
+            else:
+                campos[nombre] = parte.get_payload(decode=True).decode()
+        if contenido is None:
+            return self._error(400, 'Falta el archivo (las subidas por URL no están soportadas)')
+        if tipo == 'auto':
+            tipo = tipo_recurso(nombre_archivo)
+        if tipo not in TIPOS_RECURSO:
+            return self._error(400, f'resource_type no válido: {tipo}')
+
+        public_id = campos.get('public_id') or secrets.token_hex(10)
+        if campos.get('folder'):
+            public_id = f'{campos["folder"].strip("/")}/{public_id}'
+        resultado = {'resource_type': tipo, 'type': 'upload', 'bytes': len(contenido)}
+        if tipo == 'image':
+            try:
+                imagen = PILImage.open(BytesIO(contenido))
+            except (OSError, PILImage.DecompressionBombError):
+                return self._error(400, 'Invalid image file')
+            formato = 'jpg' if imagen.format == 'JPEG' else imagen.format.lower()
+            resultado.update(format=formato, width=imagen.width, height=imagen.height)
+            destino = self.server.ruta_contenida('image', f'{public_id}.{formato}')
+        else:
+            # Los raw conservan la extensión dentro del public_id, como en Cloudinary
+            public_id += Path(nombre_archivo).suffix
+            destino = self.server.ruta_contenida(tipo, public_id)
+        if destino is None:
+            return self._error(400, f'public_id no válido: {public_id}')
+        _escribir_atomico(destino, contenido)
+
+        version = int(time.time())
+        url = cloudinary_url(public_id, resource_type=tipo, version=version, format=resultado.get('format'))[0]
+        resultado.update(
+            public_id=public_id, version=version, url=url, secure_url=url,
+            etag=hashlib.md5(contenido).hexdigest(), original_filename=Path(nombre_archivo).stem,
+            created_at=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(version)),
+        )
+        self._responder(200, json.dumps(resultado).encode(), 'application/json')
+
+    def _error(self, estado, mensaje):
+        self._responder(estado, json.dumps({'error': {'message': mensaje}}).encode(), 'application/json')
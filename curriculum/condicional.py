@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .perfil_activo import resolver_perfil_activo
+from .snapshot import get_ultima_modificacion, get_version
+
+
+def etag_perfil(request, *args, **kwargs):
+    perfil, config = resolver_perfil_activo(request)
+    if perfil is None:
+        return None
+    # El identificador del despliegue invalida los validadores al cambiar las plantillas
+    return f'"{perfil.pk}-{get_version(perfil.pk)}{settings.CV_VERSION_DESPLIEGUE[:12]}"'
+
+
+def ultima_modificacion_perfil(request, *args, **kwargs):
+    perfil, config = resolver_perfil_activo(request)
+    if perfil is None:
+        return None
+    return get_ultima_modificacion(perfil.pk)
+
+
+def condicional(vista):
+    """Responde 304 a If-None-Match / If-Modified-Since antes de ejecutar la vista."""
+    vista = condition(etag_func=etag_perfil, last_modified_func=ultima_modificacion_perfil)(vista)
+    # no-cache: el navegador puede guardar la página pero debe revalidarla
+    return cache_control(no_cache=True)(vista)
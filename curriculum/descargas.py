@@ -0,0 +1,193 @@
+import email.utils
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache_disco import CacheDisco
+
+logger = logging.getLogger(__name__)
+
+HILOS = getattr(settings, 'CV_IMAGENES_HILOS', 8)
+# Descargas simultáneas contra un mismo host, como hacen los navegadores
+POR_HOST = getattr(settings, 'CV_DESCARGAS_POR_HOST', 6)
+# (conexión, lectura) de cada petición y plazo total de un lote, en segundos
+TIMEOUT = getattr(settings, 'CV_IMAGENES_TIMEOUT', (3.05, 10))
+PLAZO_TOTAL = getattr(settings, 'CV_IMAGENES_PLAZO', 20)
+# Reintenta los fallos de conexión y los 502/503/504 pasajeros antes de darse por vencido
+REINTENTOS = Retry(
+    total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({'GET'}), raise_on_status=False,
+)
+# Respuestas más grandes se devuelven pero no se guardan: desalojarían media caché
+MAXIMO_ENTRADA = getattr(settings, 'CV_DESCARGAS_MAXIMO_ENTRADA', 20 * 1024 * 1024)
+MAX_AGE = re.compile(r'(?:^|[\s,])max-age=(\d+)')
+CONTADORES = ('aciertos', 'revalidadas', 'descargas', 'obsoletas', 'errores', 'bytes_descargados')
+
+# Respuestas guardadas por URL: una línea JSON con los validadores y la caducidad, y el cuerpo
+cache_http = CacheDisco(settings.CV_DESCARGAS_CACHE_DIR, settings.CV_DESCARGAS_CACHE_MAX_BYTES, extension='.http')
+
+
+def crear_sesion(conexiones=POR_HOST):
+    sesion = requests.Session()
+    # Un pool keep-alive por host, tan grande como las descargas simultáneas permitidas
+    adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=conexiones, max_retries=REINTENTOS)
+    sesion.mount('http://', adaptador)
+    sesion.mount('https://', adaptador)
+    return sesion
+
+
+# Compartidos por todas las peticiones del proceso: el pool de hilos limita
+# las descargas simultáneas y la sesión reutiliza las conexiones TLS.
+_sesion = crear_sesion()
+_ejecutor = ThreadPoolExecutor(max_workers=HILOS, thread_name_prefix='cv-imagen')
+# También acotan las llamadas directas a descargar() que no pasan por el pool
+_limite_global = threading.BoundedSemaphore(HILOS)
+_limites_host = {}
+_cerrojo = threading.Lock()
+_contadores = Counter()
+
+
+def _limite_host(url):
+    host = urlsplit(url).netloc
+    with _cerrojo:
+        if host not in _limites_host:
+            _limites_host[host] = threading.BoundedSemaphore(POR_HOST)
+        return _limites_host[host]
+
+
+def _contar(**incrementos):
+    with _cerrojo:
+        _contadores.update(incrementos)
+
+
+def estadisticas():
+    """Contadores de este proceso desde que arrancó."""
+    with _cerrojo:
+        return {nombre: _contadores[nombre] for nombre in CONTADORES}
+
+
+def _vigencia(response):
+    """Segundos que la respuesta se puede usar sin preguntar al servidor."""
+    control = response.headers.get('Cache-Control', '').lower()
+    if 'no-cache' in control:
+        return 0
+    edad = MAX_AGE.search(control)
+    if edad:
+        # Age: lo que la copia ya lleva guardada en la CDN
+        transcurrido = response.headers.get('Age', '0')
+        return max(0, int(edad.group(1)) - (int(transcurrido) if transcurrido.isdigit() else 0))
+    try:
+        return max(0, email.utils.parsedate_to_datetime(response.headers['Expires']).timestamp() - time.time())
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+
+def _metadatos(response, anteriores=None):
+    """Validadores y caducidad de la respuesta, o None si no se debe guardar."""
+    if 'no-store' in response.headers.get('Cache-Control', '').lower():
+        return None
+    anteriores = anteriores or {}
+    # Un 304 puede omitir los validadores: valen los de la copia guardada
+    etag = response.headers.get('ETag') or anteriores.get('etag')
+    modificado = response.headers.get('Last-Modified') or anteriores.get('modificado')
+    vigencia = _vigencia(response)
+    if not vigencia and not (etag or modificado):
+        return None
+    return {'etag': etag, 'modificado': modificado, 'fresca_hasta': time.time() + vigencia}
+
+
+def _leer_entrada(url):
+    ruta = cache_http.get(url)
+    if ruta is None:
+        return None, None
+    try:
+        with open(ruta, 'rb') as archivo:
+            return json.loads(archivo.readline()), archivo.read()
+    except (FileNotFoundError, ValueError):
+        # Desalojada por otro worker entre get() y open()
+        return None, None
+
+
+def _guardar_entrada(url, response, contenido, anteriores=None):
+    metadatos = _metadatos(response, anteriores)
+    if metadatos is None or len(contenido) > MAXIMO_ENTRADA:
+        return
+    try:
+        cache_http.set(url, json.dumps(metadatos).encode() + b'\n' + contenido)
+    except OSError as e:
+        # Disco lleno o de solo lectura: la descarga vale igual, solo no se guarda
+        logger.warning("No se pudo guardar en caché %s: %s", url, e)
+
+
+def descargar(url, sesion=None, timeout=TIMEOUT):
+    """
+    Contenido de `url`, o None si la descarga falla. Las respuestas con
+    ETag, Last-Modified o max-age se guardan en disco: mientras están
+    frescas no se pide nada y después se revalidan con una petición
+    condicional. Si el servidor falla, se usa la copia caducada.
+    """
+    guardados, copia = _leer_entrada(url)
+    if guardados is not None and guardados['fresca_hasta'] > time.time():
+        _contar(aciertos=1)
+        return copia
+
+    cabeceras = {}
+    if guardados is not None:
+        if guardados['etag']:
+            cabeceras['If-None-Match'] = guardados['etag']
+        if guardados['modificado']:
+            cabeceras['If-Modified-Since'] = guardados['modificado']
+    try:
+        with _limite_global, _limite_host(url):
+            response = (sesion or _sesion).get(url, timeout=timeout, headers=cabeceras)
+    except requests.RequestException as e:
+        logger.warning("Error descargando %s: %s", url, e)
+        response = None
+
+    if response is not None and response.status_code == 304 and guardados is not None:
+        _contar(revalidadas=1)
+        _guardar_entrada(url, response, copia, guardados)
+        return copia
+    if response is not None and response.status_code == 200:
+        _contar(descargas=1, bytes_descargados=len(response.content))
+        _guardar_entrada(url, response, response.content)
+        return response.content
+
+    _contar(errores=1)
+    if guardados is not None and (response is None or response.status_code >= 500):
+        _contar(obsoletas=1)
+        return copia
+    return None
+
+
+def descargar_imagenes(urls, plazo=PLAZO_TOTAL, timeout=TIMEOUT):
+    """
+    Descarga en paralelo las URLs dadas y devuelve {url: bytes o None}.
+    Lo que no termina dentro de `plazo` segundos cuenta como fallido.
+    """
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if not urls:
+        return {}
+
+    limite = time.monotonic() + plazo
+    futuros = {url: _ejecutor.submit(descargar, url, None, timeout) for url in urls}
+    wait(futuros.values(), timeout=max(0, limite - time.monotonic()))
+
+    resultado = {}
+    for url, futuro in futuros.items():
+        if futuro.done():
+            resultado[url] = futuro.result()
+        else:
+            futuro.cancel()
+            resultado[url] = None
+    return resultado
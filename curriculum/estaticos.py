@@ -0,0 +1,413 @@
+"""
+Empaquetado de los recursos del front.
+
+`python manage.py empaquetar_estaticos` descarga las dependencias de
+terceros en versiones fijas, las une con nuestro CSS y JS en un paquete de
+cada tipo y reduce la fuente de iconos a los glifos que usan las plantillas.
+Los paquetes se escriben en CV_ESTATICOS_DIR; collectstatic les añade
+después la huella al nombre y WhiteNoise los sirve como inmutables. Las
+descargas se guardan aparte, en CV_ESTATICOS_VENDOR_DIR, para que
+collectstatic no publique (ni procese) los originales.
+
+El paquete CSS se poda: solo quedan las reglas cuyas clases e ids aparecen
+en plantillas, JS o vistas. Además, para cada página se guarda en
+CV_CSS_CRITICO el CSS de lo que se ve al abrirla: el marco de base.html y
+la primera sección de la página, hasta la marca {# pliegue #} de cada
+plantilla. base.html lo incrusta en el <head> y carga el paquete completo
+sin bloquear el renderizado.
+"""
+import gzip
+import json
+import re
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.template.loader import get_template
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from .descargas import descargar
+
+try:
+    from fontTools import subset
+except ImportError:
+    # Sin fontTools se publica la fuente de iconos completa
+    subset = None
+
+# Versiones fijas: nada de @latest, que impide cachear a largo plazo
+DEPENDENCIAS = {
+    'bootstrap.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'bootstrap-icons.css': 'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/bootstrap-icons.css',
+    'bootstrap-icons.woff2': 'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/fonts/bootstrap-icons.woff2',
+    'bootstrap.bundle.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'three.js': 'https://cdnjs.cloudflare.com/ajax/libs/three.js/r134/three.min.js',
+    'vanta.net.js': 'https://cdn.jsdelivr.net/npm/vanta@0.5.24/dist/vanta.net.min.js',
+}
+CSS_PROPIOS = ('css/styles.css', 'css/sidebar.css', 'css/perfil.css')
+JS_PROPIOS = ('js/sitio.js',)
+CSS_TERCEROS = ('bootstrap.css', 'bootstrap-icons.css')
+# Orden de carga dentro del paquete JS
+JS_TERCEROS = ('bootstrap.bundle.js', 'three.js', 'vanta.net.js')
+
+PAQUETE_CSS = 'paquetes/sitio.css'
+PAQUETE_JS = 'paquetes/sitio.js'
+FUENTE_ICONOS = 'paquetes/bootstrap-icons.woff2'
+
+ICONO_USADO = re.compile(r'\bbi-([a-z0-9]+(?:-[a-z0-9]+)*)')
+REGLA_ICONO = re.compile(r'\.bi-([a-z0-9-]+)::before\s*\{\s*content:\s*"\\([0-9a-f]+)";?\s*\}\s*')
+FUENTE_ICONOS_SRC = re.compile(r'src:\s*url\([^;]*;')
+MAPA_FUENTE = re.compile(r'^\s*//# sourceMappingURL=.*$|/\*# sourceMappingURL=.*?\*/', re.MULTILINE)
+
+PALABRA = re.compile(r'[A-Za-z_][\w-]*')
+CLASE_O_ID = re.compile(r'[.#](-?[A-Za-z_][\w-]*)')
+# Lo de dentro no tiene por qué estar en la página: .btn:not(.disabled) vale sin .disabled
+PSEUDO_CON_ARGUMENTOS = re.compile(r':(?:not|is|where|has)\((?:[^()]|\([^()]*\))*\)')
+ATRIBUTO = re.compile(r'\[\s*([\w-]+)[^\]]*\]')
+# Estados que solo aparecen al interactuar: no hacen falta para el primer pintado
+INTERACCION = re.compile(r':(?:hover|focus|focus-visible|focus-within|active)\b|::selection')
+URL_RELATIVA = re.compile(r'url\(\s*["\']?(?!data:|https?:|/)', re.IGNORECASE)
+PSEUDO = re.compile(r'::?[\w-]+(?:\([^)]*\))?')
+# Fin de lo que se ve sin desplazarse, en cada plantilla
+PLIEGUE = re.compile(r'\{#\s*pliegue\b')
+CLASE_JS = re.compile(r'classList\.(?:add|toggle)\(\s*["\']([\w-]+)')
+REFERENCIA_PLANTILLA = re.compile(r'\{%\s*(?:extends|include)\s+["\']([^"\']+)["\']')
+# Clases que pone el JS de Bootstrap en los componentes que usa el sitio
+# (modales). Si se usan otros (dropdown, tooltip...), hay que añadir las suyas.
+ESTADOS_BOOTSTRAP = {'show', 'showing', 'hiding', 'fade', 'modal-open', 'modal-backdrop', 'modal-static'}
+# Lo que queda por debajo del pliegue y debe seguir oculto mientras llega el paquete
+OCULTOS_AL_CARGAR = {'modal', 'fade', 'd-none', 'visually-hidden'}
+# Grupos cuyo interior se poda regla a regla
+AGRUPADORES = ('@media', '@supports', '@layer', '@container')
+
+
+class AlmacenamientoEstaticos(CompressedManifestStaticFilesStorage):
+    """
+    El de WhiteNoise (nombres con huella, comprimidos), pero una referencia a
+    un estático que no existe da su URL sin huella en lugar de un error 500.
+    """
+    manifest_strict = False
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            if content is not None:
+                raise
+            return name
+
+
+def descargar_dependencias(forzar=False):
+    """Baja a CV_ESTATICOS_VENDOR_DIR las dependencias que falten. Devuelve los nombres descargados."""
+    destino = Path(settings.CV_ESTATICOS_VENDOR_DIR)
+    destino.mkdir(parents=True, exist_ok=True)
+    descargadas = []
+    for nombre, url in DEPENDENCIAS.items():
+        ruta = destino / nombre
+        if ruta.exists() and not forzar:
+            continue
+        contenido = descargar(url, timeout=(5, 60))
+        if contenido is None:
+            raise RuntimeError(f'No se pudo descargar {url}')
+        ruta.write_bytes(contenido)
+        descargadas.append(nombre)
+    return descargadas
+
+
+def _directorios_fuente():
+    """Plantillas, vistas y estáticos propios (sin los paquetes ya generados)."""
+    directorios = [Path(d) for plantilla in settings.TEMPLATES for d in plantilla.get('DIRS', [])]
+    directorios += [Path(settings.BASE_DIR, 'curriculum')]
+    directorios += [Path(d) for d in settings.STATICFILES_DIRS if Path(d) != Path(settings.CV_ESTATICOS_DIR)]
+    return directorios
+
+
+def _textos_fuente():
+    for directorio in _directorios_fuente():
+        for ruta in directorio.rglob('*'):
+            if ruta.suffix in ('.html', '.js', '.py'):
+                yield ruta.read_text(errors='ignore')
+
+
+def iconos_usados():
+    """Nombres de icono (sin el prefijo bi-) que aparecen en plantillas, JS y vistas."""
+    usados = set()
+    for texto in _textos_fuente():
+        usados.update(ICONO_USADO.findall(texto))
+    return usados
+
+
+def palabras_usadas():
+    """Todo lo que puede ser una clase o un id en el sitio, más las clases de estado de Bootstrap."""
+    usadas = set(ESTADOS_BOOTSTRAP)
+    for texto in _textos_fuente():
+        usadas.update(PALABRA.findall(texto))
+    return usadas
+
+
+def reducir_css_iconos(css, usados, url_fuente):
+    """Quita las reglas de los iconos que no se usan. Devuelve (css, códigos de los glifos que quedan)."""
+    codigos = set()
+
+    def filtrar(coincidencia):
+        if coincidencia.group(1) not in usados:
+            return ''
+        codigos.add(int(coincidencia.group(2), 16))
+        return coincidencia.group(0)
+
+    css = REGLA_ICONO.sub(filtrar, css)
+    css = FUENTE_ICONOS_SRC.sub(f'src: url("{url_fuente}") format("woff2");', css)
+    return css, codigos
+
+
+def reducir_fuente(origen, codigos):
+    """WOFF2 con solo los glifos de `codigos`, o la fuente original si no hay fontTools."""
+    if subset is None:
+        return origen.read_bytes()
+    opciones = subset.Options()
+    opciones.flavor = 'woff2'
+    opciones.layout_features = []
+    opciones.name_IDs = ['*']
+    fuente = subset.load_font(str(origen), opciones)
+    subconjunto = subset.Subsetter(opciones)
+    subconjunto.populate(unicodes=codigos)
+    subconjunto.subset(fuente)
+    salida = BytesIO()
+    subset.save_font(fuente, salida, opciones)
+    return salida.getvalue()
+
+
+def minificar_css(css):
+    # Los comentarios /*! ... */ son avisos de licencia y se conservan
+    css = re.sub(r'/\*(?!!).*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    # Sin tocar los espacios alrededor de ':' en selectores ni de '+'/'-' en calc()
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minificar_js(js):
+    """Conservador: quita comentarios de línea completa, sangrías y líneas vacías."""
+    lineas = (linea.strip() for linea in js.splitlines())
+    return '\n'.join(linea for linea in lineas if linea and not linea.startswith('//'))
+
+
+def _partir(texto, separador):
+    """Parte `texto` por `separador` fuera de comillas y paréntesis."""
+    partes, actual, profundidad, comilla = [], [], 0, None
+    for caracter in texto:
+        if comilla:
+            comilla = None if caracter == comilla else comilla
+        elif caracter in '"\'':
+            comilla = caracter
+        elif caracter == '(':
+            profundidad += 1
+        elif caracter == ')':
+            profundidad -= 1
+        elif caracter == separador and profundidad == 0:
+            partes.append(''.join(actual))
+            actual = []
+            continue
+        actual.append(caracter)
+    partes.append(''.join(actual))
+    return partes
+
+
+def _reglas(css):
+    """
+    Recorre el primer nivel de un CSS minificado. Da (cabecera, cuerpo) por
+    regla y (texto, None) por comentario /*! */ o sentencia como @import.
+    """
+    i = 0
+    while i < len(css):
+        if css.startswith('/*', i):
+            fin = css.index('*/', i) + 2
+            yield css[i:fin], None
+            i = fin
+            continue
+        inicio, profundidad, comilla = i, 0, None
+        while i < len(css):
+            caracter = css[i]
+            if comilla:
+                comilla = None if caracter == comilla else comilla
+            elif caracter in '"\'':
+                comilla = caracter
+            elif caracter == '{':
+                if profundidad == 0:
+                    apertura = i
+                profundidad += 1
+            elif caracter == '}':
+                profundidad -= 1
+                if profundidad == 0:
+                    break
+            elif caracter == ';' and profundidad == 0:
+                break
+            i += 1
+        i += 1
+        trozo = css[inicio:i].strip()
+        if not trozo:
+            continue
+        if trozo.endswith(';') or '{' not in trozo:
+            yield trozo, None
+        else:
+            yield css[inicio:apertura].strip(), css[apertura + 1:i - 1]
+
+
+def _selector_usado(selector, usadas, etiquetas=False):
+    """Si todas las clases, ids y atributos del selector están en `usadas`; con `etiquetas`, también los elementos."""
+    if '\\' in selector:
+        # Clases escapadas (.w-\31...): mejor conservarlas que interpretarlas mal
+        return True
+    selector = PSEUDO_CON_ARGUMENTOS.sub('', selector)
+    # Un selector de atributo sobra si ninguna plantilla usa ese atributo
+    sin_atributos = ATRIBUTO.sub('', selector)
+    nombres = ATRIBUTO.findall(selector) + CLASE_O_ID.findall(sin_atributos)
+    if etiquetas:
+        nombres += PALABRA.findall(PSEUDO.sub('', CLASE_O_ID.sub('', sin_atributos)))
+    return all(nombre in usadas for nombre in nombres)
+
+
+def podar_css(css, usadas, critico=False):
+    """
+    Quita de `css` (minificado) los selectores con clases o ids que no están
+    en `usadas`. Con `critico` se queda además con lo imprescindible para el
+    primer pintado: fuera los elementos que no están en `usadas`, estados de
+    interacción, @font-face, impresión y url() relativas, que desde un
+    <style> incrustado no se resolverían.
+    """
+    salida = []
+    for cabecera, cuerpo in _reglas(css):
+        if cuerpo is None:
+            if not critico:
+                salida.append(cabecera)
+        elif cabecera.startswith(AGRUPADORES):
+            if critico and cabecera.startswith('@media print'):
+                continue
+            interior = podar_css(cuerpo, usadas, critico)
+            if interior:
+                salida.append(f'{cabecera}{{{interior}}}')
+        elif cabecera.startswith('@'):
+            # @font-face, @keyframes, @page...
+            if not (critico and cabecera.startswith(('@font-face', '@page'))):
+                salida.append(f'{cabecera}{{{cuerpo}}}')
+        else:
+            selectores = [
+                selector for selector in _partir(cabecera, ',')
+                if _selector_usado(selector, usadas, etiquetas=critico)
+                and not (critico and INTERACCION.search(selector))
+            ]
+            if critico:
+                cuerpo = ';'.join(d for d in _partir(cuerpo, ';') if not URL_RELATIVA.search(d))
+            if selectores and cuerpo:
+                salida.append(f'{",".join(selectores)}{{{cuerpo}}}')
+    return ''.join(salida)
+
+
+def paginas():
+    """Plantillas que extienden otra: las que se sirven como página completa."""
+    nombres = []
+    for plantilla in settings.TEMPLATES:
+        for directorio in map(Path, plantilla.get('DIRS', [])):
+            for ruta in sorted(directorio.rglob('*.html')):
+                if re.search(r'\{%\s*extends\b', ruta.read_text(encoding='utf-8')):
+                    nombres.append(ruta.relative_to(directorio).as_posix())
+    return nombres
+
+
+def palabras_sobre_el_pliegue(nombre, vistas=None):
+    """
+    Palabras de la plantilla hasta su marca {# pliegue #} (entera si no la
+    tiene), y de las plantillas que extiende o incluye en ese tramo.
+    """
+    vistas = set() if vistas is None else vistas
+    if nombre in vistas:
+        return set()
+    vistas.add(nombre)
+    fuente = get_template(nombre).template.source
+    pliegue = PLIEGUE.search(fuente)
+    if pliegue:
+        fuente = fuente[:pliegue.start()]
+    palabras = set(PALABRA.findall(fuente))
+    for referencia in REFERENCIA_PLANTILLA.findall(fuente):
+        palabras |= palabras_sobre_el_pliegue(referencia, vistas)
+    return palabras
+
+
+def _gzip(texto):
+    return len(gzip.compress(texto.encode(), 9))
+
+
+def generar_criticos(css):
+    """
+    CSS crítico de cada página a partir del paquete ya podado: lo que está
+    sobre el pliegue, las clases que el JS propio pone al cargar (.pinned...)
+    y lo que mantiene oculto el resto. Las que pasen de
+    CV_CSS_CRITICO_MAX_BYTES comprimidas se quedan sin él. Escribe
+    CV_CSS_CRITICO y devuelve {página: (bytes del paquete, bytes del crítico o None)}.
+    """
+    fijas = set(OCULTOS_AL_CARGAR)
+    for nombre in JS_PROPIOS:
+        fijas.update(CLASE_JS.findall(_leer_propio(nombre)))
+    criticos, informe = {}, {}
+    for pagina in paginas():
+        critico = podar_css(css, palabras_sobre_el_pliegue(pagina) | fijas, critico=True)
+        if _gzip(critico) <= settings.CV_CSS_CRITICO_MAX_BYTES:
+            criticos[pagina] = critico
+        informe[pagina] = (len(css.encode()), len(critico.encode()) if pagina in criticos else None)
+    destino = Path(settings.CV_CSS_CRITICO)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    destino.write_text(json.dumps(criticos, ensure_ascii=False), encoding='utf-8')
+    return informe
+
+
+def _leer_propio(nombre):
+    ruta = finders.find(nombre)
+    if ruta is None:
+        raise RuntimeError(f'No se encontró {nombre} en los estáticos')
+    return Path(ruta).read_text(encoding='utf-8')
+
+
+def empaquetar(forzar_descarga=False):
+    """
+    Escribe el paquete CSS, el JS y la fuente de iconos en CV_ESTATICOS_DIR,
+    y el CSS crítico de cada página en CV_CSS_CRITICO. Devuelve
+    ({archivo: (bytes de las piezas por separado, bytes del paquete)},
+    el informe de generar_criticos).
+    """
+    descargar_dependencias(forzar_descarga)
+    vendor = Path(settings.CV_ESTATICOS_VENDOR_DIR)
+    salida = Path(settings.CV_ESTATICOS_DIR)
+    # Relativa al CSS: collectstatic la reescribe con la huella
+    css_iconos, codigos = reducir_css_iconos(
+        (vendor / 'bootstrap-icons.css').read_text(encoding='utf-8'), iconos_usados(),
+        Path(FUENTE_ICONOS).name,
+    )
+    fuente = reducir_fuente(vendor / 'bootstrap-icons.woff2', codigos)
+    piezas_css = [(vendor / 'bootstrap.css').read_text(encoding='utf-8'), css_iconos]
+    piezas_css += [_leer_propio(nombre) for nombre in CSS_PROPIOS]
+    css = minificar_css(MAPA_FUENTE.sub('', '\n'.join(piezas_css)))
+    sin_podar = len(css.encode())
+    css = podar_css(css, palabras_usadas())
+
+    piezas_js = [MAPA_FUENTE.sub('', (vendor / nombre).read_text(encoding='utf-8')) for nombre in JS_TERCEROS]
+    piezas_js += [minificar_js(_leer_propio(nombre)) for nombre in JS_PROPIOS]
+    # ';' entre piezas: un archivo que termina sin él no debe unirse con el siguiente
+    js = '\n;'.join(piezas_js)
+
+    antes_css = sum((vendor / nombre).stat().st_size for nombre in CSS_TERCEROS)
+    antes_css += sum(Path(finders.find(nombre)).stat().st_size for nombre in CSS_PROPIOS)
+    antes_js = sum((vendor / nombre).stat().st_size for nombre in JS_TERCEROS)
+    antes_js += sum(Path(finders.find(nombre)).stat().st_size for nombre in JS_PROPIOS)
+    informe = {}
+    for nombre, contenido, antes in (
+        (PAQUETE_CSS, css.encode(), antes_css),
+        (PAQUETE_JS, js.encode(), antes_js),
+        (FUENTE_ICONOS, fuente, (vendor / 'bootstrap-icons.woff2').stat().st_size),
+    ):
+        ruta = salida / nombre
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        ruta.write_bytes(contenido)
+        informe[nombre] = (antes, len(contenido))
+    informe[f'{PAQUETE_CSS} (poda)'] = (sin_podar, len(css.encode()))
+    return informe, generar_criticos(css)
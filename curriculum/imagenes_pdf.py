@@ -0,0 +1,106 @@
+import hashlib
+import logging
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from PIL import Image as PILImage, ImageOps
+from reportlab.lib.units import cm
+
+from .cache_disco import CacheDisco
+from .descargas import descargar_imagenes
+
+logger = logging.getLogger(__name__)
+
+DPI = getattr(settings, 'CV_IMAGENES_DPI', 200)
+CALIDAD_JPEG = 85
+# Cuánto se recuerda qué contenido hay detrás de una URL antes de volver a descargarla
+INDICE_TIMEOUT = getattr(settings, 'CV_IMAGENES_INDICE_TIMEOUT', 60 * 60 * 24)
+
+# Huecos del PDF donde se dibujan imágenes: nombre -> lado del cuadrado en puntos
+RANURAS = {
+    'foto': 4 * cm,
+    'miniatura': 3 * cm,
+}
+
+cache_derivadas = CacheDisco(
+    settings.CV_IMAGENES_CACHE_DIR, settings.CV_IMAGENES_CACHE_MAX_BYTES, extension='.jpg'
+)
+
+
+def lado_en_pixeles(ranura, dpi=DPI):
+    return round(RANURAS[ranura] / 72 * dpi)
+
+
+def derivar(contenido, ranura, dpi=DPI, calidad=CALIDAD_JPEG):
+    """Recorta al centro, reduce a la resolución del hueco y codifica en JPEG."""
+    lado = lado_en_pixeles(ranura, dpi)
+    imagen = PILImage.open(BytesIO(contenido))
+    # Los JPEG grandes se decodifican directamente a una escala reducida
+    imagen.draft('RGB', (lado, lado))
+    imagen = ImageOps.exif_transpose(imagen)
+    if imagen.mode in ('RGBA', 'LA', 'P'):
+        imagen = imagen.convert('RGBA')
+        fondo = PILImage.new('RGB', imagen.size, 'white')
+        fondo.paste(imagen, mask=imagen.getchannel('A'))
+        imagen = fondo
+    imagen = ImageOps.fit(imagen.convert('RGB'), (lado, lado), PILImage.LANCZOS)
+
+    buffer = BytesIO()
+    imagen.save(buffer, format='JPEG', quality=calidad, optimize=True)
+    return buffer.getvalue()
+
+
+def _clave_indice(url):
+    return f'cv:imagen:{hashlib.md5(url.encode()).hexdigest()}'
+
+
+def _clave_derivada(hash_origen, ranura, dpi, calidad):
+    return f'{ranura}:{dpi}:{calidad}:{hash_origen}'
+
+
+def _leer_derivada(clave):
+    ruta = cache_derivadas.get(clave)
+    if ruta is not None:
+        try:
+            return ruta.read_bytes()
+        except FileNotFoundError:
+            pass
+    return None
+
+
+def preparar_imagenes(pedidos, dpi=DPI, calidad=CALIDAD_JPEG):
+    """
+    Recibe {(url, ranura)} y devuelve {(url, ranura): JPEG o None}. Las
+    derivadas se guardan por hash del contenido original, resolución y
+    calidad; solo se descargan las URLs cuyo contenido no se conoce o cuya
+    derivada ya no está en disco.
+    """
+    resultado = {}
+    pendientes = []
+    hashes = cache.get_many([_clave_indice(url) for url, ranura in pedidos])
+    for url, ranura in pedidos:
+        hash_origen = hashes.get(_clave_indice(url))
+        derivada = _leer_derivada(_clave_derivada(hash_origen, ranura, dpi, calidad)) if hash_origen else None
+        if derivada is None:
+            pendientes.append((url, ranura))
+        resultado[(url, ranura)] = derivada
+
+    descargas = descargar_imagenes(url for url, ranura in pendientes)
+    for url, ranura in pendientes:
+        contenido = descargas.get(url)
+        if contenido is None:
+            continue
+        hash_origen = hashlib.sha256(contenido).hexdigest()
+        cache.set(_clave_indice(url), hash_origen, INDICE_TIMEOUT)
+        clave = _clave_derivada(hash_origen, ranura, dpi, calidad)
+        derivada = _leer_derivada(clave)
+        if derivada is None:
+            try:
+                derivada = derivar(contenido, ranura, dpi, calidad)
+            except (OSError, ValueError, PILImage.DecompressionBombError) as e:
+                logger.warning("Imagen no válida %s: %s", url, e)
+                continue
+            cache_derivadas.set(clave, derivada)
+        resultado[(url, ranura)] = derivada
+    return resultado
@@ -0,0 +1,104 @@
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image as PILImage, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Sin credenciales de Cloudinary, settings.py guarda los archivos en MEDIA_ROOT
+ALMACENAMIENTO_LOCAL = getattr(settings, 'DEFAULT_FILE_STORAGE', '').endswith('FileSystemStorage')
+# Multiplicadores del ancho pedido que se ofrecen en el srcset (pantallas 1x, 2x y 3x)
+DENSIDADES = (1, 2, 3)
+CALIDAD_WEBP = 80
+CARPETA_DERIVADAS = 'derivadas'
+
+
+def url_original(recurso):
+    try:
+        return recurso.url
+    except (ValueError, AttributeError):
+        # CloudinaryResource sin cloud_name configurado
+        return ''
+
+
+def ruta_local(recurso):
+    """Archivo del recurso dentro de MEDIA_ROOT, o None si no está en disco."""
+    ruta = getattr(recurso, 'path', None)
+    if ruta is None:
+        public_id = getattr(recurso, 'public_id', None) or str(recurso)
+        formato = getattr(recurso, 'format', None)
+        ruta = Path(settings.MEDIA_ROOT, f'{public_id}.{formato}' if formato else public_id)
+    ruta = Path(ruta)
+    return ruta if ruta.is_file() else None
+
+
+def _derivada_local(origen, ancho, alto):
+    """Genera (una sola vez) la versión WebP reducida y devuelve su URL bajo MEDIA_URL."""
+    datos = origen.stat()
+    huella = hashlib.md5(f'{origen}:{datos.st_mtime_ns}:{datos.st_size}'.encode()).hexdigest()[:16]
+    nombre = f'{huella}-{ancho}x{alto or 0}.webp'
+    destino = Path(settings.MEDIA_ROOT, CARPETA_DERIVADAS, nombre)
+    if not destino.exists():
+        imagen = PILImage.open(origen)
+        imagen.draft('RGB', (ancho, alto or ancho))
+        imagen = ImageOps.exif_transpose(imagen)
+        if alto:
+            imagen = ImageOps.fit(imagen, (ancho, alto), PILImage.LANCZOS)
+        else:
+            # thumbnail nunca amplía: una imagen más estrecha queda como está
+            imagen.thumbnail((ancho, imagen.height), PILImage.LANCZOS)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=destino.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                imagen.save(archivo, format='WEBP', quality=CALIDAD_WEBP)
+            os.chmod(temporal, 0o644)
+            os.replace(temporal, destino)
+        except BaseException:
+            Path(temporal).unlink(missing_ok=True)
+            raise
+    return f'{settings.MEDIA_URL}{CARPETA_DERIVADAS}/{nombre}'
+
+
+def url_imagen(recurso, ancho, alto=None):
+    """
+    URL del recurso reducido a `ancho` píxeles (y recortado a `alto` si se
+    indica). En Cloudinary es una transformación con formato y calidad
+    automáticos; en local, una derivada WebP generada con Pillow.
+    """
+    if ALMACENAMIENTO_LOCAL:
+        origen = ruta_local(recurso)
+        if origen is None:
+            return url_original(recurso)
+        try:
+            return _derivada_local(origen, ancho, alto)
+        except (OSError, ValueError, PILImage.DecompressionBombError) as e:
+            logger.warning("No se pudo reducir la imagen %s: %s", origen, e)
+            return url_original(recurso)
+
+    if not hasattr(recurso, 'build_url'):
+        return url_original(recurso)
+    # https lo decide cloudinary.config (secure=True con Cloudinary real)
+    opciones = {'width': ancho, 'crop': 'limit', 'fetch_format': 'auto', 'quality': 'auto'}
+    if alto:
+        opciones.update(height=alto, crop='fill', gravity='auto')
+    return recurso.build_url(**opciones)
+
+
+def atributos_imagen(recurso, ancho, alto=None, sizes=None):
+    """src, srcset y sizes para mostrar el recurso en un hueco de `ancho` píxeles CSS."""
+    candidatos = []
+    for densidad in DENSIDADES:
+        ancho_real = ancho * densidad
+        alto_real = alto * densidad if alto else None
+        candidatos.append(f'{url_imagen(recurso, ancho_real, alto_real)} {ancho_real}w')
+    return {
+        # El más grande como src: también lo usa el visor ampliado de la venta de garaje
+        'src': candidatos[-1].rsplit(' ', 1)[0],
+        'srcset': ', '.join(candidatos),
+        'sizes': sizes or f'{ancho}px',
+    }
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from curriculum.benchmarks import consultas, estilos, imagenes, pdf, pie
+
+SUITES = {
+    'consultas': consultas,
+    'imagenes': imagenes,
+    'estilos': estilos,
+    'pie': pie,
+    'pdf': pdf,
+}
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta los benchmarks de rendimiento de la hoja de vida'
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest='suite', required=True)
+        for nombre, suite in SUITES.items():
+            suite.agregar_argumentos(subparsers.add_parser(nombre, help=suite.__doc__))
+
+    def handle(self, *args, **options):
+        SUITES[options['suite']].ejecutar(self, **options)
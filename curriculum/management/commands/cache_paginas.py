@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from curriculum.cache_paginas import CACHE_ACTIVA, estadisticas, reiniciar_estadisticas
+
+
+class Command(BaseCommand):
+    help = 'Muestra los aciertos y fallos de la caché de páginas completas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reiniciar', action='store_true', help='Pone los contadores a cero')
+
+    def handle(self, *args, **options):
+        if not CACHE_ACTIVA:
+            self.stdout.write(self.style.WARNING('La caché de páginas está desactivada (CV_PAGE_CACHE)'))
+
+        aciertos, fallos = estadisticas()
+        total = aciertos + fallos
+        ratio = aciertos / total * 100 if total else 0
+        self.stdout.write(f'Aciertos: {aciertos}')
+        self.stdout.write(f'Fallos:   {fallos}')
+        self.stdout.write(self.style.SUCCESS(f'Ratio de aciertos: {ratio:.1f} %'))
+
+        if options['reiniciar']:
+            reiniciar_estadisticas()
+            self.stdout.write('Contadores reiniciados')
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from curriculum import estaticos
+
+
+class Command(BaseCommand):
+    help = 'Descarga las dependencias del front y genera los paquetes CSS/JS y la fuente de iconos reducida'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--forzar', action='store_true', help='Vuelve a descargar las dependencias')
+
+    def handle(self, *args, **options):
+        try:
+            informe, criticos = estaticos.empaquetar(options['forzar'])
+        except (RuntimeError, OSError) as e:
+            raise CommandError(str(e))
+
+        if estaticos.subset is None:
+            self.stderr.write('fontTools no está instalado: se publica la fuente de iconos completa')
+        for nombre, (antes, despues) in informe.items():
+            self.stdout.write(self.style.SUCCESS(
+                f'  {nombre:<32} {antes / 1024:>8.1f} KB -> {despues / 1024:>8.1f} KB'
+            ))
+        self.stdout.write('CSS crítico (paquete -> incrustado en el <head>):')
+        for pagina, (paquete, critico) in criticos.items():
+            if critico is None:
+                self.stderr.write(f'  {pagina:<40} supera CV_CSS_CRITICO_MAX_BYTES: se enlaza el paquete')
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f'  {pagina:<40} {paquete / 1024:>8.1f} KB -> {critico / 1024:>8.1f} KB'
+            ))
+        self.stdout.write('Ahora: python manage.py collectstatic')
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.text import slugify
+
+from curriculum.models import DatosPersonales
+from curriculum.pdf import MODOS, SECCIONES_PDF, normalizar_secciones
+from curriculum.snapshot import SECCIONES
+from curriculum.tema_pdf import get_tema
+
+MANIFIESTO = '.exportar.json'
+
+
+def _conjunto(valor):
+    """'nombre=perfil,experiencia' -> ('nombre', ('experiencia', 'perfil'))"""
+    nombre, separador, secciones = valor.partition('=')
+    if not separador or not nombre:
+        raise ValueError(valor)
+    secciones = [seccion.strip() for seccion in secciones.split(',') if seccion.strip()]
+    desconocidas = set(secciones) - set(SECCIONES_PDF)
+    if not secciones or desconocidas:
+        raise ValueError(valor)
+    return nombre, normalizar_secciones(secciones)
+
+
+def huella_exportacion(snapshot, secciones, tema, modo):
+    """Como clave_pdf, pero sin la fecha: el PDF exportado solo cambia con el contenido."""
+    listas = [nombre for nombre in secciones if nombre in SECCIONES]
+    partes = [snapshot.huella(listas), ','.join(secciones), tema, modo, settings.CV_VERSION_DESPLIEGUE]
+    return hashlib.sha256('|'.join(partes).encode()).hexdigest()
+
+
+def exportar(perfil_id, conjunto, secciones, tema, modo, destino, huella_anterior):
+    """
+    Se ejecuta en un proceso del pool. Devuelve (perfil_id, conjunto, archivo,
+    huella, páginas, bytes); páginas es None si el PDF no cambió.
+    """
+    from curriculum.pdf import construir_pdf
+    from curriculum.snapshot import get_snapshot_pdf
+
+    snapshot = get_snapshot_pdf(perfil_id)
+    perfil = snapshot.perfil
+    archivo = Path(destino) / conjunto / f'{perfil_id}-{slugify(f"{perfil.nombres} {perfil.apellidos}")}.pdf'
+    huella = huella_exportacion(snapshot, secciones, tema, modo)
+    if huella == huella_anterior and archivo.exists():
+        return perfil_id, conjunto, str(archivo), huella, None, archivo.stat().st_size
+
+    # Escritura atómica: un lector nunca ve un PDF a medio escribir
+    archivo.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=archivo.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(descriptor, 'wb') as salida:
+            paginas = construir_pdf(snapshot, secciones, tema, destino=salida, modo=modo)
+            tamano = salida.tell()
+        os.chmod(temporal, 0o644)
+        os.replace(temporal, archivo)
+    except BaseException:
+        Path(temporal).unlink(missing_ok=True)
+        raise
+    return perfil_id, conjunto, str(archivo), huella, paginas, tamano
+
+
+class Command(BaseCommand):
+    help = 'Genera el PDF de varios perfiles en paralelo, fuera de cualquier request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--destino', default=Path(settings.BASE_DIR, 'exportados'), help='Directorio de salida')
+        parser.add_argument('--perfiles', nargs='+', type=int, help='Solo estos idperfil')
+        parser.add_argument('--activos', action='store_true', help='Solo perfiles con perfilactivo=1')
+        parser.add_argument(
+            '--conjunto', action='append', dest='conjuntos', metavar='NOMBRE=SECCION,...',
+            help=f'Conjunto de secciones (repetible). Por defecto: completo={",".join(SECCIONES_PDF)}',
+        )
+        parser.add_argument('--tema', default=None, help='Tema del PDF')
+        parser.add_argument('--modo', choices=list(MODOS), default='normal', help='Modo de salida del PDF')
+        parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--forzar', action='store_true', help='Regenera aunque el contenido no haya cambiado')
+
+    def handle(self, *args, **options):
+        try:
+            conjuntos = dict(_conjunto(valor) for valor in options['conjuntos'] or [])
+        except ValueError as e:
+            raise CommandError(f'Conjunto no válido: {e}. Secciones posibles: {", ".join(SECCIONES_PDF)}')
+        conjuntos = conjuntos or {'completo': normalizar_secciones(SECCIONES_PDF)}
+        try:
+            tema = get_tema(options['tema']).nombre
+        except KeyError as e:
+            raise CommandError(e.args[0])
+
+        perfiles = DatosPersonales.objects.order_by('pk')
+        if options['perfiles']:
+            perfiles = perfiles.filter(pk__in=options['perfiles'])
+        if options['activos']:
+            perfiles = perfiles.filter(perfilactivo=1)
+        ids = list(perfiles.values_list('pk', flat=True))
+        if not ids:
+            raise CommandError('No hay perfiles para exportar')
+
+        destino = Path(options['destino'])
+        archivo_manifiesto = destino / MANIFIESTO
+        anteriores = {}
+        if archivo_manifiesto.exists() and not options['forzar']:
+            anteriores = json.loads(archivo_manifiesto.read_text())
+
+        tareas = [
+            (perfil_id, conjunto, secciones, tema, options['modo'], str(destino),
+             anteriores.get(f'{conjunto}/{perfil_id}'))
+            for perfil_id in ids for conjunto, secciones in conjuntos.items()
+        ]
+        procesos = max(1, min(options['procesos'], len(tareas)))
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{len(tareas)} PDF ({len(ids)} perfiles x {len(conjuntos)} conjuntos) con {procesos} procesos'
+        ))
+
+        # Los procesos hijos abren sus propias conexiones
+        connections.close_all()
+        actuales = dict(anteriores)
+        generados = paginas_totales = bytes_totales = errores = 0
+        inicio = time.perf_counter()
+        contexto = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto, initializer=django.setup) as ejecutor:
+            futuros = {ejecutor.submit(exportar, *tarea): tarea for tarea in tareas}
+            for futuro in as_completed(futuros):
+                perfil_id, conjunto = futuros[futuro][:2]
+                try:
+                    perfil_id, conjunto, archivo, huella, paginas, tamano = futuro.result()
+                except Exception as e:
+                    errores += 1
+                    self.stderr.write(f'  error        {conjunto}/{perfil_id}: {e}')
+                    continue
+                actuales[f'{conjunto}/{perfil_id}'] = huella
+                if paginas is None:
+                    self.stdout.write(f'  sin cambios  {archivo}')
+                    continue
+                generados += 1
+                paginas_totales += paginas
+                bytes_totales += tamano
+                self.stdout.write(self.style.SUCCESS(f'  generado     {archivo} ({paginas} págs, {tamano // 1024} KB)'))
+        segundos = time.perf_counter() - inicio
+
+        destino.mkdir(parents=True, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=destino, prefix='.tmp-')
+        with os.fdopen(descriptor, 'w') as archivo:
+            json.dump(actuales, archivo, indent=2)
+        os.replace(temporal, archivo_manifiesto)
+
+        self.stdout.write(
+            f'{generados} generados, {len(tareas) - generados - errores} sin cambios, {errores} errores '
+            f'en {segundos:.2f}s'
+        )
+        if generados:
+            self.stdout.write(self.style.SUCCESS(
+                f'{generados / segundos:.2f} documentos/s, {paginas_totales / segundos:.2f} páginas/s, '
+                f'{bytes_totales / 1024 / 1024:.1f} MB'
+            ))
+        if errores:
+            raise CommandError(f'{errores} PDF no se pudieron generar')
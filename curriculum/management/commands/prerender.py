@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Max
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from curriculum.perfil_activo import resolver_perfil_activo
+from curriculum.resumenes import CAMPO_CONFIG
+from curriculum.snapshot import SECCIONES
+
+# Páginas públicas -> sección que muestran (None: la portada, que resume todas)
+PAGINAS = {
+    'perfil_profesional': None,
+    'experiencia_laboral': 'experiencia',
+    'reconocimientos': 'reconocimientos',
+    'cursos_realizados': 'cursos',
+    'productos_academicos': 'productosacademicos',
+    'productos_laborales': 'productoslaborales',
+    'venta_garage': 'ventagarage',
+}
+ARCHIVO_PDF = 'cv.pdf'
+MANIFIESTO = '.prerender.json'
+
+
+def _escribir(ruta, contenido):
+    # Escritura atómica: WhiteNoise nunca ve un archivo a medio escribir
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=ruta.parent, prefix='.tmp-')
+    with os.fdopen(descriptor, 'wb') as archivo:
+        archivo.write(contenido)
+    os.chmod(temporal, 0o644)
+    os.replace(temporal, ruta)
+
+
+def _huella_plantillas():
+    resumen = hashlib.md5(settings.CV_VERSION_DESPLIEGUE.encode())
+    for ruta in sorted(Path(settings.BASE_DIR, 'templates').rglob('*.html')):
+        resumen.update(ruta.read_bytes())
+    return resumen.hexdigest()
+
+
+def huellas(perfil, config):
+    """Huella de cada parte del perfil calculada desde la base de datos."""
+    base = [_huella_plantillas(), perfil.pk, perfil.fechaactualizacion, config.fechaactualizacion]
+    resultado = {None: base}
+    for nombre, (atributo, modelo, orden) in SECCIONES.items():
+        # El conteo detecta los borrados, que no dejan rastro en fechaactualizacion
+        datos = modelo.objects.filter(idperfilconqueestaactivo=perfil).aggregate(
+            filas=Count('pk'), modificado=Max('fechaactualizacion'),
+        )
+        resultado[nombre] = [datos['filas'], datos['modificado']]
+
+    def huella(partes):
+        return hashlib.md5(json.dumps(partes, default=str).encode()).hexdigest()
+
+    todas = list(resultado.values())
+    actuales = {
+        nombre: huella([base, resultado[seccion]] if seccion else todas)
+        for nombre, seccion in PAGINAS.items()
+    }
+    actuales[ARCHIVO_PDF] = huella(todas)
+    return actuales
+
+
+class Command(BaseCommand):
+    help = 'Genera las páginas públicas como HTML estático para servirlas con WhiteNoise'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--destino', default=settings.CV_PRERENDER_ROOT, help='Directorio de salida')
+        parser.add_argument('--pdf', action='store_true', help='Genera también el PDF con las secciones visibles')
+        parser.add_argument('--forzar', action='store_true', help='Regenera todo aunque no haya cambios')
+
+    def _renderizar(self, factory, ruta, metodo='get', **datos):
+        request = getattr(factory, metodo)(ruta, **datos)
+        request.resolver_match = coincidencia = resolve(ruta)
+        response = coincidencia.func(request, *coincidencia.args, **coincidencia.kwargs)
+        if response.status_code != 200:
+            raise CommandError(f'{ruta} respondió {response.status_code}')
+        if response.streaming:
+            # El PDF llega como FileResponse
+            try:
+                return b''.join(response.streaming_content)
+            finally:
+                response.close()
+        return response.content
+
+    def handle(self, *args, **options):
+        destino = Path(options['destino'])
+        perfil, config = resolver_perfil_activo()
+        if perfil is None:
+            raise CommandError('No hay perfil para generar')
+
+        archivo_manifiesto = destino / MANIFIESTO
+        anteriores = {}
+        if archivo_manifiesto.exists() and not options['forzar']:
+            anteriores = json.loads(archivo_manifiesto.read_text())
+
+        actuales = huellas(perfil, config)
+        factory = RequestFactory()
+        generadas = 0
+        for nombre in PAGINAS:
+            ruta = reverse(f'curriculum:{nombre}')
+            archivo = destino / ruta.strip('/') / 'index.html'
+            if anteriores.get(nombre) == actuales[nombre] and archivo.exists():
+                self.stdout.write(f'  sin cambios  {ruta}')
+                continue
+            _escribir(archivo, self._renderizar(factory, ruta))
+            generadas += 1
+            self.stdout.write(self.style.SUCCESS(f'  generada     {ruta}'))
+
+        if options['pdf']:
+            archivo = destino / ARCHIVO_PDF
+            if anteriores.get(ARCHIVO_PDF) == actuales[ARCHIVO_PDF] and archivo.exists():
+                self.stdout.write(f'  sin cambios  /{ARCHIVO_PDF}')
+            else:
+                secciones = ['perfil'] + [
+                    nombre for nombre, campo in CAMPO_CONFIG.items() if getattr(config, campo)
+                ]
+                contenido = self._renderizar(
+                    factory, reverse('curriculum:generar_pdf'), 'post',
+                    data=json.dumps({'secciones': secciones}), content_type='application/json',
+                )
+                _escribir(archivo, contenido)
+                generadas += 1
+                self.stdout.write(self.style.SUCCESS(f'  generado     /{ARCHIVO_PDF}'))
+        else:
+            actuales.pop(ARCHIVO_PDF)
+
+        _escribir(archivo_manifiesto, json.dumps(actuales, indent=2).encode())
+        self.stdout.write(self.style.SUCCESS(f'{generadas} archivo(s) generados en {destino}'))
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from curriculum.cloudinary_local import ServidorCloudinary
+
+
+class Command(BaseCommand):
+    help = 'Sirve un directorio local con el esquema de URLs y subidas de Cloudinary'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--direccion', default=settings.CV_CLOUDINARY_LOCAL or '127.0.0.1:8765',
+            help='host:puerto (por defecto CV_CLOUDINARY_LOCAL)',
+        )
+        parser.add_argument('--directorio', default=settings.CV_CLOUDINARY_LOCAL_DIR)
+        parser.add_argument('--latencia', type=int, default=0, help='Milisegundos de espera en cada entrega')
+
+    def handle(self, *args, **options):
+        host, _, puerto = options['direccion'].rpartition(':')
+        if not host or not puerto.isdigit():
+            raise CommandError(f'Dirección no válida: {options["direccion"]}')
+        servidor = ServidorCloudinary(options['directorio'], (host, int(puerto)), options['latencia'] / 1000)
+        self.stdout.write(self.style.SUCCESS(
+            f'Cloudinary local en {servidor.url}/local/ sirviendo {options["directorio"]} '
+            f'({options["latencia"]} ms de latencia)'
+        ))
+        if settings.CV_CLOUDINARY_LOCAL != options['direccion']:
+            self.stdout.write(f'Para usarlo desde la aplicación: CV_CLOUDINARY_LOCAL={options["direccion"]}')
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
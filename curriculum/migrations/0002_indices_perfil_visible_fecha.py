@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cursosrealizados',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['idperfilconqueestaactivo', '-fechainicio', '-idcursorealizado'], name='cur_perfil_visible_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experiencialaboral',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['idperfilconqueestaactivo', '-fechainiciogestion', '-idexperiencialaboral'], name='exp_perfil_visible_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productosacademicos',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['idperfilconqueestaactivo', 'idproductoacademico'], name='pac_perfil_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productoslaborales',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['idperfilconqueestaactivo', '-fechaproducto', '-idproductolaboral'], name='pla_perfil_visible_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reconocimientos',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['idperfilconqueestaactivo', '-fechareconocimiento', '-idreconocimiento'], name='rec_perfil_visible_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ventagarage',
+            index=models.Index(condition=models.Q(('activarparaqueseveaenfront', True)), fields=['idperfilconqueestaactivo', 'idventagarage'], name='vga_perfil_visible_idx'),
+        ),
+    ]
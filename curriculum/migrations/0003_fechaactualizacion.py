@@ -0,0 +1,62 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0002_indices_perfil_visible_fecha'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='configuracionsecciones',
+            name='fechaactualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última actualización'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='cursosrealizados',
+            name='fechaactualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última actualización'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='datospersonales',
+            name='fechaactualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última actualización'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='experiencialaboral',
+            name='fechaactualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última actualización'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='productosacademicos',
+            name='fechaactualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última actualización'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='productoslaborales',
+            name='fechaactualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última actualización'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='reconocimientos',
+            name='fechaactualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última actualización'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='ventagarage',
+            name='fechaactualizacion',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última actualización'),
+            preserve_default=False,
+        ),
+    ]
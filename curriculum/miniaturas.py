@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from PIL import Image as PILImage
+
+from .cache_disco import CacheDisco
+from .descargas import descargar
+from .imagenes_web import ALMACENAMIENTO_LOCAL, ruta_local, url_original
+from .models import CursosRealizados, Reconocimientos
+
+try:
+    import pymupdf
+except ImportError:
+    # Sin PyMuPDF no hay miniaturas: las plantillas muestran solo el botón para abrir el PDF
+    pymupdf = None
+
+logger = logging.getLogger(__name__)
+
+# Secciones con vista previa del certificado -> modelo
+MODELOS = {
+    'cursos': CursosRealizados,
+    'reconocimientos': Reconocimientos,
+}
+ANCHO = 480
+CALIDAD_WEBP = 75
+# Un certificado que no se pudo descargar o abrir no se reintenta hasta pasado este tiempo
+REINTENTAR_TRAS = 60 * 60
+# Segundos que el navegador espera antes de volver a pedir una miniatura que se está generando
+REINTENTO_CLIENTE = 2
+
+cache_miniaturas = CacheDisco(
+    settings.CV_MINIATURAS_CACHE_DIR, settings.CV_MINIATURAS_CACHE_MAX_BYTES, extension='.webp'
+)
+# Un solo hilo: las miniaturas que se generan al subir un certificado no compiten con las peticiones
+_ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cv-miniatura')
+# Claves ya encoladas: varias peticiones de la misma miniatura la generan una sola vez
+_pendientes = set()
+_cerrojo = threading.Lock()
+
+
+def disponible():
+    return pymupdf is not None
+
+
+def renderizar_primera_pagina(contenido, ancho=ANCHO):
+    """WebP de la primera página del PDF con `ancho` píxeles, o None si no se puede abrir."""
+    try:
+        with pymupdf.open(stream=contenido, filetype='pdf') as documento:
+            if documento.page_count == 0:
+                return None
+            pagina = documento[0]
+            escala = ancho / pagina.rect.width
+            pixmap = pagina.get_pixmap(matrix=pymupdf.Matrix(escala, escala), alpha=False)
+            imagen = PILImage.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+    except (RuntimeError, ValueError) as e:
+        # PyMuPDF lanza RuntimeError (FileDataError) con PDF dañados
+        logger.warning("No se pudo renderizar el certificado: %s", e)
+        return None
+    buffer = BytesIO()
+    imagen.save(buffer, format='WEBP', quality=CALIDAD_WEBP)
+    return buffer.getvalue()
+
+
+def _origen(recurso):
+    """Identificador estable del archivo: cambia si se sube uno nuevo."""
+    if ALMACENAMIENTO_LOCAL:
+        ruta = ruta_local(recurso)
+        if ruta is not None:
+            datos = ruta.stat()
+            return f'{ruta}:{datos.st_mtime_ns}:{datos.st_size}'
+    return url_original(recurso)
+
+
+def _leer_certificado(recurso):
+    if ALMACENAMIENTO_LOCAL:
+        ruta = ruta_local(recurso)
+        if ruta is not None:
+            return ruta.read_bytes()
+    url = url_original(recurso)
+    return descargar(url) if url else None
+
+
+def _clave_fallo(origen):
+    return f'cv:miniatura:fallo:{hashlib.md5(origen.encode()).hexdigest()}'
+
+
+def _claves(recurso):
+    """(clave de la miniatura, origen) o None si el certificado no puede tener miniatura."""
+    if not disponible() or not recurso:
+        return None
+    origen = _origen(recurso)
+    if not origen:
+        return None
+    return f'{ANCHO}:{origen}', origen
+
+
+def get_miniatura(recurso):
+    """Ruta de la miniatura del certificado, generándola la primera vez; None si no hay."""
+    claves = _claves(recurso)
+    if claves is None:
+        return None
+    clave, origen = claves
+    ruta = cache_miniaturas.get(clave)
+    if ruta is not None:
+        return ruta
+    if cache.get(_clave_fallo(origen)):
+        return None
+
+    contenido = _leer_certificado(recurso)
+    miniatura = renderizar_primera_pagina(contenido) if contenido else None
+    if miniatura is None:
+        cache.set(_clave_fallo(origen), True, REINTENTAR_TRAS)
+        return None
+    return cache_miniaturas.set(clave, miniatura)
+
+
+def _encolar(clave, recurso):
+    with _cerrojo:
+        if clave in _pendientes:
+            return
+        _pendientes.add(clave)
+    futuro = _ejecutor.submit(get_miniatura, recurso)
+    futuro.add_done_callback(lambda _: _pendientes.discard(clave))
+
+
+def consultar_miniatura(recurso):
+    """
+    (ruta, pendiente) sin generar nada en la petición: si la miniatura falta se
+    encola en el hilo de miniaturas y se devuelve pendiente=True.
+    """
+    claves = _claves(recurso)
+    if claves is None:
+        return None, False
+    clave, origen = claves
+    ruta = cache_miniaturas.get(clave)
+    if ruta is not None:
+        return ruta, False
+    if cache.get(_clave_fallo(origen)):
+        return None, False
+    _encolar(clave, recurso)
+    return None, True
+
+
+def generar_en_segundo_plano(recurso):
+    """Adelanta la miniatura de un certificado recién subido sin bloquear el guardado."""
+    claves = _claves(recurso)
+    if claves is not None:
+        _encolar(claves[0], recurso)
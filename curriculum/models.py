@@ -27,6 +27,7 @@ class DatosPersonales(models.Model):
     direcciondomiciliaria = models.CharField(max_length=50, blank=True, null=True)
     sitioweb = models.CharField(max_length=60, blank=True, null=True)
     foto_perfil = CloudinaryField('image', folder='perfil', blank=True, null=True)
+    fechaactualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
     
     class Meta:
         verbose_name = 'Dato Personal'
@@ -55,12 +56,20 @@ class ExperienciaLaboral(models.Model):
     descripcionfunciones = models.TextField(blank=True, null=True)
     activarparaqueseveaenfront = models.BooleanField(default=True)
     rutacertificado = models.FileField(upload_to='certificados/experiencia/', blank=True, null=True)
+    fechaactualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
     
     class Meta:
         verbose_name = 'Experiencia Laboral'
         verbose_name_plural = 'Experiencias Laborales'
         db_table = 'experiencialaboral'
         ordering = ['-fechainiciogestion']
+        indexes = [
+            models.Index(
+                fields=['idperfilconqueestaactivo', '-fechainiciogestion', '-idexperiencialaboral'],
+                condition=models.Q(activarparaqueseveaenfront=True),
+                name='exp_perfil_visible_fecha_idx',
+            ),
+        ]
     
     def clean(self):
         if self.fechafingestion and self.fechainiciogestion > self.fechafingestion:
@@ -90,12 +99,20 @@ class Reconocimientos(models.Model):
     telefonocontactoauspicia = models.CharField(max_length=60, blank=True, null=True)
     activarparaqueseveaenfront = models.BooleanField(default=True)
     rutacertificado = CloudinaryField('archivo', resource_type = 'raw', folder = 'certificados/reconocimientos/', null = True, blank = True, help_text='Certificado en PDF')
+    fechaactualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
     
     class Meta:
         verbose_name = 'Reconocimiento'
         verbose_name_plural = 'Reconocimientos'
         db_table = 'reconocimientos'
         ordering = ['-fechareconocimiento']
+        indexes = [
+            models.Index(
+                fields=['idperfilconqueestaactivo', '-fechareconocimiento', '-idreconocimiento'],
+                condition=models.Q(activarparaqueseveaenfront=True),
+                name='rec_perfil_visible_fecha_idx',
+            ),
+        ]
     
     def clean(self):
         if self.fechareconocimiento > timezone.now().date():
@@ -118,12 +135,20 @@ class CursosRealizados(models.Model):
     emailempresapatrocinadora = models.CharField(max_length=60, blank=True, null=True)
     activarparaqueseveaenfront = models.BooleanField(default=True)
     rutacertificado = CloudinaryField('archivo', resource_type = 'raw', folder = 'certificados/cursos/', null = True, blank = True, help_text='Certificado en PDF')
+    fechaactualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
     
     class Meta:
         verbose_name = 'Curso Realizado'
         verbose_name_plural = 'Cursos Realizados'
         db_table = 'cursosrealizados'
         ordering = ['-fechainicio']
+        indexes = [
+            models.Index(
+                fields=['idperfilconqueestaactivo', '-fechainicio', '-idcursorealizado'],
+                condition=models.Q(activarparaqueseveaenfront=True),
+                name='cur_perfil_visible_fecha_idx',
+            ),
+        ]
     
     def clean(self):
         if self.fechafin and self.fechainicio > self.fechafin:
@@ -147,11 +172,19 @@ class ProductosAcademicos(models.Model):
     clasificador = models.CharField(max_length=100)
     descripcion = models.TextField()
     activarparaqueseveaenfront = models.BooleanField(default=True)
+    fechaactualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
     
     class Meta:
         verbose_name = 'Producto Académico'
         verbose_name_plural = 'Productos Académicos'
         db_table = 'productosacademicos'
+        indexes = [
+            models.Index(
+                fields=['idperfilconqueestaactivo', 'idproductoacademico'],
+                condition=models.Q(activarparaqueseveaenfront=True),
+                name='pac_perfil_visible_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.nombrerecurso
@@ -163,12 +196,20 @@ class ProductosLaborales(models.Model):
     fechaproducto = models.DateField()
     descripcion = models.TextField()
     activarparaqueseveaenfront = models.BooleanField(default=True)
+    fechaactualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
     
     class Meta:
         verbose_name = 'Producto Laboral'
         verbose_name_plural = 'Productos Laborales'
         db_table = 'productoslaborales'
         ordering = ['-fechaproducto']
+        indexes = [
+            models.Index(
+                fields=['idperfilconqueestaactivo', '-fechaproducto', '-idproductolaboral'],
+                condition=models.Q(activarparaqueseveaenfront=True),
+                name='pla_perfil_visible_fecha_idx',
+            ),
+        ]
     
     def clean(self):
         if self.fechaproducto > timezone.now().date():
@@ -191,11 +232,19 @@ class VentaGarage(models.Model):
     valordelbien = models.DecimalField(max_digits=7, decimal_places=2)
     activarparaqueseveaenfront = models.BooleanField(default=True)
     imagen_producto = CloudinaryField('image', folder='garage', blank=True, null=True, help_text='Imagen del producto en venta')
+    fechaactualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
     
     class Meta:
         verbose_name = 'Venta Garage'
         verbose_name_plural = 'Ventas Garage'
         db_table = 'ventagarage'
+        indexes = [
+            models.Index(
+                fields=['idperfilconqueestaactivo', 'idventagarage'],
+                condition=models.Q(activarparaqueseveaenfront=True),
+                name='vga_perfil_visible_idx',
+            ),
+        ]
     
     def clean(self):
         if self.valordelbien and self.valordelbien < 0:
@@ -213,6 +262,7 @@ class ConfiguracionSecciones(models.Model):
     mostrar_productos_academicos = models.BooleanField(default=True, verbose_name='Mostrar Productos Académicos')
     mostrar_productos_laborales = models.BooleanField(default=True, verbose_name='Mostrar Productos Laborales')
     mostrar_venta_garage = models.BooleanField(default=True, verbose_name='Mostrar Venta Garage')
+    fechaactualizacion = models.DateTimeField(auto_now=True, verbose_name='Última actualización')
     
     class Meta:
         verbose_name = 'Configuración de Secciones'
@@ -0,0 +1,106 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from .snapshot import SECCIONES, SNAPSHOT_TIMEOUT, consulta_seccion, get_version
+
+TAMANO_PAGINA = getattr(settings, 'CV_TAMANO_PAGINA', 10)
+
+
+class CursorInvalido(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class PaginaSeccion:
+    filas: tuple = ()
+    siguiente: str = None
+
+
+PAGINA_VACIA = PaginaSeccion()
+
+
+def codificar_cursor(fila, orden):
+    valores = [getattr(fila, campo.lstrip('-')) for campo in orden]
+    valores = [valor.isoformat() if hasattr(valor, 'isoformat') else valor for valor in valores]
+    return urlsafe_b64encode(json.dumps(valores).encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, modelo, orden):
+    try:
+        valores = json.loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(valores, list) or len(valores) != len(orden):
+            raise ValueError(cursor)
+        return [
+            modelo._meta.get_field(campo.lstrip('-')).to_python(valor)
+            for campo, valor in zip(orden, valores)
+        ]
+    except (ValueError, TypeError, ValidationError, binascii.Error):
+        raise CursorInvalido(f'Cursor inválido: {cursor!r}')
+
+
+def filtro_keyset(orden, valores):
+    """Filas estrictamente posteriores a `valores` según `orden` (con desempate por PK)."""
+    posteriores = Q()
+    iguales = {}
+    for campo, valor in zip(orden, valores):
+        nombre = campo.lstrip('-')
+        operador = 'lt' if campo.startswith('-') else 'gt'
+        posteriores |= Q(**iguales, **{f'{nombre}__{operador}': valor})
+        iguales[nombre] = valor
+
+    # Cota redundante sobre la primera columna: permite al motor empezar el
+    # recorrido del índice en el cursor en lugar de filtrar desde el inicio.
+    primero = orden[0]
+    cota = {f"{primero.lstrip('-')}__{'lte' if primero.startswith('-') else 'gte'}": valores[0]}
+    return Q(**cota) & posteriores
+
+
+def consultar_pagina(nombre, perfil_id, cursor=None, tamano=None):
+    atributo, modelo, orden = SECCIONES[nombre]
+    tamano = tamano or TAMANO_PAGINA
+    queryset = consulta_seccion(nombre, perfil_id)
+    if cursor:
+        queryset = queryset.filter(filtro_keyset(orden, decodificar_cursor(cursor, modelo, orden)))
+
+    # Una fila extra indica si existe una página siguiente
+    filas = tuple(queryset[:tamano + 1])
+    siguiente = codificar_cursor(filas[tamano - 1], orden) if len(filas) > tamano else None
+    return PaginaSeccion(filas=filas[:tamano], siguiente=siguiente)
+
+
+def _clave_pagina(perfil_id, version, nombre, tamano, cursor):
+    return f'cv:pagina:{perfil_id}:{version}:{nombre}:{tamano}:{cursor or ""}'
+
+
+def get_pagina(nombre, perfil, cursor=None, tamano=None):
+    """
+    Página de una sección del perfil, cacheada con la versión del perfil.
+    Solo se cachean la primera página y las de cursores que emitió el propio
+    servidor: un cliente que fabrique cursores válidos no puede llenar la
+    caché con entradas nuevas y desalojar las buenas.
+    """
+    if perfil is None:
+        return PAGINA_VACIA
+
+    version = get_version(perfil.pk)
+    tamano = tamano or TAMANO_PAGINA
+    clave = _clave_pagina(perfil.pk, version, nombre, tamano, cursor)
+    guardadas = cache.get_many([clave, f'{clave}:emitido'])
+    if clave in guardadas:
+        return guardadas[clave]
+
+    pagina = consultar_pagina(nombre, perfil.pk, cursor, tamano)
+    if not cursor or f'{clave}:emitido' in guardadas:
+        siguiente = _clave_pagina(perfil.pk, version, nombre, tamano, pagina.siguiente)
+        valores = {clave: pagina}
+        if pagina.siguiente:
+            valores[f'{siguiente}:emitido'] = True
+        cache.set_many(valores, SNAPSHOT_TIMEOUT)
+    return pagina
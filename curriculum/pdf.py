@@ -0,0 +1,219 @@
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from io import BytesIO
+
+from django.conf import settings
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from reportlab.platypus import SimpleDocTemplate
+
+from .cache_disco import CacheDisco
+from .imagenes_pdf import CALIDAD_JPEG, DPI, preparar_imagenes
+from .secciones_pdf import crear_flowables, describir_bloques, imagenes_pedidas
+from .snapshot import SECCIONES
+from .tema_pdf import get_tema
+
+# Secciones que acepta el PDF, además de las listas del snapshot
+SECCIONES_PDF = ('perfil', *SECCIONES)
+
+# Tamaño a partir del cual el PDF recién construido se vuelca a disco
+MAXIMO_EN_MEMORIA = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ModoPDF:
+    """Cómo se escribe el PDF: resolución y calidad de las imágenes, compresión y metadatos."""
+    nombre: str
+    dpi: int
+    calidad_jpeg: int
+    metadatos: bool = True
+
+
+MODOS = {
+    'normal': ModoPDF('normal', DPI, CALIDAD_JPEG),
+    # Para descargas en el móvil: imágenes a menor resolución y sin título, autor ni productor
+    'compacto': ModoPDF(
+        'compacto',
+        getattr(settings, 'CV_PDF_COMPACTO_DPI', 110),
+        getattr(settings, 'CV_PDF_COMPACTO_CALIDAD', 60),
+        metadatos=False,
+    ),
+}
+MODO_POR_DEFECTO = 'normal'
+
+
+def get_modo(nombre=None):
+    try:
+        return MODOS[nombre or MODO_POR_DEFECTO]
+    except KeyError:
+        raise KeyError(f'Modo de PDF desconocido: {nombre}')
+
+
+cache_pdf = CacheDisco(settings.CV_PDF_CACHE_DIR, settings.CV_PDF_CACHE_MAX_BYTES, extension='.pdf')
+
+
+class CanvasTotalPaginas(canvas.Canvas):
+    """
+    Escribe "Página X de Y" sin guardar el estado de cada página hasta el final:
+    Y es un Form XObject que cada pie referencia y que se define en save(),
+    cuando ya se conoce el total. La memoria no crece con el número de páginas.
+    Las subclases dibujan el pie en draw_footer(), llamado al cerrar cada página.
+    """
+    FORMULARIO_TOTAL = 'cv_total_paginas'
+    FUENTE = ('Helvetica', 9)
+    # Ancho reservado para el total, que aún no se conoce al dibujar cada pie
+    RESERVA_TOTAL = stringWidth('000', *FUENTE)
+
+    def __init__(self, *args, **kwargs):
+        canvas.Canvas.__init__(self, *args, **kwargs)
+        self._posicion_total = None
+
+    def showPage(self):
+        self.draw_footer()
+        canvas.Canvas.showPage(self)
+
+    def save(self):
+        if self._code:
+            # Página con contenido pendiente: cuenta para el total
+            self.showPage()
+        if self._posicion_total is not None:
+            self.beginForm(self.FORMULARIO_TOTAL)
+            self.setFont(*self.FUENTE)
+            self.setFillColor(colors.grey)
+            self.drawString(*self._posicion_total, str(self._pageNumber - 1))
+            self.endForm()
+        canvas.Canvas.save(self)
+
+    def draw_numero_pagina(self, x, y):
+        """Número de página alineado a la derecha en `x`."""
+        inicio_total = x - self.RESERVA_TOTAL
+        self._posicion_total = (inicio_total, y)
+        self.setFont(*self.FUENTE)
+        self.setFillColor(colors.grey)
+        self.drawRightString(inicio_total, y, f"Página {self._pageNumber} de ")
+        self.doForm(self.FORMULARIO_TOTAL)
+
+
+def fecha_en_espanol(fecha):
+    meses = {
+        1: "enero", 2: "febrero", 3: "marzo", 4: "abril", 
+        5: "mayo", 6: "junio", 7: "julio", 8: "agosto", 
+        9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"
+    }
+    dia = fecha.day
+    mes = meses[fecha.month]
+    anio = fecha.year
+    return f"{dia} de {mes} de {anio}"
+
+class FooterCanvas(CanvasTotalPaginas):
+    def draw_footer(self):
+        # Línea superior del pie
+        self.setStrokeColor(colors.HexColor('#A7C7E7'))
+        self.setLineWidth(1)
+        self.line(2*cm, 2*cm, A4[0] - 2*cm, 2*cm)
+        
+        # Número de página
+        self.draw_numero_pagina(A4[0] - 2*cm, 1.5*cm)
+        
+        # Fecha de generación
+        # (la misma fecha que forma parte de la clave de la caché de PDF)
+        self.drawString(2*cm, 1.5*cm, f"Generado: {timezone.localdate().strftime('%d/%m/%Y')}")
+
+
+def construir_pdf(snapshot, secciones_seleccionadas, tema=None, destino=None, modo=None):
+    """
+    Construye el PDF del CV con las secciones pedidas. Si se indica `destino`
+    (un archivo abierto) lo escribe ahí y devuelve el número de páginas; si
+    no, devuelve sus bytes. No depende de ningún request.
+    """
+    perfil = snapshot.perfil
+    modo = get_modo(modo)
+    if modo.metadatos:
+        metadatos = {'title': f"CV - {perfil.nombres} {perfil.apellidos}"}
+    else:
+        metadatos = dict.fromkeys(('title', 'author', 'subject', 'creator', 'producer'), '')
+    buffer = destino if destino is not None else BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=2*cm,
+        leftMargin=2*cm,
+        topMargin=1.5*cm,
+        bottomMargin=2.5*cm,
+        # Contenido de las páginas comprimido con Flate; las imágenes ya van en JPEG (DCT)
+        pageCompression=1,
+        **metadatos
+    )
+    
+    tema = get_tema(tema)
+
+    # Solo se vuelven a describir los bloques cuyo contenido cambió
+    operaciones = describir_bloques(snapshot, secciones_seleccionadas)
+    # Todas las imágenes del documento se descargan juntas y en paralelo
+    imagenes = preparar_imagenes(imagenes_pedidas(operaciones), modo.dpi, modo.calidad_jpeg)
+    story = crear_flowables(operaciones, tema, imagenes, doc.width)
+
+    # Generar PDF
+    doc.build(story, canvasmaker=FooterCanvas)
+    if destino is None:
+        return buffer.getvalue()
+    return doc.page
+
+
+def normalizar_secciones(secciones):
+    """Secciones conocidas, sin duplicados y en orden estable."""
+    return tuple(sorted(set(secciones) & set(SECCIONES_PDF)))
+
+
+def clave_pdf(snapshot, secciones, fecha, tema, modo):
+    listas = [nombre for nombre in secciones if nombre in SECCIONES]
+    return f"{snapshot.huella(listas)}:{','.join(secciones)}:{fecha.isoformat()}:{tema.nombre}:{modo.nombre}"
+
+
+def etag_pdf(clave):
+    """
+    La clave ya identifica el contenido del PDF: no hace falta leerlo entero
+    para el ETag. El despliegue entra por si cambia la maquetación.
+    """
+    huella = hashlib.sha256(f'{clave}:{settings.CV_VERSION_DESPLIEGUE}'.encode())
+    return f'"{huella.hexdigest()[:32]}"'
+
+
+def get_pdf(snapshot, secciones, tema=None, modo=None):
+    """
+    PDF del snapshot desde la caché en disco, o recién construido.
+    Devuelve (archivo abierto al inicio, etag, acierto); quien lo recibe lo cierra.
+    """
+    secciones = normalizar_secciones(secciones)
+    tema = get_tema(tema)
+    modo = get_modo(modo)
+    clave = clave_pdf(snapshot, secciones, timezone.localdate(), tema, modo)
+
+    ruta = cache_pdf.get(clave)
+    archivo = None
+    if ruta is not None:
+        try:
+            # Ya abierto, sigue siendo legible aunque otro worker lo desaloje
+            archivo = open(ruta, 'rb')
+        except FileNotFoundError:
+            # Desalojado por otro worker entre get() y la apertura
+            pass
+    acierto = archivo is not None
+    if archivo is None:
+        # En memoria mientras es pequeño; pasa a disco si el CV es largo
+        archivo = tempfile.SpooledTemporaryFile(max_size=MAXIMO_EN_MEMORIA)
+        try:
+            construir_pdf(snapshot, secciones, tema.nombre, destino=archivo, modo=modo.nombre)
+            archivo.seek(0)
+            cache_pdf.set_archivo(clave, archivo)
+            archivo.seek(0)
+        except BaseException:
+            archivo.close()
+            raise
+
+    return archivo, etag_pdf(clave), acierto
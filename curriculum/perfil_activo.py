@@ -0,0 +1,95 @@
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import DatosPersonales, ConfiguracionSecciones
+
+CLAVE_GENERACION = 'cv:perfil_activo:generacion'
+CAMPOS_CONFIG = tuple(
+    campo.name for campo in ConfiguracionSecciones._meta.concrete_fields
+    if campo.name not in ('id', 'perfil')
+)
+
+# Memo por proceso: (generación, instante, perfil, config). Se descarta cuando
+# la generación guardada en la caché compartida cambia y, aunque no cambie
+# (caché local a cada proceso, entrada desalojada...), a los MEMO_TTL segundos.
+MEMO_TTL = 10
+_memo = (None, 0, None, None)
+
+
+def _resolver(queryset):
+    """Perfil y su configuración en una sola consulta (LEFT JOIN a la configuración)."""
+    anotaciones = {f'cfg_{campo}': F(f'configuracionsecciones__{campo}') for campo in ('id',) + CAMPOS_CONFIG}
+    perfil = queryset.annotate(**anotaciones).order_by('-es_activo', 'pk', 'cfg_id').first()
+    if perfil is None:
+        return None, None
+
+    valores = [perfil.__dict__.pop(f'cfg_{campo}') for campo in ('id',) + CAMPOS_CONFIG]
+    perfil.__dict__.pop('es_activo', None)
+    if valores[0] is None:
+        # Sin configuración guardada: objeto por defecto sin escribir en la base
+        config = ConfiguracionSecciones(perfil=perfil)
+    else:
+        config = ConfiguracionSecciones.from_db(
+            perfil._state.db, ('id', 'perfil_id') + CAMPOS_CONFIG, [valores[0], perfil.pk] + valores[1:]
+        )
+        config.perfil = perfil
+    return perfil, config
+
+
+def _consultar_perfil_activo():
+    # Mismo criterio de antes: el primer perfil activo o, si no hay, el primero
+    return _resolver(DatosPersonales.objects.annotate(es_activo=Case(
+        When(perfilactivo=1, then=Value(1)), default=Value(0), output_field=IntegerField()
+    )))
+
+
+def resolver_perfil(perfil_id):
+    return _resolver(DatosPersonales.objects.filter(pk=perfil_id).annotate(es_activo=Value(0)))
+
+
+def _get_generacion():
+    generacion = cache.get(CLAVE_GENERACION)
+    if generacion is None:
+        cache.add(CLAVE_GENERACION, uuid.uuid4().hex, None)
+        generacion = cache.get(CLAVE_GENERACION)
+    return generacion
+
+
+def invalidar_perfil_activo():
+    global _memo
+    _memo = (None, 0, None, None)
+    cache.set(CLAVE_GENERACION, uuid.uuid4().hex, None)
+
+
+def resolver_perfil_activo(request=None):
+    """(perfil, config) del perfil activo, memorizado por petición y por proceso."""
+    global _memo
+    if request is not None and hasattr(request, '_cv_perfil_activo'):
+        return request._cv_perfil_activo
+
+    generacion = _get_generacion()
+    memo_generacion, instante, perfil, config = _memo
+    if memo_generacion != generacion or time.monotonic() - instante > MEMO_TTL:
+        perfil, config = _consultar_perfil_activo()
+        _memo = (generacion, time.monotonic(), perfil, config)
+
+    if request is not None:
+        request._cv_perfil_activo = (perfil, config)
+    return perfil, config
+
+
+def get_perfil_activo(request=None):
+    return resolver_perfil_activo(request)[0]
+
+
+def get_configuracion(perfil, request=None):
+    if perfil is None:
+        return None
+
+    perfil_activo, config = resolver_perfil_activo(request)
+    if perfil_activo is not None and perfil_activo.pk == perfil.pk:
+        return config
+    return ConfiguracionSecciones.objects.filter(perfil=perfil).first() or ConfiguracionSecciones(perfil=perfil)
@@ -0,0 +1,96 @@
+import os
+import re
+
+from django.http import FileResponse, HttpResponse
+
+RANGO = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _Tramo:
+    """Lectura limitada a `longitud` bytes desde la posición actual de `archivo`."""
+
+    def __init__(self, archivo, longitud):
+        self.archivo = archivo
+        self.restante = longitud
+
+    def read(self, tamano=-1):
+        if self.restante <= 0:
+            return b''
+        if tamano < 0 or tamano > self.restante:
+            tamano = self.restante
+        datos = self.archivo.read(tamano)
+        self.restante -= len(datos)
+        return datos
+
+    def close(self):
+        self.archivo.close()
+
+
+def tamano_archivo(archivo):
+    """Tamaño en bytes de un archivo abierto; lo deja al inicio."""
+    archivo.seek(0, os.SEEK_END)
+    tamano = archivo.tell()
+    archivo.seek(0)
+    return tamano
+
+
+def _rango_pedido(request, etag, tamano):
+    """(inicio, fin) del único rango pedido, None si se sirve completo o 'invalido'."""
+    cabecera = request.headers.get('Range')
+    if not cabecera or request.method not in ('GET', 'HEAD'):
+        return None
+    # If-Range: si el archivo cambió, se envía completo
+    if_range = request.headers.get('If-Range')
+    if if_range and if_range != etag:
+        return None
+    coincidencia = RANGO.match(cabecera.strip())
+    if not coincidencia:
+        # Varios rangos u otra unidad: se ignora la cabecera
+        return None
+
+    inicio, fin = coincidencia.groups()
+    if not inicio:
+        if not fin:
+            return None
+        # bytes=-N: los últimos N bytes
+        inicio, fin = max(0, tamano - int(fin)), tamano - 1
+    else:
+        if fin and int(fin) < int(inicio):
+            # bytes=5-2 no es un rango mal situado sino mal escrito: se ignora
+            return None
+        inicio, fin = int(inicio), min(int(fin) if fin else tamano - 1, tamano - 1)
+    if inicio >= tamano or inicio > fin:
+        return 'invalido'
+    return inicio, fin
+
+
+def respuesta_archivo(request, archivo, content_type, etag=None, filename=None, rangos=False):
+    """
+    FileResponse de un archivo abierto, sin cargarlo en memoria, con
+    Content-Length. Con `rangos`, admite peticiones Range de un solo tramo
+    y lo anuncia con Accept-Ranges (solo tiene sentido en URLs de GET).
+    """
+    tamano = tamano_archivo(archivo)
+    rango = _rango_pedido(request, etag, tamano) if rangos else None
+
+    if rango == 'invalido':
+        archivo.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{tamano}'
+        return response
+
+    if rango is None:
+        response = FileResponse(archivo, content_type=content_type, filename=filename)
+    else:
+        inicio, fin = rango
+        archivo.seek(inicio)
+        response = FileResponse(_Tramo(archivo, fin - inicio + 1), content_type=content_type, filename=filename)
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {inicio}-{fin}/{tamano}'
+        response['Content-Length'] = fin - inicio + 1
+
+    if rangos:
+        response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+    return response
@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import CharField, Count, F, RowRange, Value, Window
+from django.db.models.functions import Cast, RowNumber
+
+from .snapshot import SECCIONES, SNAPSHOT_TIMEOUT, consulta_seccion, get_version
+
+# Filas que muestra cada tarjeta de la página de inicio
+LIMITES_RESUMEN = {
+    'experiencia': 3,
+    'reconocimientos': 2,
+    'cursos': 3,
+    'productosacademicos': 3,
+    'productoslaborales': 3,
+    'ventagarage': 4,
+}
+
+# Columnas que usa cada tarjeta de la página de inicio
+CAMPOS_RESUMEN = {
+    'experiencia': ('cargodesempenado', 'fechainiciogestion', 'fechafingestion'),
+    'reconocimientos': ('tiporeconocimiento', 'fechareconocimiento'),
+    'cursos': ('nombrecurso', 'totalhoras'),
+    'productosacademicos': ('nombrerecurso', 'clasificador'),
+    'productoslaborales': ('nombreproducto', 'fechaproducto'),
+    'ventagarage': ('nombreproducto', 'imagen_producto'),
+}
+# Alias de cada columna en la unión -> (sección, campo)
+COLUMNAS_RESUMEN = {
+    f'{nombre}_{campo}': (nombre, campo) for nombre, campos in CAMPOS_RESUMEN.items() for campo in campos
+}
+
+# Interruptor de ConfiguracionSecciones que oculta cada tarjeta
+CAMPO_CONFIG = {
+    'experiencia': 'mostrar_experiencia',
+    'reconocimientos': 'mostrar_reconocimientos',
+    'cursos': 'mostrar_cursos',
+    'productosacademicos': 'mostrar_productos_academicos',
+    'productoslaborales': 'mostrar_productos_laborales',
+    'ventagarage': 'mostrar_venta_garage',
+}
+
+
+@dataclass(frozen=True)
+class ResumenSeccion:
+    filas: tuple = ()
+    total: int = 0
+    hay_mas: bool = False
+
+
+def consulta_resumen(nombre, perfil_id, limite=None):
+    """
+    Primeras filas visibles de la sección con su posición y el total exacto
+    (función de ventana), con las columnas de todas las tarjetas: las de las
+    otras secciones van en NULL para que las ramas se puedan unir.
+    """
+    orden = SECCIONES[nombre][2]
+    limite = limite or LIMITES_RESUMEN[nombre]
+    columnas = {
+        alias: F(campo) if seccion == nombre else Cast(Value(None), SECCIONES[seccion][1]._meta.get_field(campo))
+        for alias, (seccion, campo) in COLUMNAS_RESUMEN.items()
+    }
+    return consulta_seccion(nombre, perfil_id).order_by().annotate(
+        seccion=Value(nombre, output_field=CharField()),
+        posicion=Window(RowNumber(), order_by=orden),
+        # Equivale a COUNT(*) OVER (); con el mismo ORDER BY que la posición,
+        # el motor calcula ambas en una pasada por el índice, sin ordenar
+        total=Window(Count('pk'), order_by=orden, frame=RowRange(None, None)),
+        **columnas,
+    ).filter(posicion__lte=limite).values('seccion', 'pk', 'posicion', 'total', *columnas)
+
+
+def construir_resumenes(perfil, config):
+    """Resúmenes de las secciones visibles en una sola consulta (UNION ALL de una rama por sección)."""
+    nombres = [nombre for nombre, campo in CAMPO_CONFIG.items() if getattr(config, campo)]
+    if not nombres:
+        return {}
+
+    ramas = [consulta_resumen(nombre, perfil.pk) for nombre in nombres]
+    filas = {nombre: [] for nombre in nombres}
+    totales = {}
+    for fila in ramas[0].union(*ramas[1:], all=True):
+        nombre = fila['seccion']
+        modelo = SECCIONES[nombre][1]
+        campos = CAMPOS_RESUMEN[nombre]
+        # Instancias con solo las columnas de la tarjeta; el resto queda diferido
+        instancia = modelo.from_db(
+            perfil._state.db, (modelo._meta.pk.attname, *campos),
+            (fila['pk'], *(fila[f'{nombre}_{campo}'] for campo in campos)),
+        )
+        filas[nombre].append((fila['posicion'], instancia))
+        totales[nombre] = fila['total']
+
+    resumenes = {}
+    for nombre in nombres:
+        ordenadas = tuple(instancia for posicion, instancia in sorted(filas[nombre], key=lambda par: par[0]))
+        total = totales.get(nombre, 0)
+        resumenes[nombre] = ResumenSeccion(filas=ordenadas, total=total, hay_mas=total > len(ordenadas))
+    return resumenes
+
+
+def get_resumenes(perfil, config):
+    """Resúmenes de las secciones visibles, cacheados con la versión del perfil."""
+    version = get_version(perfil.pk)
+    clave = f'cv:resumen:{perfil.pk}:{version}'
+    resumenes = cache.get(clave)
+    if resumenes is None:
+        resumenes = construir_resumenes(perfil, config)
+        cache.set(clave, resumenes, SNAPSHOT_TIMEOUT)
+    return resumenes
@@ -0,0 +1,299 @@
+import hashlib
+from datetime import datetime
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from reportlab.lib.units import cm
+from reportlab.platypus import Paragraph, Spacer, Table, Image as RLImage
+
+from .snapshot import SECCIONES
+
+# Cada sección se describe con una lista de operaciones de datos puros
+# (tuplas picklables). Esa descripción se guarda en la caché con la huella de
+# la sección y se convierte en flowables en cada render: los flowables no se
+# pueden compartir porque ReportLab los consume y modifica al maquetar.
+#
+#   ('parrafo', texto, estilo)
+#   ('espacio', alto)
+#   ('certificado', url)
+#   ('separador',)
+#   ('encabezado', url_foto, operaciones)
+#   ('tabla_info', filas, anchos)
+#   ('producto', url_imagen, texto, operaciones_sin_imagen)
+
+TIMEOUT = getattr(settings, 'CV_PDF_SECCIONES_TIMEOUT', 60 * 60 * 24)
+
+
+def _url_certificado(archivo):
+    url = archivo.url
+    if '/image/upload/' in url:
+        url = url.replace('/image/upload/', '/raw/upload/')
+    return url
+
+
+def bloque_encabezado(snapshot):
+    perfil = snapshot.perfil
+    info = [
+        ('parrafo', f"{perfil.nombres} {perfil.apellidos}", 'CVTitle'),
+        ('parrafo', f"Cédula: {perfil.numerocedula}", 'CVSubtitle'),
+    ]
+    contacto_items = []
+    if perfil.telefonoconvencional:
+        contacto_items.append(f"📱 {perfil.telefonoconvencional}")
+    if perfil.sitioweb:
+        contacto_items.append(f"🌐 {perfil.sitioweb}")
+    if perfil.direcciondomiciliaria:
+        contacto_items.append(f"📍 {perfil.direcciondomiciliaria}")
+    if contacto_items:
+        info.append(('parrafo', " | ".join(contacto_items), 'SmallGray'))
+
+    url_foto = perfil.foto_perfil.url if perfil.foto_perfil else None
+    return [
+        ('encabezado', url_foto, info),
+        ('espacio', 0.3*cm),
+        ('separador',),
+        ('espacio', 0.3*cm),
+    ]
+
+
+def bloque_perfil(snapshot):
+    perfil = snapshot.perfil
+    return [
+        ('parrafo', "━━━ PERFIL PROFESIONAL", 'SectionHeader'),
+        ('parrafo', f"<b>Sobre mí:</b> {perfil.descripcionperfil}", 'CustomBodyText'),
+        ('tabla_info', [
+            ['<b>Fecha de Nacimiento:</b>', perfil.fechanacimiento.strftime('%d/%m/%Y'),
+             '<b>Nacionalidad:</b>', perfil.nacionalidad],
+            ['<b>Lugar de Nacimiento:</b>', perfil.lugarnacimiento,
+             '<b>Estado Civil:</b>', perfil.estadocivil],
+        ], [3.5*cm, 5*cm, 3*cm, 5*cm]),
+        ('espacio', 0.5*cm),
+    ]
+
+
+def bloque_experiencia(snapshot):
+    experiencias = snapshot.experiencias
+    if not experiencias:
+        return []
+    operaciones = [('parrafo', "━━━ EXPERIENCIA LABORAL", 'SectionHeader')]
+    for exp in experiencias:
+        operaciones.append(('parrafo', exp.cargodesempenado, 'JobTitle'))
+
+        fechas = f"{exp.fechainiciogestion.strftime('%b %Y')} - "
+        fechas += exp.fechafingestion.strftime('%b %Y') if exp.fechafingestion else "Actual"
+        empresa = f"<b>{exp.nombreempresa}</b> • {fechas}"
+        if exp.lugarempresa:
+            empresa += f" • {exp.lugarempresa}"
+        operaciones.append(('parrafo', empresa, 'CompanyInfo'))
+
+        if exp.descripcionfunciones:
+            operaciones.append(('parrafo', exp.descripcionfunciones, 'CustomBodyText'))
+        if exp.rutacertificado:
+            operaciones.append(('certificado', _url_certificado(exp.rutacertificado)))
+        operaciones.append(('espacio', 0.4*cm))
+    return operaciones
+
+
+def bloque_reconocimientos(snapshot):
+    reconocimientos = snapshot.reconocimientos
+    if not reconocimientos:
+        return []
+    operaciones = [('parrafo', "━━━ RECONOCIMIENTOS", 'SectionHeader')]
+    for rec in reconocimientos:
+        titulo = f"<b>{rec.tiporeconocimiento}</b> • {rec.fechareconocimiento.strftime('%b %Y')}"
+        operaciones.append(('parrafo', titulo, 'JobTitle'))
+        operaciones.append(('parrafo', rec.descripcionreconocimiento, 'CustomBodyText'))
+        operaciones.append(('parrafo', f"<i>Otorgado por: {rec.entidadpatrocinadora}</i>", 'SmallGray'))
+        if rec.rutacertificado:
+            operaciones.append(('certificado', _url_certificado(rec.rutacertificado)))
+        operaciones.append(('espacio', 0.3*cm))
+    return operaciones
+
+
+def bloque_cursos(snapshot):
+    cursos = snapshot.cursos
+    if not cursos:
+        return []
+    operaciones = [('parrafo', "━━━ CURSOS Y CERTIFICACIONES", 'SectionHeader')]
+    for curso in cursos:
+        operaciones.append(('parrafo', curso.nombrecurso, 'JobTitle'))
+        fechas = f"{curso.fechainicio.strftime('%b %Y')} - {curso.fechafin.strftime('%b %Y')} • {curso.totalhoras} horas"
+        operaciones.append(('parrafo', f"<b>{curso.entidadpatrocinadora}</b> • {fechas}", 'CompanyInfo'))
+        if curso.descripcioncurso:
+            operaciones.append(('parrafo', curso.descripcioncurso, 'CustomBodyText'))
+        if curso.rutacertificado:
+            operaciones.append(('certificado', _url_certificado(curso.rutacertificado)))
+        operaciones.append(('espacio', 0.3*cm))
+    return operaciones
+
+
+def bloque_productos_academicos(snapshot):
+    productos = snapshot.productos_academicos
+    if not productos:
+        return []
+    operaciones = [('parrafo', "━━━ PRODUCTOS ACADÉMICOS", 'SectionHeader')]
+    for prod in productos:
+        operaciones.append(('parrafo', f"<b>{prod.nombrerecurso}</b> ({prod.clasificador})", 'JobTitle'))
+        operaciones.append(('parrafo', prod.descripcion, 'CustomBodyText'))
+        operaciones.append(('espacio', 0.2*cm))
+    return operaciones
+
+
+def bloque_productos_laborales(snapshot):
+    productos = snapshot.productos_laborales
+    if not productos:
+        return []
+    operaciones = [('parrafo', "━━━ PRODUCTOS LABORALES", 'SectionHeader')]
+    for prod in productos:
+        titulo = f"<b>{prod.nombreproducto}</b> • {prod.fechaproducto.strftime('%b %Y')}"
+        operaciones.append(('parrafo', titulo, 'JobTitle'))
+        operaciones.append(('parrafo', prod.descripcion, 'CustomBodyText'))
+        operaciones.append(('espacio', 0.2*cm))
+    return operaciones
+
+
+def bloque_venta_garage(snapshot):
+    productos = snapshot.productos_garage
+    if not productos:
+        return []
+    operaciones = [('parrafo', "━━━ ARTÍCULOS EN VENTA", 'SectionHeader')]
+    for prod in productos:
+        sin_imagen = [
+            ('parrafo', f"<b>{prod.nombreproducto}</b> • ${prod.valordelbien}", 'JobTitle'),
+            ('parrafo', f"Estado: {prod.estadoproducto}", 'SmallGray'),
+            ('parrafo', prod.descripcion, 'CustomBodyText'),
+        ]
+        if prod.imagen_producto:
+            info_text = f"""
+                            <b>{prod.nombreproducto}</b><br/>
+                            <font color='#6c757d'>Estado: {prod.estadoproducto}</font><br/>
+                            <font size='12' color='#198754'><b>${prod.valordelbien}</b></font><br/>
+                            <font size='9'>{prod.descripcion[:100]}</font>
+                            """
+            operaciones.append(('producto', prod.imagen_producto.url, info_text, sin_imagen))
+        else:
+            operaciones.extend(sin_imagen)
+        operaciones.append(('espacio', 0.2*cm))
+    return operaciones
+
+
+# Bloque -> función que lo describe; el encabezado va siempre, el resto según la selección
+BLOQUES = {
+    'encabezado': bloque_encabezado,
+    'perfil': bloque_perfil,
+    'experiencia': bloque_experiencia,
+    'reconocimientos': bloque_reconocimientos,
+    'cursos': bloque_cursos,
+    'productosacademicos': bloque_productos_academicos,
+    'productoslaborales': bloque_productos_laborales,
+    'ventagarage': bloque_venta_garage,
+}
+
+
+def huella_bloque(snapshot, nombre):
+    """Cambia solo si cambian las filas del bloque (o el perfil, para encabezado y perfil)."""
+    perfil = snapshot.perfil
+    partes = [settings.CV_VERSION_DESPLIEGUE, nombre, perfil.pk]
+    if nombre in SECCIONES:
+        partes.extend(f'{fila.pk}@{fila.fechaactualizacion.isoformat()}' for fila in snapshot.seccion(nombre))
+    else:
+        partes.append(perfil.fechaactualizacion.isoformat())
+    return hashlib.md5('|'.join(map(str, partes)).encode()).hexdigest()
+
+
+def _clave_bloque(nombre, huella):
+    return f'cv:pdf:bloque:{nombre}:{huella}'
+
+
+def describir_bloques(snapshot, secciones):
+    """
+    Operaciones del encabezado y de cada sección pedida, en el orden del PDF.
+    Los bloques sin cambios se leen de la caché de una sola vez.
+    """
+    nombres = ['encabezado'] + [nombre for nombre in BLOQUES if nombre in secciones]
+    claves = {nombre: _clave_bloque(nombre, huella_bloque(snapshot, nombre)) for nombre in nombres}
+    guardados = cache.get_many(claves.values())
+
+    nuevos = {}
+    operaciones = []
+    for nombre in nombres:
+        bloque = guardados.get(claves[nombre])
+        if bloque is None:
+            bloque = nuevos[claves[nombre]] = BLOQUES[nombre](snapshot)
+        operaciones.extend(bloque)
+    if nuevos:
+        cache.set_many(nuevos, TIMEOUT)
+    return operaciones
+
+
+def imagenes_pedidas(operaciones):
+    """(URL, ranura) de las imágenes que usan las operaciones."""
+    pedidos = []
+    for operacion in operaciones:
+        if operacion[0] == 'encabezado' and operacion[1]:
+            pedidos.append((operacion[1], 'foto'))
+        elif operacion[0] == 'producto':
+            pedidos.append((operacion[1], 'miniatura'))
+    return pedidos
+
+
+def _imagen(contenido, lado):
+    return RLImage(BytesIO(contenido), width=lado, height=lado)
+
+
+def crear_flowables(operaciones, tema, imagenes, ancho):
+    """Convierte las operaciones en flowables nuevos para un único render."""
+    styles = tema.estilos
+    story = []
+    for operacion in operaciones:
+        tipo = operacion[0]
+        if tipo == 'parrafo':
+            story.append(Paragraph(operacion[1], styles[operacion[2]]))
+        elif tipo == 'espacio':
+            story.append(Spacer(1, operacion[1]))
+        elif tipo == 'certificado':
+            # El parámetro evita que el navegador muestre una versión anterior del archivo
+            cert_url = f"{operacion[1]}?_={datetime.now().timestamp()}"
+            story.append(Paragraph(
+                f'<a href="{cert_url}" color="blue"><i>Ver certificado</i></a>', styles['SmallText']
+            ))
+        elif tipo == 'separador':
+            sep_table = Table([['']], colWidths=[ancho])
+            sep_table.setStyle(tema.separador)
+            story.append(sep_table)
+        elif tipo == 'encabezado':
+            _, url_foto, info = operacion
+            info_col = crear_flowables(info, tema, imagenes, ancho)
+            contenido_foto = imagenes.get((url_foto, 'foto')) if url_foto else None
+            if contenido_foto is not None:
+                # JPEG ya recortado y reducido a la resolución del hueco de 4 cm
+                header_table = Table([[[_imagen(contenido_foto, 4*cm)], info_col]], colWidths=[5*cm, None])
+                header_table.setStyle(tema.tabla_encabezado)
+                story.append(header_table)
+            else:
+                story.extend(info_col)
+        elif tipo == 'tabla_info':
+            _, filas, anchos = operacion
+            tabla_info = Table(
+                [[Paragraph(celda, styles['TablaInfo']) for celda in fila] for fila in filas],
+                colWidths=anchos,
+            )
+            tabla_info.setStyle(tema.tabla_info)
+            story.append(tabla_info)
+        elif tipo == 'producto':
+            _, url_imagen, info_text, sin_imagen = operacion
+            contenido_imagen = imagenes.get((url_imagen, 'miniatura'))
+            if contenido_imagen is None:
+                story.extend(crear_flowables(sin_imagen, tema, imagenes, ancho))
+                continue
+            tabla_prod = Table(
+                [[_imagen(contenido_imagen, 3*cm), Paragraph(info_text, styles['TablaInfo'])]],
+                colWidths=[3.5*cm, None],
+            )
+            tabla_prod.setStyle(tema.tabla_producto)
+            story.append(tabla_prod)
+            story.append(Spacer(1, 0.3*cm))
+        else:
+            raise ValueError(f'Operación de PDF desconocida: {tipo}')
+    return story
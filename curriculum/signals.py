@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    DatosPersonales, ExperienciaLaboral, Reconocimientos,
+    CursosRealizados, ProductosAcademicos, ProductosLaborales, VentaGarage,
+    ConfiguracionSecciones
+)
+from .cache_paginas import invalidar_paginas
+from .miniaturas import generar_en_segundo_plano
+from .perfil_activo import invalidar_perfil_activo
+from .snapshot import SECCIONES, invalidar_perfil
+
+MODELOS_SECCION = (
+    ExperienciaLaboral, Reconocimientos, CursosRealizados,
+    ProductosAcademicos, ProductosLaborales, VentaGarage,
+)
+SECCION_DE_MODELO = {modelo: nombre for nombre, (atributo, modelo, orden) in SECCIONES.items()}
+
+
+@receiver(post_save, sender=DatosPersonales)
+@receiver(post_delete, sender=DatosPersonales)
+def perfil_modificado(sender, instance, **kwargs):
+    invalidar_perfil(instance.pk)
+    invalidar_paginas(instance.pk)
+    invalidar_perfil_activo()
+
+
+@receiver(post_save, sender=ConfiguracionSecciones)
+@receiver(post_delete, sender=ConfiguracionSecciones)
+def configuracion_modificada(sender, instance, **kwargs):
+    invalidar_perfil(instance.perfil_id)
+    invalidar_paginas(instance.perfil_id)
+    invalidar_perfil_activo()
+
+
+def seccion_modificada(sender, instance, **kwargs):
+    invalidar_perfil(instance.idperfilconqueestaactivo_id)
+    # Solo caen la página de la sección y la portada, que muestra su resumen
+    invalidar_paginas(instance.idperfilconqueestaactivo_id, SECCION_DE_MODELO[sender])
+
+
+for modelo in MODELOS_SECCION:
+    post_save.connect(seccion_modificada, sender=modelo, dispatch_uid=f'cv_save_{modelo.__name__}')
+    post_delete.connect(seccion_modificada, sender=modelo, dispatch_uid=f'cv_delete_{modelo.__name__}')
+
+
+@receiver(post_save, sender=CursosRealizados)
+@receiver(post_save, sender=Reconocimientos)
+def certificado_guardado(sender, instance, **kwargs):
+    if instance.rutacertificado:
+        # El atributo puede seguir siendo el texto asignado; to_python da el recurso
+        recurso = sender._meta.get_field('rutacertificado').to_python(instance.rutacertificado)
+        # Tras el commit, para que el hilo vea el archivo ya subido
+        transaction.on_commit(lambda: generar_en_segundo_plano(recurso))
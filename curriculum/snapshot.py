@@ -0,0 +1,165 @@
+import hashlib
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, OuterRef, Subquery
+from django.utils import timezone
+
+from .models import (
+    DatosPersonales, ExperienciaLaboral, Reconocimientos,
+    CursosRealizados, ProductosAcademicos, ProductosLaborales, VentaGarage,
+    ConfiguracionSecciones
+)
+from .perfil_activo import resolver_perfil, resolver_perfil_activo
+
+# Secciones del CV: nombre usado por el PDF -> (atributo del snapshot, modelo, orden).
+# El orden es el mismo en el PDF, la portada y las páginas de cada sección.
+SECCIONES = {
+    'experiencia': ('experiencias', ExperienciaLaboral, ('-fechainiciogestion', '-idexperiencialaboral')),
+    'reconocimientos': ('reconocimientos', Reconocimientos, ('-fechareconocimiento', '-idreconocimiento')),
+    'cursos': ('cursos', CursosRealizados, ('-fechainicio', '-idcursorealizado')),
+    'productosacademicos': ('productos_academicos', ProductosAcademicos, ('-idproductoacademico',)),
+    'productoslaborales': ('productos_laborales', ProductosLaborales, ('-fechaproducto', '-idproductolaboral')),
+    'ventagarage': ('productos_garage', VentaGarage, ('-idventagarage',)),
+}
+
+SNAPSHOT_TIMEOUT = getattr(settings, 'CV_SNAPSHOT_TIMEOUT', 60 * 60 * 24)
+
+
+@dataclass(frozen=True)
+class SnapshotCV:
+    """
+    Vista inmutable de un perfil con su configuración y todas sus filas
+    visibles. Solo la usa el PDF: las páginas públicas leen resúmenes y
+    páginas acotadas, cacheados con la misma versión del perfil.
+    """
+    version: str = ''
+    perfil: DatosPersonales = None
+    config: ConfiguracionSecciones = None
+    experiencias: tuple = ()
+    reconocimientos: tuple = ()
+    cursos: tuple = ()
+    productos_academicos: tuple = ()
+    productos_laborales: tuple = ()
+    productos_garage: tuple = ()
+
+    def seccion(self, nombre):
+        return getattr(self, SECCIONES[nombre][0])
+
+    def huella(self, secciones=SECCIONES):
+        """Resumen del contenido de las secciones dadas, igual en todos los workers."""
+        partes = [self.perfil.pk, self.perfil.fechaactualizacion.isoformat()]
+        for nombre in sorted(secciones):
+            partes.append(nombre)
+            partes.extend(f'{fila.pk}@{fila.fechaactualizacion.isoformat()}' for fila in self.seccion(nombre))
+        return hashlib.sha256('|'.join(map(str, partes)).encode()).hexdigest()
+
+
+SNAPSHOT_VACIO = SnapshotCV()
+
+
+def _clave_version(perfil_id):
+    return f'cv:version:{perfil_id}'
+
+
+def _clave_snapshot(perfil_id, version):
+    return f'cv:snapshot:{perfil_id}:{version}'
+
+
+def get_version(perfil_id):
+    clave = _clave_version(perfil_id)
+    version = cache.get(clave)
+    if version is None:
+        # Un token nuevo nunca colisiona con snapshots antiguos aún en caché
+        cache.add(clave, uuid.uuid4().hex, None)
+        version = cache.get(clave)
+    return version
+
+
+def _clave_modificacion(perfil_id, version):
+    return f'cv:modificado:{perfil_id}:{version}'
+
+
+def invalidar_perfil(perfil_id):
+    if perfil_id is not None:
+        version = uuid.uuid4().hex
+        # La hora del cambio cubre también los borrados, que no dejan rastro
+        # en fechaactualizacion
+        cache.set(_clave_modificacion(perfil_id, version), timezone.now(), SNAPSHOT_TIMEOUT)
+        cache.set(_clave_version(perfil_id), version, None)
+
+
+def consultar_ultima_modificacion(perfil_id):
+    """Mayor fechaactualizacion del perfil, su configuración y sus secciones."""
+    subconsultas = {
+        f'mod_{nombre}': Subquery(
+            modelo.objects.filter(idperfilconqueestaactivo=OuterRef('pk')).order_by().values(
+                'idperfilconqueestaactivo'
+            ).annotate(ultima=Max('fechaactualizacion')).values('ultima')
+        )
+        for nombre, (atributo, modelo, orden) in SECCIONES.items()
+    }
+    subconsultas['mod_config'] = Subquery(
+        ConfiguracionSecciones.objects.filter(perfil=OuterRef('pk')).order_by().values(
+            'perfil'
+        ).annotate(ultima=Max('fechaactualizacion')).values('ultima')
+    )
+    fila = DatosPersonales.objects.filter(pk=perfil_id).annotate(**subconsultas).values(
+        'fechaactualizacion', *subconsultas
+    ).first()
+    if fila is None:
+        return None
+    return max(fecha for fecha in fila.values() if fecha is not None)
+
+
+def get_ultima_modificacion(perfil_id):
+    version = get_version(perfil_id)
+    clave = _clave_modificacion(perfil_id, version)
+    modificado = cache.get(clave)
+    if modificado is None:
+        modificado = consultar_ultima_modificacion(perfil_id)
+        cache.set(clave, modificado, SNAPSHOT_TIMEOUT)
+    return modificado
+
+
+def consulta_seccion(nombre, perfil_id):
+    atributo, modelo, orden = SECCIONES[nombre]
+    return modelo.objects.filter(
+        idperfilconqueestaactivo_id=perfil_id,
+        activarparaqueseveaenfront=True
+    ).order_by(*orden)
+
+
+def construir_snapshot(perfil, config, version=''):
+    filas = {}
+    for nombre, (atributo, modelo, orden) in SECCIONES.items():
+        filas[atributo] = tuple(consulta_seccion(nombre, perfil.pk))
+
+    return SnapshotCV(version=version, perfil=perfil, config=config, **filas)
+
+
+def get_snapshot_pdf(perfil_id=None, request=None):
+    """Devuelve el snapshot del perfil (por defecto el activo) para el PDF, desde la caché."""
+    if perfil_id is None:
+        perfil, config = resolver_perfil_activo(request)
+        if perfil is None:
+            return SNAPSHOT_VACIO
+        perfil_id = perfil.pk
+    else:
+        perfil = config = None
+
+    # La versión se lee antes de construir: si cambia durante la construcción,
+    # el snapshot queda bajo una clave obsoleta que nadie volverá a leer.
+    version = get_version(perfil_id)
+    clave = _clave_snapshot(perfil_id, version)
+    snapshot = cache.get(clave)
+    if snapshot is None:
+        if perfil is None:
+            perfil, config = resolver_perfil(perfil_id)
+            if perfil is None:
+                return SNAPSHOT_VACIO
+        snapshot = construir_snapshot(perfil, config, version)
+        cache.set(clave, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
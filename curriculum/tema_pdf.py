@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import TableStyle
+
+TEMA_POR_DEFECTO = getattr(settings, 'CV_PDF_TEMA', 'clasico')
+
+
+@dataclass(frozen=True)
+class TemaPDF:
+    """Estilos, colores y estilos de tabla del PDF; se comparten entre renders y no se modifican."""
+    nombre: str
+    primario: colors.Color
+    oscuro: colors.Color
+    gris: colors.Color
+    fondo_claro: colors.Color
+    secundario: colors.Color
+    estilos: MappingProxyType
+    tabla_encabezado: TableStyle
+    separador: TableStyle
+    tabla_info: TableStyle
+    tabla_producto: TableStyle
+
+
+def crear_tema(nombre, primario='#A7C7E7', oscuro='#555555', gris='#999999',
+               fondo_claro='#F4F7F9', secundario='#B2B2B2'):
+    primario = colors.HexColor(primario)
+    oscuro = colors.HexColor(oscuro)
+    gris = colors.HexColor(gris)
+    fondo_claro = colors.HexColor(fondo_claro)
+    secundario = colors.HexColor(secundario)
+
+    # Hoja propia: los estilos de ejemplo de ReportLab no se comparten con nadie más
+    base = getSampleStyleSheet()
+    estilos = {nombre_estilo: base[nombre_estilo] for nombre_estilo in base.byName}
+
+    def agregar(nombre_estilo, parent, **kwargs):
+        estilos[nombre_estilo] = ParagraphStyle(name=nombre_estilo, parent=parent, **kwargs)
+
+    normal = estilos['Normal']
+    agregar('MainTitle', estilos['Heading1'], fontSize=24, textColor=primario,
+            alignment=TA_CENTER, fontName='Helvetica-Bold', spaceAfter=6)
+    agregar('SectionTitle', estilos['Heading2'], fontSize=14, textColor=colors.white,
+            backColor=primario, fontName='Helvetica-Bold', leftIndent=10,
+            rightIndent=10, leading=20, spaceBefore=12, spaceAfter=12)
+    agregar('Justified', normal, fontSize=10, alignment=TA_JUSTIFY, leading=16, spaceAfter=10)
+    agregar('SmallText', normal, fontSize=9, textColor=secundario, leading=14)
+    agregar('EntryTitle', normal, fontSize=12, textColor=primario, fontName='Helvetica-Bold', spaceAfter=4)
+    agregar('CVTitle', normal, fontSize=24, leading=28, textColor=primario,
+            fontName='Helvetica-Bold', spaceAfter=2, alignment=TA_LEFT)
+    agregar('CVSubtitle', normal, fontSize=11, leading=14, textColor=gris,
+            fontName='Helvetica', spaceAfter=10)
+    agregar('SectionHeader', normal, fontSize=16, textColor=primario, fontName='Helvetica-Bold',
+            spaceAfter=10, spaceBefore=15, borderPadding=(5, 5, 5, 5), borderColor=primario,
+            borderWidth=0, leftIndent=0)
+    agregar('JobTitle', normal, fontSize=13, textColor=oscuro, fontName='Helvetica-Bold', spaceAfter=3)
+    agregar('CompanyInfo', normal, fontSize=10, textColor=gris, fontName='Helvetica',
+            leading=14, spaceAfter=6)
+    agregar('CustomBodyText', normal, fontSize=10, alignment=TA_JUSTIFY, leading=16, spaceAfter=10)
+    agregar('SmallGray', normal, fontSize=9, textColor=gris, leading=12)
+    # Texto de las celdas de datos personales y de los artículos en venta
+    # (antes se lograba cambiando Normal.leading a mitad del documento)
+    agregar('TablaInfo', normal, leading=14)
+
+    return TemaPDF(
+        nombre=nombre,
+        primario=primario,
+        oscuro=oscuro,
+        gris=gris,
+        fondo_claro=fondo_claro,
+        secundario=secundario,
+        estilos=MappingProxyType(estilos),
+        tabla_encabezado=TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+        ]),
+        separador=TableStyle([
+            ('LINEABOVE', (0, 0), (-1, 0), 2, primario),
+        ]),
+        tabla_info=TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), fondo_claro),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.white),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ]),
+        tabla_producto=TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('BACKGROUND', (0, 0), (-1, -1), fondo_claro),
+            ('PADDING', (0, 0), (-1, -1), 8),
+        ]),
+    )
+
+
+# nombre -> función que crea el tema; se construye una sola vez, al primer uso
+_fabricas = {}
+_temas = {}
+
+
+def registrar_tema(nombre, fabrica):
+    _fabricas[nombre] = fabrica
+    _temas.pop(nombre, None)
+
+
+def get_tema(nombre=None):
+    nombre = nombre or TEMA_POR_DEFECTO
+    tema = _temas.get(nombre)
+    if tema is None:
+        if nombre not in _fabricas:
+            raise KeyError(f'Tema de PDF desconocido: {nombre}')
+        # Dos hilos pueden construirlo a la vez; gana cualquiera de los dos
+        tema = _temas.setdefault(nombre, _fabricas[nombre]())
+    return tema
+
+
+registrar_tema('clasico', lambda: crear_tema('clasico'))
@@ -1,10 +1,12 @@
 from django import template
+from django.conf import settings
 
 register = template.Library()
 
 @register.filter(name='cloudinary_raw')
 def cloudinary_raw(value):
     """Convierte URL de Cloudinary de image/upload a raw/upload para PDFs"""
-    if value and 'cloudinary.com' in str(value):
+    local = settings.CV_CLOUDINARY_LOCAL
+    if value and ('cloudinary.com' in str(value) or (local and local in str(value))):
         return str(value).replace('/image/upload/', '/raw/upload/')
     return value
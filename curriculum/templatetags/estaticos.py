@@ -0,0 +1,62 @@
+import json
+from functools import cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from curriculum.estaticos import CSS_PROPIOS, DEPENDENCIAS, JS_PROPIOS, JS_TERCEROS, PAQUETE_CSS, PAQUETE_JS
+
+register = template.Library()
+
+
+@cache
+def _empaquetado():
+    """Hay paquetes y están activados (por defecto, con DEBUG=False)."""
+    return settings.CV_ESTATICOS_EMPAQUETADOS and finders.find(PAQUETE_CSS) is not None
+
+
+@cache
+def _criticos():
+    """{plantilla: CSS crítico} de empaquetar_estaticos, o vacío si no se generó."""
+    try:
+        with open(settings.CV_CSS_CRITICO, encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+@register.simple_tag(takes_context=True)
+def estilos_sitio(context):
+    """
+    Un <link> al paquete CSS o, sin paquetes, a cada hoja por separado. Si la
+    página tiene CSS crítico, se incrusta y el paquete se carga sin bloquear.
+    """
+    if _empaquetado():
+        critico = _criticos().get(context.template.name)
+        if critico:
+            return format_html(
+                '<style>{}</style>\n    '
+                '<link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n    '
+                '<noscript><link rel="stylesheet" href="{}"></noscript>',
+                # Sin escapar (rompería los selectores > y las comillas), pero sin poder cerrar el <style>
+                mark_safe(critico.replace('</', '<\\/')), static(PAQUETE_CSS), static(PAQUETE_CSS),
+            )
+        hojas = [static(PAQUETE_CSS)]
+    else:
+        hojas = [DEPENDENCIAS['bootstrap.css'], DEPENDENCIAS['bootstrap-icons.css']]
+        hojas += [static(nombre) for nombre in CSS_PROPIOS]
+    return format_html_join('\n    ', '<link rel="stylesheet" href="{}">', ((hoja,) for hoja in hojas))
+
+
+@register.simple_tag
+def scripts_sitio():
+    """Un <script> con el paquete JS o, sin paquetes, uno por archivo."""
+    if _empaquetado():
+        scripts = [static(PAQUETE_JS)]
+    else:
+        scripts = [DEPENDENCIAS[nombre] for nombre in JS_TERCEROS] + [static(nombre) for nombre in JS_PROPIOS]
+    return format_html_join('\n    ', '<script src="{}"></script>', ((script,) for script in scripts))
@@ -0,0 +1,36 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from curriculum import imagenes_web, miniaturas
+
+register = template.Library()
+
+
+def _atributos(recurso, ancho, alto, sizes):
+    return imagenes_web.atributos_imagen(recurso, int(ancho), int(alto) if alto else None, sizes)
+
+
+@register.simple_tag
+def imagen_responsiva(recurso, ancho, alto=None, sizes=None, alt='', clase='', carga='lazy'):
+    """
+    <img> con srcset de versiones reducidas del recurso para un hueco de
+    `ancho` x `alto` píxeles CSS. carga='eager' para la imagen principal.
+    """
+    datos = _atributos(recurso, ancho, alto, sizes)
+    dimensiones = format_html_join('', ' {}="{}"', [('width', ancho), ('height', alto)] if alto else [])
+    return format_html(
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="{}" decoding="async"{}>',
+        datos['src'], datos['srcset'], datos['sizes'], alt, clase, carga, dimensiones,
+    )
+
+
+@register.simple_tag
+def atributos_imagen(recurso, ancho, alto=None, sizes=None):
+    """Solo src, srcset y sizes, para las <img> que necesitan atributos propios: {% atributos_imagen ... as img %}"""
+    return _atributos(recurso, ancho, alto, sizes)
+
+
+@register.simple_tag
+def miniaturas_disponibles():
+    """Si se pueden generar miniaturas de certificados (PyMuPDF instalado); si no, se incrusta el PDF."""
+    return miniaturas.disponible()
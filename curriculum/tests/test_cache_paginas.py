@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from .. import cache_paginas
+from ..cache_paginas import CABECERA
+from .utilidades import PruebaConCache, crear_curso, crear_perfil
+
+
+@mock.patch.object(cache_paginas, 'CACHE_ACTIVA', True)
+class CachePaginasTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        self.perfil = crear_perfil()
+        self.curso = crear_curso(self.perfil)
+
+    def estado(self, url, **parametros):
+        return self.client.get(url, parametros)[CABECERA]
+
+    def entradas(self):
+        # Entradas en la LocMemCache de las pruebas
+        return len(cache_paginas.cache._cache)
+
+    def test_acierto_sin_consultas(self):
+        self.assertEqual(self.estado('/cursos-realizados/'), 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get('/cursos-realizados/')
+        self.assertEqual(response[CABECERA], 'HIT')
+        self.assertContains(response, 'Curso 1')
+
+    def test_parametros_desconocidos_no_crean_entradas(self):
+        self.estado('/')
+        antes = self.entradas()
+        for valor in ('1', '2'):
+            self.assertEqual(self.estado('/', x=valor), 'BYPASS')
+        self.assertEqual(self.entradas(), antes)
+        self.assertEqual(self.estado('/'), 'HIT')
+
+    def test_cursores_del_cliente_no_pasan_por_la_cache(self):
+        self.assertEqual(self.estado('/api/secciones/cursos/'), 'MISS')
+        self.assertEqual(self.estado('/api/secciones/cursos/'), 'HIT')
+        self.assertEqual(self.estado('/api/secciones/cursos/', cursor='WyIyMDI0LTAxLTAxIiwgMV0'), 'BYPASS')
+
+    def test_parametros_declarados_forman_parte_de_la_clave(self):
+        vista = cache_paginas.cache_pagina('cursos', parametros=('modo',))(
+            lambda request: HttpResponse(request.GET['modo'])
+        )
+        for modo, esperado in (('a', 'MISS'), ('a', 'HIT'), ('b', 'MISS')):
+            response = vista(RequestFactory().get('/cursos-realizados/', {'modo': modo}))
+            self.assertEqual((response[CABECERA], response.content.decode()), (esperado, modo))
+
+    def test_guardar_una_seccion_purga_solo_sus_paginas(self):
+        for url in ('/', '/cursos-realizados/', '/experiencia-laboral/'):
+            self.estado(url)
+        crear_curso(self.perfil, dia=2)
+        self.assertEqual(self.estado('/experiencia-laboral/'), 'HIT')
+        self.assertEqual(self.estado('/cursos-realizados/'), 'MISS')
+        self.assertEqual(self.estado('/'), 'MISS')
+
+    def test_borrar_una_fila_purga_sus_paginas(self):
+        self.estado('/cursos-realizados/')
+        self.curso.delete()
+        response = self.client.get('/cursos-realizados/')
+        self.assertEqual(response[CABECERA], 'MISS')
+        self.assertNotContains(response, 'Curso 1')
+
+    def test_guardar_el_perfil_purga_todo(self):
+        for url in ('/', '/experiencia-laboral/'):
+            self.estado(url)
+        self.perfil.nombres = 'Beatriz'
+        self.perfil.save()
+        self.assertEqual(self.estado('/experiencia-laboral/'), 'MISS')
+        self.assertEqual(self.estado('/'), 'MISS')
+
+    def test_estadisticas(self):
+        cache_paginas.reiniciar_estadisticas()
+        self.estado('/')
+        self.estado('/')
+        self.assertEqual(cache_paginas.estadisticas(), (1, 1))
@@ -0,0 +1,43 @@
+import json
+
+from .utilidades import PruebaConCache, crear_curso, crear_perfil
+
+
+class GetCondicionalTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        self.perfil = crear_perfil()
+        crear_curso(self.perfil)
+
+    def test_etag_coincidente_responde_304_sin_renderizar(self):
+        for url in ('/', '/cursos-realizados/', '/api/secciones/cursos/', '/api/configuracion/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('no-cache', response['Cache-Control'])
+                # Perfil activo, versión y fecha de modificación ya están en memoria/caché
+                with self.assertNumQueries(0):
+                    revalidada = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(revalidada.status_code, 304)
+                self.assertEqual(revalidada.content, b'')
+
+    def test_if_modified_since(self):
+        response = self.client.get('/')
+        revalidada = self.client.get('/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(revalidada.status_code, 304)
+
+    def test_un_cambio_invalida_los_validadores(self):
+        response = self.client.get('/cursos-realizados/')
+        crear_curso(self.perfil, dia=2)
+        nueva = self.client.get('/cursos-realizados/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(nueva.status_code, 200)
+        self.assertNotEqual(nueva['ETag'], response['ETag'])
+        self.assertContains(nueva, 'Curso 2')
+
+    def test_guardar_la_configuracion_no_es_condicional(self):
+        response = self.client.post(
+            '/api/configuracion/', json.dumps({'cursos': False}),
+            content_type='application/json', HTTP_IF_MATCH='"otro"',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.client.get('/api/configuracion/').json()['mostrar_cursos'])
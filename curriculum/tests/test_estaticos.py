@@ -0,0 +1,50 @@
+from django.test import SimpleTestCase
+
+from ..estaticos import _partir, _reglas, _selector_usado, minificar_css, podar_css
+
+
+class PodaCSSTests(SimpleTestCase):
+    def test_partir_respeta_parentesis_y_comillas(self):
+        self.assertEqual(_partir('a,:is(b,c),[x=","]', ','), ['a', ':is(b,c)', '[x=","]'])
+
+    def test_reglas_de_primer_nivel(self):
+        css = '/*! licencia */@import url(a.css);.a{color:red}@media (min-width:1px){.b{x:y}.c{x:y}}'
+        self.assertEqual(list(_reglas(css)), [
+            ('/*! licencia */', None),
+            ('@import url(a.css);', None),
+            ('.a', 'color:red'),
+            ('@media (min-width:1px)', '.b{x:y}.c{x:y}'),
+        ])
+
+    def test_llaves_dentro_de_cadenas(self):
+        self.assertEqual(list(_reglas('.a::before{content:"}"}.b{x:y}')), [
+            ('.a::before', 'content:"}"'),
+            ('.b', 'x:y'),
+        ])
+
+    def test_selector_usado(self):
+        usadas = {'btn', 'activo', 'type'}
+        self.assertTrue(_selector_usado('.btn.activo', usadas))
+        self.assertTrue(_selector_usado('button.btn:hover', usadas))
+        self.assertTrue(_selector_usado('.btn:not(.disabled)', usadas))
+        self.assertTrue(_selector_usado('input[type=checkbox]', usadas))
+        self.assertTrue(_selector_usado('.w-\\31 00', usadas))
+        self.assertFalse(_selector_usado('.btn .otro', usadas))
+        self.assertFalse(_selector_usado('#menu', usadas))
+        self.assertFalse(_selector_usado('[data-bs-theme=dark] .btn', usadas))
+
+    def test_poda_selectores_y_reglas(self):
+        css = '/*! licencia */.a,.b{color:red}.c{color:blue}body{margin:0}'
+        self.assertEqual(podar_css(css, {'a'}), '/*! licencia */.a{color:red}body{margin:0}')
+
+    def test_poda_grupos_anidados(self):
+        css = '@media (min-width:1px){@supports (display:grid){.a{x:y}.b{x:y}}.c{x:y}}@media print{.c{x:y}}'
+        self.assertEqual(podar_css(css, {'a'}), '@media (min-width:1px){@supports (display:grid){.a{x:y}}}')
+
+    def test_conserva_keyframes_y_font_face(self):
+        css = '@keyframes giro{from{x:y}to{x:z}}@font-face{font-family:f}'
+        self.assertEqual(podar_css(css, set()), css)
+
+    def test_minificar_conserva_licencias_y_selectores(self):
+        css = '/* comentario */\n/*! licencia */\n.a > .b:hover ,\n.c {\n  color: red ;\n}\n'
+        self.assertEqual(minificar_css(css), '/*! licencia */ .a>.b:hover,.c{color:red}')
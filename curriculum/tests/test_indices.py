@@ -0,0 +1,23 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from ..benchmarks.consultas import ORDENAMIENTO, _explicar, consultas
+from ..snapshot import SECCIONES
+from .utilidades import crear_perfil
+
+
+# Con tablas casi vacías PostgreSQL prefiere recorrerlas enteras; SQLite
+# elige el plan sin estadísticas y es estable.
+@skipUnless(connection.vendor == 'sqlite', 'Planes comprobados solo en SQLite')
+class IndicesTests(TestCase):
+    def test_las_consultas_de_seccion_usan_el_indice_compuesto(self):
+        perfil = crear_perfil()
+        for nombre, (atributo, modelo, orden) in SECCIONES.items():
+            indice = modelo._meta.indexes[0].name
+            for etiqueta, queryset in consultas(nombre, perfil.pk).items():
+                with self.subTest(seccion=nombre, consulta=etiqueta):
+                    plan = _explicar(queryset, 'prueba')
+                    self.assertIn(indice, plan)
+                    self.assertIsNone(ORDENAMIENTO['sqlite'].search(plan))
@@ -0,0 +1,70 @@
+import shutil
+import tempfile
+from concurrent.futures import Future
+from unittest import mock
+
+from .. import miniaturas
+from ..cache_disco import CacheDisco
+from .utilidades import PruebaConCache, crear_curso, crear_perfil
+
+
+class MiniaturaCertificadoTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        curso = crear_curso(crear_perfil(), rutacertificado='certificados/cursos/curso')
+        self.url = f'/certificados/cursos/{curso.pk}/miniatura/'
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        self.ejecutor = mock.Mock()
+        self.ejecutor.submit.side_effect = lambda *args: Future()
+        self.renderizar = mock.Mock(return_value=b'RIFF-webp')
+        for nombre, valor in (
+            ('cache_miniaturas', CacheDisco(directorio, 10 ** 6, extension='.webp')),
+            ('_ejecutor', self.ejecutor),
+            ('_pendientes', set()),
+            ('_origen', mock.Mock(return_value='certificados/cursos/curso:1')),
+            ('_leer_certificado', mock.Mock(return_value=b'%PDF')),
+            ('renderizar_primera_pagina', self.renderizar),
+            ('disponible', mock.Mock(return_value=True)),
+        ):
+            parche = mock.patch.object(miniaturas, nombre, valor)
+            parche.start()
+            self.addCleanup(parche.stop)
+
+    def generar_encoladas(self):
+        for (funcion, *args), _ in self.ejecutor.submit.call_args_list:
+            funcion(*args)
+
+    def test_un_fallo_de_cache_no_renderiza_en_la_peticion(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Retry-After'], str(miniaturas.REINTENTO_CLIENTE))
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.renderizar.assert_not_called()
+
+        self.generar_encoladas()
+        lista = self.client.get(self.url)
+        self.assertEqual(lista.status_code, 200)
+        self.assertEqual(lista['Content-Type'], 'image/webp')
+        self.assertIn('immutable', lista['Cache-Control'])
+        self.assertEqual(b''.join(lista.streaming_content), b'RIFF-webp')
+        lista.close()
+
+    def test_peticiones_repetidas_se_encolan_una_vez(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(self.url).status_code, 202)
+        self.assertEqual(self.ejecutor.submit.call_count, 1)
+
+    def test_al_terminar_se_puede_volver_a_encolar(self):
+        futuro = Future()
+        self.ejecutor.submit.side_effect = lambda *args: futuro
+        self.client.get(self.url)
+        futuro.set_result(None)
+        self.assertEqual(miniaturas._pendientes, set())
+
+    def test_certificado_que_no_se_puede_renderizar(self):
+        self.renderizar.return_value = None
+        self.client.get(self.url)
+        self.generar_encoladas()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.ejecutor.submit.call_count, 1)
@@ -0,0 +1,97 @@
+import datetime
+import json
+from base64 import urlsafe_b64encode
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from ..models import CursosRealizados
+from ..paginacion import (
+    TAMANO_PAGINA, CursorInvalido, _clave_pagina, codificar_cursor, decodificar_cursor, get_pagina,
+)
+from ..snapshot import SECCIONES, get_version
+from .utilidades import PruebaConCache, crear_curso, crear_perfil
+
+
+class CursorTests(SimpleTestCase):
+    ORDEN = SECCIONES['cursos'][2]
+
+    def cursor(self, valores):
+        return urlsafe_b64encode(json.dumps(valores).encode()).decode().rstrip('=')
+
+    def test_ida_y_vuelta(self):
+        fila = CursosRealizados(idcursorealizado=7, fechainicio=datetime.date(2024, 3, 1))
+        cursor = codificar_cursor(fila, self.ORDEN)
+        self.assertNotIn('=', cursor)
+        self.assertEqual(
+            decodificar_cursor(cursor, CursosRealizados, self.ORDEN),
+            [datetime.date(2024, 3, 1), 7],
+        )
+
+    def test_cursores_mal_formados(self):
+        for cursor in (
+            '###',
+            'no-es-base64',
+            self.cursor({'fecha': '2024-03-01'}),
+            self.cursor(['2024-03-01']),
+            self.cursor(['2024-03-01', 7, 8]),
+            self.cursor(['no-es-fecha', 7]),
+            self.cursor(['2024-03-01', 'siete']),
+            urlsafe_b64encode(b'\xff\xfe').decode(),
+        ):
+            with self.subTest(cursor=cursor), self.assertRaises(CursorInvalido):
+                decodificar_cursor(cursor, CursosRealizados, self.ORDEN)
+
+
+class PaginaTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        self.perfil = crear_perfil()
+        # Dos cursos el mismo día: el desempate por PK no puede saltar ni repetir filas
+        self.cursos = [crear_curso(self.perfil, dia=dia) for dia in (1, 2, 3, 3, 4)]
+
+    def recorrer(self, tamano=2):
+        pks, cursor = [], None
+        while True:
+            pagina = get_pagina('cursos', self.perfil, cursor, tamano)
+            pks.extend(fila.pk for fila in pagina.filas)
+            cursor = pagina.siguiente
+            if not cursor:
+                return pks
+
+    def test_recorrido_completo_sin_huecos(self):
+        esperado = [c.pk for c in sorted(self.cursos, key=lambda c: (c.fechainicio, c.pk), reverse=True)]
+        self.assertEqual(self.recorrer(), esperado)
+
+    def test_paginas_emitidas_quedan_en_cache(self):
+        self.recorrer()
+        with self.assertNumQueries(0):
+            self.recorrer()
+
+    def test_cursores_del_cliente_no_se_cachean(self):
+        fabricado = codificar_cursor(self.cursos[2], SECCIONES['cursos'][2])
+        with self.assertNumQueries(1):
+            pagina = get_pagina('cursos', self.perfil, fabricado, 2)
+        clave = _clave_pagina(self.perfil.pk, get_version(self.perfil.pk), 'cursos', 2, fabricado)
+        self.assertIsNone(cache.get(clave))
+        with self.assertNumQueries(1):
+            self.assertEqual(get_pagina('cursos', self.perfil, fabricado, 2), pagina)
+
+    def test_guardar_invalida_las_paginas(self):
+        self.recorrer()
+        nuevo = crear_curso(self.perfil, dia=5)
+        self.assertEqual(self.recorrer()[0], nuevo.pk)
+
+    def test_cargar_mas(self):
+        for dia in range(5, 5 + TAMANO_PAGINA):
+            crear_curso(self.perfil, dia=dia)
+        primera = self.client.get('/api/secciones/cursos/').json()
+        self.assertIn(f'Curso {4 + TAMANO_PAGINA}', primera['html'])
+        siguiente = self.client.get('/api/secciones/cursos/', {'cursor': primera['siguiente']})
+        self.assertEqual(siguiente.status_code, 200)
+        self.assertIn('Curso 1', siguiente.json()['html'])
+        self.assertIsNone(siguiente.json()['siguiente'])
+
+    def test_cargar_mas_con_cursor_invalido(self):
+        self.assertEqual(self.client.get('/api/secciones/cursos/', {'cursor': '###'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/secciones/otra/').status_code, 404)
@@ -0,0 +1,66 @@
+import json
+import shutil
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+
+from .. import pdf
+from ..cache_disco import CacheDisco
+from .utilidades import PruebaConCache, crear_curso, crear_perfil
+
+
+class CachePDFTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        self.perfil = crear_perfil()
+        crear_curso(self.perfil)
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        parche = mock.patch.object(pdf, 'cache_pdf', CacheDisco(directorio, settings.CV_PDF_CACHE_MAX_BYTES, '.pdf'))
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def generar(self, secciones=('perfil', 'cursos'), **datos):
+        return self.client.post(
+            '/api/generar-pdf/', json.dumps({'secciones': list(secciones), **datos}), content_type='application/json',
+        )
+
+    def contenido(self, response):
+        try:
+            return b''.join(response.streaming_content)
+        finally:
+            response.close()
+
+    def test_fallo_y_acierto(self):
+        primera = self.generar()
+        self.assertEqual(primera['X-CV-Cache'], 'MISS')
+        cuerpo = self.contenido(primera)
+        self.assertTrue(cuerpo.startswith(b'%PDF'))
+        self.assertEqual(primera['X-PDF-Bytes'], str(len(cuerpo)))
+
+        # Snapshot y PDF en caché: ni una consulta
+        with self.assertNumQueries(0):
+            segunda = self.generar(secciones=('cursos', 'perfil', 'cursos'))
+        self.assertEqual(segunda['X-CV-Cache'], 'HIT')
+        self.assertEqual(segunda['ETag'], primera['ETag'])
+        self.assertEqual(self.contenido(segunda), cuerpo)
+
+    def test_la_clave_cambia_con_el_contenido_las_secciones_y_el_modo(self):
+        etag = self.generar()['ETag']
+        self.assertEqual(self.generar(secciones=('perfil',))['X-CV-Cache'], 'MISS')
+        self.assertEqual(self.generar(modo='compacto')['X-CV-Cache'], 'MISS')
+        crear_curso(self.perfil, dia=2)
+        nueva = self.generar()
+        self.assertEqual(nueva['X-CV-Cache'], 'MISS')
+        self.assertNotEqual(nueva['ETag'], etag)
+
+    def test_una_seccion_no_pedida_no_invalida(self):
+        self.generar(secciones=('perfil',))
+        crear_curso(self.perfil, dia=2)
+        self.assertEqual(self.generar(secciones=('perfil',))['X-CV-Cache'], 'HIT')
+
+    def test_peticiones_invalidas(self):
+        self.assertEqual(self.generar(secciones=()).status_code, 400)
+        self.assertEqual(self.generar(modo='otro').status_code, 400)
+        self.assertEqual(self.client.get('/api/generar-pdf/').status_code, 405)
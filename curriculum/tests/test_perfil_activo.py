@@ -0,0 +1,67 @@
+from unittest import mock
+
+from .. import perfil_activo
+from ..models import ConfiguracionSecciones
+from ..perfil_activo import MEMO_TTL, get_configuracion, resolver_perfil_activo
+from .utilidades import PruebaConCache, crear_perfil
+
+
+class PerfilActivoTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        self.perfil = crear_perfil()
+
+    def test_una_consulta_y_luego_memo(self):
+        with self.assertNumQueries(1):
+            perfil, config = resolver_perfil_activo()
+        with self.assertNumQueries(0):
+            self.assertEqual(resolver_perfil_activo()[0].pk, perfil.pk)
+        self.assertEqual(perfil.pk, self.perfil.pk)
+
+    def test_sin_configuracion_no_escribe(self):
+        perfil, config = resolver_perfil_activo()
+        self.assertIsNone(config.pk)
+        self.assertTrue(config.mostrar_cursos)
+        self.assertFalse(ConfiguracionSecciones.objects.exists())
+
+    def test_memo_por_peticion(self):
+        request = mock.Mock(spec=[])
+        resolver_perfil_activo(request)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_configuracion(self.perfil, request), request._cv_perfil_activo[1])
+
+    def test_guardar_la_configuracion_invalida_el_memo(self):
+        resolver_perfil_activo()
+        ConfiguracionSecciones.objects.create(perfil=self.perfil, mostrar_cursos=False)
+        with self.assertNumQueries(1):
+            perfil, config = resolver_perfil_activo()
+        self.assertFalse(config.mostrar_cursos)
+
+    def test_cambiar_el_perfil_activo(self):
+        resolver_perfil_activo()
+        otro = crear_perfil(numerocedula='1300000002', perfilactivo=0)
+        self.perfil.perfilactivo = 0
+        self.perfil.save()
+        otro.perfilactivo = 1
+        otro.save()
+        self.assertEqual(resolver_perfil_activo()[0].pk, otro.pk)
+
+    def test_borrar_el_perfil(self):
+        resolver_perfil_activo()
+        self.perfil.delete()
+        self.assertEqual(resolver_perfil_activo(), (None, None))
+
+    def test_el_memo_caduca_aunque_no_llegue_la_invalidacion(self):
+        resolver_perfil_activo()
+        # Otro worker con su propia caché cambió los datos sin avisar a este
+        ConfiguracionSecciones.objects.bulk_create([ConfiguracionSecciones(perfil=self.perfil, mostrar_cursos=False)])
+        self.assertTrue(resolver_perfil_activo()[1].mostrar_cursos)
+        ahora = perfil_activo.time.monotonic()
+        with mock.patch.object(perfil_activo.time, 'monotonic', return_value=ahora + MEMO_TTL + 1):
+            self.assertFalse(resolver_perfil_activo()[1].mostrar_cursos)
+
+    def test_las_vistas_no_crean_configuracion(self):
+        for url in ('/', '/cursos-realizados/', '/api/configuracion/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertFalse(ConfiguracionSecciones.objects.exists())
@@ -0,0 +1,40 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+
+from .utilidades import PruebaConCache, crear_curso, crear_perfil
+
+
+class PrerenderTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        self.perfil = crear_perfil()
+        crear_curso(self.perfil)
+        self.destino = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.destino)
+
+    def prerender(self):
+        salida = StringIO()
+        call_command('prerender', destino=self.destino, stdout=salida)
+        return [linea.split()[-1] for linea in salida.getvalue().splitlines() if 'generada' in linea]
+
+    def test_genera_todas_las_paginas(self):
+        self.assertEqual(len(self.prerender()), 7)
+        self.assertIn('Curso 1', (self.destino / 'cursos-realizados' / 'index.html').read_text())
+        self.assertIn('Ana', (self.destino / 'index.html').read_text())
+
+    def test_solo_regenera_lo_que_cambia(self):
+        self.prerender()
+        self.assertEqual(self.prerender(), [])
+        crear_curso(self.perfil, dia=2)
+        self.assertEqual(sorted(self.prerender()), ['/', '/cursos-realizados/'])
+        self.assertIn('Curso 2', (self.destino / 'cursos-realizados' / 'index.html').read_text())
+
+    def test_un_borrado_tambien_regenera(self):
+        otro = crear_curso(self.perfil, dia=2)
+        self.prerender()
+        otro.delete()
+        self.assertEqual(sorted(self.prerender()), ['/', '/cursos-realizados/'])
@@ -0,0 +1,88 @@
+from io import BytesIO
+
+from django.test import RequestFactory, SimpleTestCase
+
+from ..respuestas import _rango_pedido, respuesta_archivo
+
+ETAG = '"abc"'
+
+
+class RangoPedidoTests(SimpleTestCase):
+    def rango(self, cabecera=None, tamano=100, metodo='get', **cabeceras):
+        if cabecera is not None:
+            cabeceras['HTTP_RANGE'] = cabecera
+        request = getattr(RequestFactory(), metodo)('/', **cabeceras)
+        return _rango_pedido(request, ETAG, tamano)
+
+    def test_sin_cabecera_se_sirve_completo(self):
+        self.assertIsNone(self.rango())
+
+    def test_rango_cerrado(self):
+        self.assertEqual(self.rango('bytes=0-9'), (0, 9))
+
+    def test_rango_abierto_hasta_el_final(self):
+        self.assertEqual(self.rango('bytes=90-'), (90, 99))
+
+    def test_fin_mas_alla_del_tamano_se_recorta(self):
+        self.assertEqual(self.rango('bytes=90-500'), (90, 99))
+
+    def test_sufijo(self):
+        self.assertEqual(self.rango('bytes=-10'), (90, 99))
+
+    def test_sufijo_mayor_que_el_archivo(self):
+        self.assertEqual(self.rango('bytes=-500'), (0, 99))
+
+    def test_sufijo_cero_no_se_puede_satisfacer(self):
+        self.assertEqual(self.rango('bytes=-0'), 'invalido')
+
+    def test_inicio_fuera_del_archivo(self):
+        self.assertEqual(self.rango('bytes=100-'), 'invalido')
+
+    def test_fin_antes_del_inicio_se_ignora(self):
+        self.assertIsNone(self.rango('bytes=5-2'))
+
+    def test_cabeceras_no_soportadas_se_ignoran(self):
+        for cabecera in ('bytes=0-1,5-6', 'items=0-1', 'bytes=-', 'bytes=a-b'):
+            with self.subTest(cabecera=cabecera):
+                self.assertIsNone(self.rango(cabecera))
+
+    def test_if_range_con_otro_etag_sirve_completo(self):
+        self.assertIsNone(self.rango('bytes=0-9', HTTP_IF_RANGE='"otro"'))
+
+    def test_if_range_con_el_mismo_etag(self):
+        self.assertEqual(self.rango('bytes=0-9', HTTP_IF_RANGE=ETAG), (0, 9))
+
+    def test_post_ignora_el_rango(self):
+        self.assertIsNone(self.rango('bytes=0-9', metodo='post'))
+
+
+class RespuestaArchivoTests(SimpleTestCase):
+    CONTENIDO = bytes(range(100))
+
+    def responder(self, rangos=True, **cabeceras):
+        request = RequestFactory().get('/', **cabeceras)
+        return respuesta_archivo(request, BytesIO(self.CONTENIDO), 'application/pdf', etag=ETAG, rangos=rangos)
+
+    def test_completo(self):
+        response = self.responder()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENIDO)
+
+    def test_parcial(self):
+        response = self.responder(HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENIDO[10:20])
+
+    def test_rango_imposible(self):
+        response = self.responder(HTTP_RANGE='bytes=200-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+
+    def test_sin_rangos_no_se_anuncian_ni_se_atienden(self):
+        response = self.responder(rangos=False, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Accept-Ranges'))
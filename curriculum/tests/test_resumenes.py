@@ -0,0 +1,72 @@
+from cloudinary import CloudinaryResource
+
+from ..models import ConfiguracionSecciones, VentaGarage
+from ..perfil_activo import resolver_perfil_activo
+from ..resumenes import LIMITES_RESUMEN, construir_resumenes, get_resumenes
+from .utilidades import PruebaConCache, crear_curso, crear_perfil
+
+
+class ResumenesTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        self.perfil = crear_perfil()
+        self.cursos = [crear_curso(self.perfil, dia=dia) for dia in range(1, 6)]
+        crear_curso(self.perfil, dia=6, activarparaqueseveaenfront=False)
+        self.producto = VentaGarage.objects.create(
+            idperfilconqueestaactivo=self.perfil, nombreproducto='Silla', estadoproducto='Bueno',
+            descripcion='Silla de madera', valordelbien='25.00', imagen_producto='garage/silla.jpg',
+        )
+
+    def resumenes(self):
+        return construir_resumenes(*resolver_perfil_activo())
+
+    def test_una_sola_consulta(self):
+        resolver_perfil_activo()
+        with self.assertNumQueries(1):
+            resumenes = self.resumenes()
+        self.assertEqual(set(resumenes), set(LIMITES_RESUMEN))
+
+    def test_primeras_filas_y_total(self):
+        cursos = self.resumenes()['cursos']
+        self.assertEqual(cursos.total, 5)
+        self.assertTrue(cursos.hay_mas)
+        self.assertEqual([c.pk for c in cursos.filas], [c.pk for c in self.cursos[::-1][:LIMITES_RESUMEN['cursos']]])
+        self.assertEqual(cursos.filas[0].nombrecurso, 'Curso 5')
+
+    def test_secciones_vacias(self):
+        experiencia = self.resumenes()['experiencia']
+        self.assertEqual((experiencia.filas, experiencia.total, experiencia.hay_mas), ((), 0, False))
+
+    def test_columnas_de_la_tarjeta_convertidas(self):
+        garage = self.resumenes()['ventagarage']
+        self.assertEqual(garage.total, 1)
+        self.assertFalse(garage.hay_mas)
+        self.assertIsInstance(garage.filas[0].imagen_producto, CloudinaryResource)
+        self.assertEqual(garage.filas[0].imagen_producto.public_id, 'garage/silla')
+
+    def test_secciones_ocultas_no_se_consultan(self):
+        ConfiguracionSecciones.objects.create(perfil=self.perfil, mostrar_cursos=False, mostrar_venta_garage=False)
+        self.assertNotIn('cursos', self.resumenes())
+        ConfiguracionSecciones.objects.filter(perfil=self.perfil).update(**{
+            campo: False for campo in ('mostrar_experiencia', 'mostrar_reconocimientos', 'mostrar_cursos',
+                                       'mostrar_productos_academicos', 'mostrar_productos_laborales',
+                                       'mostrar_venta_garage')
+        })
+        config = ConfiguracionSecciones.objects.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(construir_resumenes(self.perfil, config), {})
+
+    def test_cacheados_con_la_version_del_perfil(self):
+        perfil, config = resolver_perfil_activo()
+        get_resumenes(perfil, config)
+        with self.assertNumQueries(0):
+            get_resumenes(perfil, config)
+        crear_curso(self.perfil, dia=7)
+        self.assertEqual(get_resumenes(perfil, config)['cursos'].total, 6)
+
+    def test_la_portada_no_carga_columnas_diferidas(self):
+        # Perfil activo y la unión de los resúmenes: ninguna columna diferida
+        with self.assertNumQueries(2):
+            response = self.client.get('/')
+        self.assertContains(response, 'Curso 5')
+        self.assertContains(response, 'Silla')
@@ -0,0 +1,53 @@
+from ..perfil_activo import resolver_perfil_activo
+from ..resumenes import get_resumenes
+from ..snapshot import get_snapshot_pdf, get_version
+from .utilidades import PruebaConCache, crear_curso, crear_perfil, crear_producto_academico
+
+
+class SnapshotPDFTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        self.perfil = crear_perfil()
+        self.curso = crear_curso(self.perfil, dia=1)
+
+    def test_caliente_no_consulta(self):
+        snapshot = get_snapshot_pdf(self.perfil.pk)
+        with self.assertNumQueries(0):
+            caliente = get_snapshot_pdf(self.perfil.pk)
+        self.assertEqual(caliente.version, snapshot.version)
+        self.assertEqual(caliente.cursos, snapshot.cursos)
+
+    def test_guardar_una_fila_cambia_la_version(self):
+        version = get_version(self.perfil.pk)
+        get_snapshot_pdf(self.perfil.pk)
+        nuevo = crear_curso(self.perfil, dia=2)
+        self.assertNotEqual(get_version(self.perfil.pk), version)
+        self.assertEqual([c.pk for c in get_snapshot_pdf(self.perfil.pk).cursos], [nuevo.pk, self.curso.pk])
+
+    def test_ocultar_y_borrar_filas(self):
+        get_snapshot_pdf(self.perfil.pk)
+        self.curso.activarparaqueseveaenfront = False
+        self.curso.save()
+        self.assertEqual(get_snapshot_pdf(self.perfil.pk).cursos, ())
+
+        otro = crear_curso(self.perfil, dia=3)
+        get_snapshot_pdf(self.perfil.pk)
+        otro.delete()
+        self.assertEqual(get_snapshot_pdf(self.perfil.pk).cursos, ())
+
+    def test_guardar_el_perfil_invalida(self):
+        get_snapshot_pdf(self.perfil.pk)
+        self.perfil.nombres = 'Beatriz'
+        self.perfil.save()
+        self.assertEqual(get_snapshot_pdf(self.perfil.pk).perfil.nombres, 'Beatriz')
+
+    def test_perfil_inexistente(self):
+        self.assertIsNone(get_snapshot_pdf(self.perfil.pk + 1).perfil)
+
+    def test_pdf_y_portada_comparten_el_orden(self):
+        productos = [crear_producto_academico(self.perfil) for _ in range(3)]
+        perfil, config = resolver_perfil_activo()
+        portada = get_resumenes(perfil, config)['productosacademicos'].filas
+        pdf = get_snapshot_pdf(self.perfil.pk).productos_academicos
+        self.assertEqual([p.pk for p in pdf], [p.pk for p in reversed(productos)])
+        self.assertEqual([p.pk for p in portada], [p.pk for p in pdf])
@@ -0,0 +1,172 @@
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import Future
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+from django.urls import reverse
+
+from .. import trabajos_pdf
+from ..trabajos_pdf import ERROR, LISTO, PENDIENTE, PLAZO_INTENTO, PROCESANDO
+from .utilidades import PruebaConCache, crear_curso, crear_perfil
+
+CONTENIDO = b'%PDF-1.4 prueba'
+
+
+class EjecutorManual:
+    """Pool que no ejecuta nada hasta que la prueba lo pide."""
+
+    def __init__(self):
+        self.cola = []
+
+    def submit(self, funcion, *args):
+        futuro = Future()
+        self.cola.append((funcion, args, futuro))
+        return futuro
+
+    def ejecutar(self):
+        cola, self.cola = self.cola, []
+        for funcion, args, futuro in cola:
+            futuro.set_result(funcion(*args))
+        return len(cola)
+
+
+def pid_terminado():
+    proceso = subprocess.Popen([sys.executable, '-c', ''])
+    proceso.wait()
+    return proceso.pid
+
+
+class TrabajosPDFTests(PruebaConCache):
+    def setUp(self):
+        super().setUp()
+        self.perfil = crear_perfil()
+        crear_curso(self.perfil)
+        directorio = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directorio)
+        self.ejecutor = EjecutorManual()
+        self.get_pdf = mock.Mock(side_effect=lambda *args, **kwargs: (BytesIO(CONTENIDO), '"e"', False))
+        for nombre, valor in (
+            ('DIRECTORIO', directorio), ('_ejecutor', self.ejecutor), ('_futuros', {}), ('get_pdf', self.get_pdf),
+        ):
+            parche = mock.patch.object(trabajos_pdf, nombre, valor)
+            parche.start()
+            self.addCleanup(parche.stop)
+
+    def encolar(self):
+        return trabajos_pdf.encolar(self.perfil.pk, ['perfil', 'cursos'], 'cv.pdf')
+
+    def modificar(self, trabajo_id, **cambios):
+        trabajos_pdf._guardar(trabajo_id, {**trabajos_pdf._leer(trabajo_id), **cambios})
+
+    def worker_murio(self, trabajo_id, intento):
+        # Un hilo reclamó el intento y su proceso murió hace más que el plazo
+        trabajos_pdf._reclamar(trabajo_id, f'lock{intento}')
+        self.modificar(
+            trabajo_id, estado=PROCESANDO, intento=intento, inicio=time.time() - PLAZO_INTENTO - 1,
+            pid=pid_terminado(),
+        )
+        trabajos_pdf._futuros.clear()
+
+    def proceso_vivo(self):
+        proceso = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+        self.addCleanup(proceso.wait)
+        self.addCleanup(proceso.kill)
+        return proceso.pid
+
+    def test_ciclo_completo(self):
+        trabajo_id = self.encolar()
+        self.assertEqual(trabajos_pdf.estado(trabajo_id)['estado'], PENDIENTE)
+        self.assertEqual(self.ejecutor.ejecutar(), 1)
+        datos = trabajos_pdf.estado(trabajo_id)
+        self.assertEqual((datos['estado'], datos['intento'], datos['bytes']), (LISTO, 1, len(CONTENIDO)))
+        ruta, nombre, etag = trabajos_pdf.archivo(trabajo_id)
+        self.assertEqual(ruta.read_bytes(), CONTENIDO)
+        self.assertEqual(trabajos_pdf._futuros, {})
+
+    def test_la_espera_en_la_cola_no_consume_intentos(self):
+        trabajo_id = self.encolar()
+        # Mucho después, todavía detrás de otros PDF en el pool de este proceso
+        self.modificar(trabajo_id, creado=time.time() - 10 * PLAZO_INTENTO)
+        for _ in range(3):
+            self.assertEqual(trabajos_pdf.estado(trabajo_id)['estado'], PENDIENTE)
+        self.assertEqual(len(self.ejecutor.cola), 1)
+        self.ejecutor.ejecutar()
+        self.assertEqual(trabajos_pdf.estado(trabajo_id)['intento'], 1)
+
+    def test_pendiente_en_otro_proceso_vivo(self):
+        trabajo_id = self.encolar()
+        self.modificar(trabajo_id, pid=self.proceso_vivo())
+        self.assertEqual(trabajos_pdf.estado(trabajo_id)['estado'], PENDIENTE)
+        self.assertEqual(len(self.ejecutor.cola), 1)
+
+    def test_cola_perdida_al_reiniciar_se_reencola_una_vez(self):
+        trabajo_id = self.encolar()
+        self.modificar(trabajo_id, pid=pid_terminado())
+        for _ in range(3):
+            datos = trabajos_pdf.estado(trabajo_id)
+        self.assertEqual((datos['estado'], datos['encolado']), (PENDIENTE, 2))
+        # La copia original (si siguiera viva) y la reencolada: solo una lo procesa
+        self.assertEqual(self.ejecutor.ejecutar(), 2)
+        self.assertEqual(self.get_pdf.call_count, 1)
+        datos = trabajos_pdf.estado(trabajo_id)
+        self.assertEqual((datos['estado'], datos['intento']), (LISTO, 1))
+
+    def test_intento_dentro_del_plazo(self):
+        trabajo_id = self.encolar()
+        trabajos_pdf._reclamar(trabajo_id, 'lock1')
+        self.modificar(trabajo_id, estado=PROCESANDO, intento=1, inicio=time.time() - PLAZO_INTENTO + 5)
+        self.assertEqual(trabajos_pdf.estado(trabajo_id)['estado'], PROCESANDO)
+        self.assertEqual(len(self.ejecutor.cola), 1)
+
+    def test_intento_vencido_se_reintenta(self):
+        trabajo_id = self.encolar()
+        self.ejecutor.cola.clear()
+        self.worker_murio(trabajo_id, 1)
+        for _ in range(3):
+            self.assertEqual(trabajos_pdf.estado(trabajo_id)['estado'], PENDIENTE)
+        self.assertEqual(self.ejecutor.ejecutar(), 1)
+        datos = trabajos_pdf.estado(trabajo_id)
+        self.assertEqual((datos['estado'], datos['intento']), (LISTO, 2))
+
+    def test_sin_intentos_restantes_es_un_error(self):
+        trabajo_id = self.encolar()
+        self.ejecutor.cola.clear()
+        self.worker_murio(trabajo_id, trabajos_pdf.MAX_INTENTOS)
+        self.assertEqual(trabajos_pdf.estado(trabajo_id)['estado'], ERROR)
+        self.assertEqual(self.ejecutor.cola, [])
+
+    def test_error_al_generar(self):
+        self.get_pdf.side_effect = ValueError('sin fuentes')
+        trabajo_id = self.encolar()
+        with self.assertLogs('curriculum.trabajos_pdf', 'ERROR'):
+            self.ejecutor.ejecutar()
+        datos = trabajos_pdf.estado(trabajo_id)
+        self.assertEqual((datos['estado'], datos['error']), (ERROR, 'sin fuentes'))
+        with self.assertRaises(trabajos_pdf.TrabajoNoEncontrado):
+            trabajos_pdf.archivo(trabajo_id)
+
+    def test_vistas(self):
+        response = self.client.post(
+            '/api/pdf/trabajos/', json.dumps({'secciones': ['perfil', 'cursos']}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 202)
+        estado_url = response.json()['estado_url']
+        self.assertEqual(self.client.get(estado_url).json()['estado'], PENDIENTE)
+
+        self.ejecutor.ejecutar()
+        estado = self.client.get(estado_url)
+        self.assertEqual(estado['Cache-Control'], 'no-store')
+        descarga = self.client.get(estado.json()['descarga_url'], HTTP_RANGE='bytes=0-3')
+        self.assertEqual(descarga.status_code, 206)
+        self.assertEqual(b''.join(descarga.streaming_content), CONTENIDO[:4])
+        descarga.close()
+
+        desconocido = reverse('curriculum:estado_trabajo_pdf', args=[uuid.uuid4()])
+        self.assertEqual(self.client.get(desconocido).status_code, 404)
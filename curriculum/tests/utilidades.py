@@ -0,0 +1,44 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from ..models import CursosRealizados, DatosPersonales, ProductosAcademicos
+
+# Cada prueba empieza con una caché vacía y propia del proceso
+CACHE_PRUEBAS = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'cv-pruebas'},
+}
+
+
+def crear_perfil(**campos):
+    datos = {
+        'descripcionperfil': 'Perfil de prueba', 'perfilactivo': 1,
+        'apellidos': 'Pérez', 'nombres': 'Ana', 'nacionalidad': 'Ecuatoriana',
+        'lugarnacimiento': 'Manta', 'fechanacimiento': datetime.date(1990, 5, 17),
+        'numerocedula': '1300000001', 'sexo': 'M', 'estadocivil': 'Soltera',
+    }
+    return DatosPersonales.objects.create(**{**datos, **campos})
+
+
+def crear_curso(perfil, dia=1, **campos):
+    datos = {
+        'idperfilconqueestaactivo': perfil, 'nombrecurso': f'Curso {dia}',
+        'fechainicio': datetime.date(2024, 1, dia), 'fechafin': datetime.date(2024, 2, dia),
+        'totalhoras': 40, 'entidadpatrocinadora': 'Universidad',
+    }
+    return CursosRealizados.objects.create(**{**datos, **campos})
+
+
+def crear_producto_academico(perfil, **campos):
+    datos = {
+        'idperfilconqueestaactivo': perfil, 'nombrerecurso': 'Artículo',
+        'clasificador': 'Artículo', 'descripcion': 'Descripción',
+    }
+    return ProductosAcademicos.objects.create(**{**datos, **campos})
+
+
+@override_settings(CACHES=CACHE_PRUEBAS)
+class PruebaConCache(TestCase):
+    def setUp(self):
+        cache.clear()
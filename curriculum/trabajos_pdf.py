@@ -0,0 +1,190 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .pdf import get_pdf, normalizar_secciones
+from .snapshot import get_snapshot_pdf
+
+logger = logging.getLogger(__name__)
+
+PENDIENTE = 'pendiente'
+PROCESANDO = 'procesando'
+LISTO = 'listo'
+ERROR = 'error'
+
+DIRECTORIO = Path(settings.CV_PDF_JOBS_DIR)
+TRABAJADORES = getattr(settings, 'CV_PDF_JOBS_WORKERS', 2)
+DURACION = getattr(settings, 'CV_PDF_JOBS_TTL', 60 * 60)
+# El plazo de un intento corre desde que un hilo lo reclama, no desde que
+# entra en la cola: esperar detrás de otros PDF no cuenta. Si vence sin que
+# termine (el worker murió o se colgó), el siguiente estado() lo reencola.
+PLAZO_INTENTO = getattr(settings, 'CV_PDF_JOBS_LEASE', 90)
+MAX_INTENTOS = 2
+
+_ejecutor = ThreadPoolExecutor(max_workers=TRABAJADORES, thread_name_prefix='cv-pdf')
+# Futuros de los trabajos que este proceso tiene en su pool
+_futuros = {}
+
+
+class TrabajoNoEncontrado(LookupError):
+    pass
+
+
+def _ruta(trabajo_id, extension):
+    return DIRECTORIO / f'{trabajo_id}.{extension}'
+
+
+def _guardar(trabajo_id, datos):
+    descriptor, temporal = tempfile.mkstemp(dir=DIRECTORIO, prefix='.tmp-')
+    with os.fdopen(descriptor, 'w') as archivo:
+        json.dump(datos, archivo)
+    os.replace(temporal, _ruta(trabajo_id, 'json'))
+
+
+def _leer(trabajo_id):
+    try:
+        return json.loads(_ruta(trabajo_id, 'json').read_text())
+    except FileNotFoundError:
+        raise TrabajoNoEncontrado(trabajo_id)
+
+
+def _reclamar(trabajo_id, marca):
+    # O_EXCL es atómico: cada marca la crea un solo hilo, de cualquier proceso
+    try:
+        os.close(os.open(_ruta(trabajo_id, marca), os.O_CREAT | os.O_EXCL))
+        return True
+    except FileExistsError:
+        return False
+
+
+def _encolar(trabajo_id):
+    futuro = _ejecutor.submit(_procesar, trabajo_id)
+    _futuros[trabajo_id] = futuro
+    futuro.add_done_callback(lambda f: _futuros.pop(trabajo_id, None))
+
+
+def _sigue_en_cola(trabajo_id, datos):
+    """Si el trabajo pendiente sigue en el pool del proceso que lo encoló."""
+    if datos['pid'] == os.getpid():
+        # Este proceso (o uno anterior con el mismo PID) lo encoló
+        futuro = _futuros.get(trabajo_id)
+        return futuro is not None and not futuro.done()
+    try:
+        os.kill(datos['pid'], 0)
+    except ProcessLookupError:
+        # El proceso se reinició o murió con el trabajo en la cola
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _procesar(trabajo_id):
+    datos = _leer(trabajo_id)
+    if datos['estado'] != PENDIENTE:
+        # Otra copia encolada ya lo reclamó, o ya terminó
+        return
+    intento = datos['intento'] + 1
+    if not _reclamar(trabajo_id, f'lock{intento}'):
+        return
+    # Solo ahora empieza el plazo, y solo ahora cuenta como intento
+    datos = {**datos, 'estado': PROCESANDO, 'intento': intento, 'inicio': time.time()}
+    _guardar(trabajo_id, datos)
+    try:
+        snapshot = get_snapshot_pdf(datos['perfil_id'])
+        if snapshot.perfil is None:
+            raise LookupError('El perfil ya no existe')
+        origen, etag, acierto = get_pdf(snapshot, datos['secciones'], modo=datos.get('modo'))
+        # Un intento anterior que siga vivo puede estar escribiendo el mismo PDF
+        descriptor, temporal = tempfile.mkstemp(dir=DIRECTORIO, prefix='.tmp-')
+        with origen, os.fdopen(descriptor, 'wb') as archivo:
+            shutil.copyfileobj(origen, archivo)
+            tamano = archivo.tell()
+        os.replace(temporal, _ruta(trabajo_id, 'pdf'))
+        _guardar(trabajo_id, {**datos, 'estado': LISTO, 'etag': etag, 'bytes': tamano})
+    except Exception as e:
+        logger.exception("Error en el trabajo PDF %s", trabajo_id)
+        # Un intento vencido que falla tarde no pisa al que lo sustituyó
+        if _leer(trabajo_id)['intento'] == intento:
+            _guardar(trabajo_id, {**datos, 'estado': ERROR, 'error': str(e)})
+    finally:
+        # Los hilos del pool no pasan por el ciclo de request que cierra conexiones
+        close_old_connections()
+
+
+def limpiar(antiguedad=DURACION):
+    """Borra los trabajos (y sus PDF) más antiguos que `antiguedad` segundos."""
+    limite = time.time() - antiguedad
+    for ruta in DIRECTORIO.glob('*'):
+        try:
+            if ruta.stat().st_mtime < limite:
+                ruta.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def encolar(perfil_id, secciones, nombre_archivo='cv.pdf', modo=None):
+    DIRECTORIO.mkdir(parents=True, exist_ok=True)
+    limpiar()
+    trabajo_id = uuid.uuid4().hex
+    _guardar(trabajo_id, {
+        'estado': PENDIENTE,
+        'perfil_id': perfil_id,
+        'secciones': normalizar_secciones(secciones),
+        'nombre_archivo': nombre_archivo,
+        'modo': modo,
+        'creado': time.time(),
+        'intento': 0,
+        'encolado': 1,
+        'pid': os.getpid(),
+    })
+    _encolar(trabajo_id)
+    return trabajo_id
+
+
+def _reencolar(trabajo_id, datos):
+    # Solo el sondeo que crea la marca de este reencolado lo hace: uno por
+    # intento vencido o cola perdida, no uno por petición
+    encolado = datos['encolado'] + 1
+    if not _reclamar(trabajo_id, f'cola{encolado}'):
+        return datos
+    datos = {**datos, 'estado': PENDIENTE, 'encolado': encolado, 'pid': os.getpid()}
+    _guardar(trabajo_id, datos)
+    _encolar(trabajo_id)
+    return datos
+
+
+def estado(trabajo_id):
+    """
+    Estado del trabajo. Reencola el que lleva más de PLAZO_INTENTO segundos
+    procesándose (o lo da por fallido tras MAX_INTENTOS intentos) y el
+    pendiente cuyo proceso ya no lo tiene en la cola.
+    """
+    datos = _leer(trabajo_id)
+    if datos['estado'] == PENDIENTE and not _sigue_en_cola(trabajo_id, datos):
+        return _reencolar(trabajo_id, datos)
+    if datos['estado'] != PROCESANDO or time.time() - datos['inicio'] <= PLAZO_INTENTO:
+        return datos
+
+    if datos['intento'] >= MAX_INTENTOS:
+        datos = {**datos, 'estado': ERROR, 'error': 'El PDF tardó demasiado en generarse'}
+        _guardar(trabajo_id, datos)
+        return datos
+    return _reencolar(trabajo_id, datos)
+
+
+def archivo(trabajo_id):
+    """Ruta, nombre de descarga y ETag del PDF terminado."""
+    datos = estado(trabajo_id)
+    if datos['estado'] != LISTO:
+        raise TrabajoNoEncontrado(trabajo_id)
+    return _ruta(trabajo_id, 'pdf'), datos['nombre_archivo'], datos.get('etag')
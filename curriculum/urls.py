@@ -11,6 +11,11 @@ urlpatterns = [
     path('productos-academicos/', views.productos_academicos, name='productos_academicos'),
     path('productos-laborales/', views.productos_laborales, name='productos_laborales'),
     path('venta-garage/', views.venta_garage, name='venta_garage'),
+    path('api/secciones/<str:seccion>/', views.cargar_mas, name='cargar_mas'),
     path('api/configuracion/', views.actualizar_configuracion, name='actualizar_configuracion'),
     path('api/generar-pdf/', views.generar_pdf, name='generar_pdf'),
+    path('api/pdf/trabajos/', views.crear_trabajo_pdf, name='crear_trabajo_pdf'),
+    path('api/pdf/trabajos/<uuid:trabajo_id>/', views.estado_trabajo_pdf, name='estado_trabajo_pdf'),
+    path('api/pdf/trabajos/<uuid:trabajo_id>/descargar/', views.descargar_trabajo_pdf, name='descargar_trabajo_pdf'),
+    path('certificados/<str:seccion>/<int:pk>/miniatura/', views.miniatura_certificado, name='miniatura_certificado'),
 ]
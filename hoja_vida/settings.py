@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 import dj_database_url
+from django.conf import global_settings
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -67,6 +68,55 @@ else:
         }
     }
 
+# ---------------- CACHE ----------------
+# Tiene que ser compartida por todos los workers: guarda las versiones del
+# snapshot, la fecha de modificación de los ETag, los testigos de la caché de
+# páginas y la generación del perfil activo, y las señales del admin solo
+# invalidan lo que hay en esta caché. Con LocMemCache cada worker tendría la
+# suya y los demás seguirían sirviendo el CV viejo. Por defecto va a disco;
+# con varias máquinas, usar un backend de red (Redis, base de datos...).
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / 'cache' / 'django')),
+        # Con el límite de 300 por defecto se desalojarían las versiones en uso
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000))},
+    }
+}
+CV_SNAPSHOT_TIMEOUT = 60 * 60 * 24
+# Forma parte de los ETag: un despliegue nuevo invalida las copias de los navegadores
+CV_VERSION_DESPLIEGUE = os.environ.get('RENDER_GIT_COMMIT', '')
+# Caché de páginas completas (opcional). Con el backend de base de datos hay
+# que ejecutar antes `python manage.py createcachetable`.
+CV_PAGE_CACHE = os.environ.get('CV_PAGE_CACHE', 'False') == 'True'
+CV_PAGE_CACHE_TIMEOUT = int(os.environ.get('CV_PAGE_CACHE_TIMEOUT', 60 * 60))
+CV_PAGE_CACHE_BYPASS_STAFF = os.environ.get('CV_PAGE_CACHE_BYPASS_STAFF', 'True') == 'True'
+# PDFs ya generados, compartidos por todos los workers y con desalojo LRU
+CV_PDF_CACHE_DIR = Path(os.environ.get('CV_PDF_CACHE_DIR', BASE_DIR / 'cache' / 'pdf'))
+CV_PDF_CACHE_MAX_BYTES = int(os.environ.get('CV_PDF_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+# Cola de PDF en segundo plano: trabajos en disco y un pool de hilos por proceso
+CV_PDF_JOBS_DIR = Path(os.environ.get('CV_PDF_JOBS_DIR', BASE_DIR / 'cache' / 'trabajos'))
+CV_PDF_JOBS_WORKERS = int(os.environ.get('CV_PDF_JOBS_WORKERS', 2))
+CV_PDF_JOBS_TTL = 60 * 60
+# Plazo de un intento desde que un hilo lo empieza (la espera en la cola no
+# cuenta): si vence sin terminar (worker reiniciado o colgado), se reintenta
+CV_PDF_JOBS_LEASE = int(os.environ.get('CV_PDF_JOBS_LEASE', 90))
+# Imágenes del PDF ya recortadas y reducidas a su tamaño impreso (JPEG)
+CV_IMAGENES_CACHE_DIR = Path(os.environ.get('CV_IMAGENES_CACHE_DIR', BASE_DIR / 'cache' / 'imagenes'))
+CV_IMAGENES_CACHE_MAX_BYTES = int(os.environ.get('CV_IMAGENES_CACHE_MAX_BYTES', 50 * 1024 * 1024))
+CV_IMAGENES_DPI = 200
+# Respuestas HTTP de imágenes y certificados remotos, revalidadas con ETag/Last-Modified
+CV_DESCARGAS_CACHE_DIR = Path(os.environ.get('CV_DESCARGAS_CACHE_DIR', BASE_DIR / 'cache' / 'descargas'))
+CV_DESCARGAS_CACHE_MAX_BYTES = int(os.environ.get('CV_DESCARGAS_CACHE_MAX_BYTES', 100 * 1024 * 1024))
+CV_DESCARGAS_POR_HOST = int(os.environ.get('CV_DESCARGAS_POR_HOST', 6))
+
+# Miniatura de la primera página de los certificados (requiere PyMuPDF)
+CV_MINIATURAS_CACHE_DIR = Path(os.environ.get('CV_MINIATURAS_CACHE_DIR', BASE_DIR / 'cache' / 'miniaturas'))
+CV_MINIATURAS_CACHE_MAX_BYTES = int(os.environ.get('CV_MINIATURAS_CACHE_MAX_BYTES', 20 * 1024 * 1024))
+
+# Tema registrado en curriculum.tema_pdf con el que se generan los PDF
+CV_PDF_TEMA = 'clasico'
+
 # ---------------- PASSWORDS ----------------
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -84,8 +134,31 @@ USE_TZ = True
 # ---------------- STATIC ----------------
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_DIRS = [BASE_DIR / 'static']
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Paquetes CSS/JS y fuente de iconos de `python manage.py empaquetar_estaticos`
+# (build.sh lo ejecuta antes de collectstatic). Las dependencias descargadas
+# quedan en CV_ESTATICOS_VENDOR_DIR, fuera de lo que se publica.
+CV_ESTATICOS_DIR = BASE_DIR / 'static_build'
+CV_ESTATICOS_VENDOR_DIR = BASE_DIR / 'cache' / 'vendor'
+CV_ESTATICOS_EMPAQUETADOS = os.environ.get('CV_ESTATICOS_EMPAQUETADOS', str(not DEBUG)) == 'True'
+# CSS crítico de cada página, incrustado en el <head> (solo con los paquetes).
+# Por encima de ~14 KB comprimidos ya no cabe en el primer viaje de TCP.
+CV_CSS_CRITICO = BASE_DIR / 'cache' / 'css_critico.json'
+CV_CSS_CRITICO_MAX_BYTES = int(os.environ.get('CV_CSS_CRITICO_MAX_BYTES', 14 * 1024))
+STATICFILES_DIRS = [BASE_DIR / 'static'] + ([CV_ESTATICOS_DIR] if CV_ESTATICOS_DIR.is_dir() else [])
+STATICFILES_STORAGE = 'curriculum.estaticos.AlmacenamientoEstaticos'
+# Desde Django 5.1 solo se lee STORAGES. Con el manifiesto los nombres llevan
+# la huella del contenido y WhiteNoise los sirve con Cache-Control immutable.
+STORAGES = {**global_settings.STORAGES, 'staticfiles': {'BACKEND': STATICFILES_STORAGE}}
+
+# Páginas públicas pre-renderizadas con `python manage.py prerender`.
+# WhiteNoise las sirve antes de llegar a las vistas; solo admin y las APIs
+# pasan por Django. Los cambios hechos en el admin se publican al volver a
+# ejecutar prerender y reiniciar (WhiteNoise lee el directorio al arrancar).
+CV_PRERENDER = os.environ.get('CV_PRERENDER', 'False') == 'True'
+CV_PRERENDER_ROOT = Path(os.environ.get('CV_PRERENDER_ROOT', BASE_DIR / 'prerender'))
+if CV_PRERENDER:
+    WHITENOISE_ROOT = CV_PRERENDER_ROOT
+    WHITENOISE_INDEX_FILE = True
 
 
 # =====================================================
@@ -98,6 +171,9 @@ import cloudinary.api
 CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME')
 CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY')
 CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET')
+# host:puerto del servidor local que imita a Cloudinary, para trabajar sin red
+CV_CLOUDINARY_LOCAL = os.environ.get('CV_CLOUDINARY_LOCAL', '')
+CV_CLOUDINARY_LOCAL_DIR = Path(os.environ.get('CV_CLOUDINARY_LOCAL_DIR', BASE_DIR / 'media' / 'cloudinary'))
 
 if CLOUDINARY_CLOUD_NAME and CLOUDINARY_API_KEY and CLOUDINARY_API_SECRET:
     cloudinary.config(
@@ -115,6 +191,25 @@ if CLOUDINARY_CLOUD_NAME and CLOUDINARY_API_KEY and CLOUDINARY_API_SECRET:
 
     print("✅ Cloudinary configurado correctamente")
 
+elif CV_CLOUDINARY_LOCAL:
+    # Sustituto local (curriculum/cloudinary_local.py): mismas URLs y subidas
+    # que Cloudinary, servidas por `python manage.py servidor_cloudinary`
+    cloudinary.config(
+        cloud_name='local',
+        api_key='local',
+        api_secret='local',
+        secure=False,
+        cname=CV_CLOUDINARY_LOCAL,
+        upload_prefix=f'http://{CV_CLOUDINARY_LOCAL}'
+    )
+
+    DEFAULT_FILE_STORAGE = 'curriculum.cloudinary_local.AlmacenamientoCloudinaryLocal'
+    STORAGES['default'] = {'BACKEND': DEFAULT_FILE_STORAGE}
+    MEDIA_URL = f'http://{CV_CLOUDINARY_LOCAL}/local/'
+    MEDIA_ROOT = CV_CLOUDINARY_LOCAL_DIR
+
+    print(f"🧪 Cloudinary local en http://{CV_CLOUDINARY_LOCAL}")
+
 else:
     # LOCAL
     MEDIA_URL = '/media/'
@@ -124,4 +219,22 @@ else:
     print("⚠️ Cloudinary NO configurado - usando almacenamiento local")
 
 
+# ---------------- LOGGING ----------------
+# Los módulos de la app registran con logging.getLogger(__name__): con el PID
+# en cada línea se distinguen los mensajes de los distintos workers.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'proceso': {'format': '%(asctime)s [%(process)d] %(levelname)s %(name)s: %(message)s'},
+    },
+    'handlers': {
+        'consola': {'class': 'logging.StreamHandler', 'formatter': 'proceso'},
+    },
+    'loggers': {
+        'curriculum': {'handlers': ['consola'], 'level': os.environ.get('CV_LOG_LEVEL', 'INFO')},
+    },
+}
+
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,381 @@
+let hoverTimeout;
+
+// Inicializar Vanta solo cuando el DOM esté listo
+window.addEventListener('DOMContentLoaded', () => {
+    VANTA.NET({
+        el: "#vanta-bg",
+        mouseControls: true,
+        touchControls: true,
+        gyroControls: false,
+        minHeight: 200.00,
+        minWidth: 200.00,
+        scale: 1.00,
+        scaleMobile: 1.00,
+        color: 0x81d8d0,
+        backgroundColor: 0xffffff,
+        points: 12.00,
+        maxDistance: 22.00,
+        spacing: 16.00
+    });
+});
+
+// ==========================================
+// CSRF TOKEN
+// ==========================================
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// ==========================================
+// BARRA DE PROGRESO DE SCROLL
+// ==========================================
+const progressBar = document.getElementById('progressBar');
+
+window.addEventListener('scroll', function() {
+    const scrollTop = window.scrollY || document.documentElement.scrollTop;
+    const docHeight = document.documentElement.scrollHeight - document.documentElement.clientHeight;
+    const progress = docHeight > 0 ? (scrollTop / docHeight) * 100 : 0;
+    progressBar.style.width = progress + '%';
+});
+
+// ==========================================
+// SIDEBAR - HOVER Y PIN
+// ==========================================
+const sidebar = document.getElementById('sidebar');
+const btnPin = document.getElementById('btnPin');
+const btnMobileMenu = document.getElementById('btnMobileMenu');
+const sidebarOverlay = document.getElementById('sidebarOverlay');
+
+let storedPinned = localStorage.getItem('sidebarPinned');
+let isPinned = storedPinned === null ? true : storedPinned === 'true';
+
+// Estado inicial del pin
+if (isPinned) {
+    sidebar.classList.add('pinned');
+    btnPin.classList.add('pinned');
+    btnPin.title = 'Desfijar menú';
+} else {
+    sidebar.classList.remove('pinned');
+    btnPin.classList.remove('pinned');
+}
+
+// Hover - expandir
+sidebar.addEventListener('mouseenter', function() {
+    if (!isPinned && window.innerWidth > 768) {
+        clearTimeout(hoverTimeout);
+        sidebar.classList.add('expanded');
+    }
+});
+
+// Hover - contraer
+sidebar.addEventListener('mouseleave', function() {
+    if (!isPinned && window.innerWidth > 768) {
+        hoverTimeout = setTimeout(() => {
+            sidebar.classList.remove('expanded');
+        }, 300);
+    }
+});
+
+// Pin - fijar/desfijar
+btnPin.addEventListener('click', function(e) {
+    e.stopPropagation();
+    isPinned = !isPinned;
+
+    if (isPinned) {
+        sidebar.classList.add('pinned');
+        sidebar.classList.remove('expanded');
+        btnPin.classList.add('pinned');
+        btnPin.title = 'Desfijar menú';
+    } else {
+        sidebar.classList.remove('pinned');
+        btnPin.classList.remove('pinned');
+        sidebar.classList.remove('expanded');
+        btnPin.title = 'Fijar menú';
+    }
+
+    localStorage.setItem('sidebarPinned', isPinned);
+});
+
+// Menú móvil
+btnMobileMenu.addEventListener('click', function() {
+    sidebar.classList.toggle('mobile-open');
+    sidebarOverlay.classList.toggle('active');
+    document.body.style.overflow = sidebar.classList.contains('mobile-open') ? 'hidden' : '';
+});
+
+sidebarOverlay.addEventListener('click', function() {
+    sidebar.classList.remove('mobile-open');
+    sidebarOverlay.classList.remove('active');
+    document.body.style.overflow = '';
+});
+
+document.querySelectorAll('.sidebar-nav a').forEach(link => {
+    link.addEventListener('click', function() {
+        if (window.innerWidth <= 768) {
+            sidebar.classList.remove('mobile-open');
+            sidebarOverlay.classList.remove('active');
+            document.body.style.overflow = '';
+        }
+    });
+});
+
+window.addEventListener('resize', function() {
+    if (window.innerWidth > 768) {
+        sidebar.classList.remove('mobile-open');
+        sidebarOverlay.classList.remove('active');
+        document.body.style.overflow = '';
+    }
+});
+
+// ==========================================
+// CONFIGURACIÓN DE SECCIONES
+// ==========================================
+document.getElementById('btnGuardarConfig').addEventListener('click', function() {
+    const csrftoken = getCookie('csrftoken');
+
+    const config = {
+        mostrar_perfil: document.getElementById('checkPerfil').checked,
+        mostrar_experiencia: document.getElementById('checkExperiencia').checked,
+        mostrar_reconocimientos: document.getElementById('checkReconocimientos').checked,
+        mostrar_cursos: document.getElementById('checkCursos').checked,
+        mostrar_productos_academicos: document.getElementById('checkProductosAcademicos').checked,
+        mostrar_productos_laborales: document.getElementById('checkProductosLaborales').checked,
+        mostrar_venta_garage: document.getElementById('checkVentaGarage').checked
+    };
+
+    fetch(this.dataset.url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrftoken
+        },
+        body: JSON.stringify(config)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            location.reload();
+        } else {
+            alert('Error al guardar la configuración');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Error al guardar la configuración');
+    });
+});
+
+// ==========================================
+// GENERAR PDF
+// ==========================================
+const pdfSections = document.querySelectorAll('.pdf-section');
+const btnGenerarPDF = document.getElementById('btnGenerarPDF');
+
+function updatePDFButton() {
+    const anyChecked = Array.from(pdfSections).some(checkbox => checkbox.checked);
+    btnGenerarPDF.disabled = !anyChecked;
+}
+
+pdfSections.forEach(checkbox => {
+    checkbox.addEventListener('change', updatePDFButton);
+});
+
+updatePDFButton();
+
+btnGenerarPDF.addEventListener('click', function() {
+    const selectedSections = [];
+
+    if (document.getElementById('pdfPerfil').checked) selectedSections.push('perfil');
+    if (document.getElementById('pdfExperiencia').checked) selectedSections.push('experiencia');
+    if (document.getElementById('pdfReconocimientos').checked) selectedSections.push('reconocimientos');
+    if (document.getElementById('pdfCursos').checked) selectedSections.push('cursos');
+    if (document.getElementById('pdfProductosAcademicos').checked) selectedSections.push('productosacademicos');
+    if (document.getElementById('pdfProductosLaborales').checked) selectedSections.push('productoslaborales');
+    if (document.getElementById('pdfVentaGarage').checked) selectedSections.push('ventagarage');
+
+    if (selectedSections.length === 0) {
+        alert('Por favor, selecciona al menos una sección');
+        return;
+    }
+
+    const csrftoken = getCookie('csrftoken');
+
+    // La pestaña se abre ya, dentro del clic: abierta al final de la espera
+    // la bloquearían los navegadores. Se le da la URL del PDF cuando esté listo.
+    const pestana = window.open('', '_blank');
+    if (!pestana) {
+        alert('Por favor, permite las ventanas emergentes para ver el PDF');
+        return;
+    }
+    pestana.document.title = 'Generando PDF...';
+    pestana.document.body.textContent = 'Generando el PDF, espera un momento...';
+
+    btnGenerarPDF.disabled = true;
+    btnGenerarPDF.innerHTML = '<span class="spinner-border spinner-border-sm me-2"></span>Generando...';
+
+    const restaurarBoton = () => {
+        btnGenerarPDF.disabled = false;
+        btnGenerarPDF.innerHTML = 'Generar';
+    };
+
+    // Pasado este tiempo se deja de consultar y se avisa del error
+    const ESPERA_MAXIMA_MS = 3 * 60 * 1000;
+    const limite = Date.now() + ESPERA_MAXIMA_MS;
+
+    // El PDF se genera en segundo plano: se encola y se consulta su estado
+    const consultarTrabajo = (trabajo) => {
+        if (trabajo.estado === 'listo') {
+            pestana.location = trabajo.descarga_url;
+
+            const modal = bootstrap.Modal.getInstance(document.getElementById('pdfModal'));
+            modal.hide();
+            restaurarBoton();
+            return;
+        }
+        if (trabajo.estado === 'error') throw new Error(trabajo.error || 'Error al generar PDF');
+        if (Date.now() > limite) throw new Error('El PDF está tardando demasiado');
+
+        setTimeout(() => {
+            fetch(trabajo.estado_url)
+            .then(response => {
+                if (!response.ok) throw new Error('Error al consultar el PDF');
+                return response.json();
+            })
+            .then(consultarTrabajo)
+            .catch(manejarError);
+        }, 1000);
+    };
+
+    const manejarError = (error) => {
+        console.error('Error:', error);
+        pestana.close();
+        alert(`${error.message}. Por favor, intenta de nuevo.`);
+        restaurarBoton();
+    };
+
+    fetch(btnGenerarPDF.dataset.url, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrftoken
+        },
+        body: JSON.stringify({
+            secciones: selectedSections,
+            modo: document.getElementById('pdfCompacto').checked ? 'compacto' : 'normal'
+        })
+    })
+    .then(response => {
+        if (!response.ok) throw new Error('Error al generar PDF');
+        return response.json();
+    })
+    .then(consultarTrabajo)
+    .catch(manejarError);
+});
+
+// ==========================================
+// CARGAR MÁS (PAGINACIÓN POR CURSOR)
+// ==========================================
+document.querySelectorAll('.btn-cargar-mas').forEach(boton => {
+    boton.addEventListener('click', function() {
+        const destino = document.querySelector(boton.dataset.destino);
+        boton.disabled = true;
+
+        fetch(`${boton.dataset.url}?cursor=${encodeURIComponent(boton.dataset.cursor)}`)
+        .then(response => {
+            if (!response.ok) throw new Error('Error al cargar más elementos');
+            return response.json();
+        })
+        .then(data => {
+            destino.insertAdjacentHTML('beforeend', data.html);
+            if (data.siguiente) {
+                boton.dataset.cursor = data.siguiente;
+                boton.disabled = false;
+            } else {
+                boton.closest('.cargar-mas-container').remove();
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            boton.disabled = false;
+        });
+    });
+});
+
+// ==========================================
+// MODAL DE IMAGEN
+// ==========================================
+function ampliarImagen(src) {
+    document.getElementById('modalImage').src = src;
+    const miModal = new bootstrap.Modal(document.getElementById('imageModal'));
+    miModal.show();
+}
+
+// ==========================================
+// VISTA PREVIA DE CERTIFICADOS
+// ==========================================
+// La miniatura se sustituye por el PDF solo cuando el visitante lo pide
+function mostrarCertificado(boton) {
+    const iframe = document.createElement('iframe');
+    iframe.src = boton.dataset.pdf;
+    iframe.width = '100%';
+    iframe.height = '100%';
+    iframe.style.border = 'none';
+    boton.replaceWith(iframe);
+}
+
+// Mientras se genera, la miniatura responde 202 sin imagen: se reintenta unas
+// pocas veces y, si no llega, queda solo el botón para abrir el PDF
+function reintentarMiniatura(img) {
+    const intento = Number(img.dataset.intento || 0) + 1;
+    if (intento > 4) {
+        img.remove();
+        return;
+    }
+    img.dataset.intento = intento;
+    setTimeout(() => {
+        const url = new URL(img.src);
+        url.searchParams.set('intento', intento);
+        img.src = url;
+    }, 2000 * intento);
+}
+
+// ==========================================
+// BOTÓN VOLVER ARRIBA
+// ==========================================
+const scrollBtn = document.getElementById("scrollToTop");
+
+window.addEventListener('scroll', function() {
+    const scrollBtn = document.getElementById("scrollToTop");
+    if (!scrollBtn) return; // Seguridad
+
+    const scrollTop = window.scrollY || document.documentElement.scrollTop;
+
+    if (scrollTop > 300) {
+        scrollBtn.classList.add('show');
+        scrollBtn.style.display = "flex"; 
+    } else {
+        scrollBtn.classList.remove('show');
+        scrollBtn.style.display = "none";
+    }
+});
+
+document.addEventListener('DOMContentLoaded', () => {
+    const scrollBtn = document.getElementById("scrollToTop");
+    scrollBtn.addEventListener('click', function() {
+        window.scrollTo({
+            top: 0,
+            behavior: "smooth"
+        });
+    });
+});